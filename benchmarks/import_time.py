@@ -0,0 +1,37 @@
+"""
+Benchmark import time of the package: each scenario is executed in a fresh interpreter
+
+Pydantic models build their validators on import, so only the modules actually used should be imported.
+`import growatt_public_api` must not import any device API or pydantic model.
+Each scenario is measured with validators built on first use (default) and on import (GROWATT_DEFER_BUILD=0).
+Usage:
+    python benchmarks/import_time.py
+"""
+
+import os
+import subprocess
+import sys
+
+REPEAT = 5
+SCENARIOS = {
+    "import growatt_public_api": "import growatt_public_api",
+    "GrowattApi(...).plant": "from growatt_public_api import GrowattApi; GrowattApi(token='x', use_cache=False).plant",
+    "GrowattApi(...).min": "from growatt_public_api import GrowattApi; GrowattApi(token='x', use_cache=False).min",
+    "all exported names": "import growatt_public_api as g; [getattr(g, name) for name in g.__all__]",
+    "all exported names + warm_up()": "import growatt_public_api as g; [getattr(g, name) for name in g.__all__]; g.warm_up()",
+}
+
+
+def _import_time(statement: str, defer_build: bool) -> float:
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    env = {**os.environ, "GROWATT_DEFER_BUILD": "1" if defer_build else "0"}
+    output = subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True).stdout
+    return float(output)
+
+
+if __name__ == "__main__":
+    print(f"  {'':<32} {'deferred':>10} {'on import':>10}")
+    for name, statement in SCENARIOS.items():
+        deferred = min(_import_time(statement, defer_build=True) for _ in range(REPEAT))
+        on_import = min(_import_time(statement, defer_build=False) for _ in range(REPEAT))
+        print(f"  {name:<32} {deferred * 1000:7.1f} ms {on_import * 1000:7.1f} ms")
@@ -0,0 +1,71 @@
+import datetime
+import random
+import timeit
+import typing
+from growatt_public_api.pydantic_models.api_model import ApiModel
+from growatt_public_api.pydantic_models.fast_parse import fast_validate
+from growatt_public_api.pydantic_models.lazy_model import lazy_validate
+from growatt_public_api.pydantic_models.min import MinEnergyHistory, MinEnergyOverviewData
+
+
+"""
+Benchmark parsing a large response: model_validate() vs. fast_validate() vs. lazy_validate()
+
+energy_history() returns up to 100 records per page, each having 200+ attributes.
+lazy_validate() is measured reading LAZY_FIELDS of each record.
+Usage:
+    python benchmarks/parsing.py
+"""
+
+RECORDS = 100
+REPEAT = 20
+LAZY_FIELDS = ("time", "ppv", "pac", "eac_today", "status")
+
+
+def _raw_value(annotation: typing.Any, empty_ratio: float) -> typing.Any:
+    types = [t for t in typing.get_args(annotation) if typing.get_origin(t) is not typing.Annotated]
+    if random.random() < empty_ratio:
+        return random.choice(["", "null", None])
+    if types == [float]:
+        return round(random.uniform(0, 1000), 1)
+    if types == [int]:
+        return random.randint(0, 100)
+    if types == [bool]:
+        return random.choice([True, False])
+    if types == [str]:
+        return "BZP0000000"
+    if types == [datetime.datetime]:
+        return "2025-01-01 10:00:00"
+    return None
+
+
+def _response(empty_ratio: float) -> dict:
+    fields = MinEnergyOverviewData.model_fields.items()
+    records = [
+        {field.alias or name: _raw_value(field.annotation, empty_ratio) for name, field in fields}
+        for _ in range(RECORDS)
+    ]
+    return {"error_code": 0, "error_msg": None, "data": {"count": RECORDS, "datas": records}}
+
+
+def _benchmark(model: typing.Type[ApiModel], response: dict) -> None:
+    assert model.model_validate(response) == fast_validate(model, response)
+    default = min(timeit.repeat(lambda: model.model_validate(response), number=1, repeat=REPEAT))
+    fast = min(timeit.repeat(lambda: fast_validate(model, response), number=1, repeat=REPEAT))
+    print(f"  model_validate(): {default * 1000:7.2f} ms")
+    print(f"  fast_validate():  {fast * 1000:7.2f} ms  ({default / fast:.1f}x faster)")
+
+    def read_lazy():
+        for record in lazy_validate(model, response).data.datas:
+            for field in LAZY_FIELDS:
+                getattr(record, field)
+
+    lazy = min(timeit.repeat(read_lazy, number=1, repeat=REPEAT))
+    print(f"  lazy_validate():  {lazy * 1000:7.2f} ms  ({default / lazy:.1f}x faster, {len(LAZY_FIELDS)} fields read)")
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    for empty_ratio in (0.0, 0.3):
+        print(f"{RECORDS} records x {len(MinEnergyOverviewData.model_fields)} fields, {empty_ratio:.0%} empty values")
+        _benchmark(MinEnergyHistory, _response(empty_ratio))
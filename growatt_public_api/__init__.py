@@ -1,19 +1,63 @@
+from typing import TYPE_CHECKING
 from .growatt_types import (  # noqa: F401
     DeviceType,
     GrowattCountry,
     PlantType,
     WorkMode,
 )
-from .growatt_api import GrowattApi  # noqa: F401
-from .user import User  # noqa: F401
-from .datalogger import Datalogger  # noqa: F401
-from .device import Device  # noqa: F401
-from .inverter import Inverter  # noqa: F401
-from .min import Min  # noqa: F401
-from .plant import Plant  # noqa: F401
-from .session import GrowattApiSession  # noqa: F401
-from .storage import Storage  # noqa: F401
-from .vpp import Vpp  # noqa: F401
-from .wit import Wit  # noqa: F401
-from .sphs import Sphs  # noqa: F401
-from .noah import Noah  # noqa: F401
+from .lazy_imports import lazy_attributes
+
+# everything else is imported on first access, so `import growatt_public_api` stays cheap
+# (see benchmarks/import_time.py)
+_IMPORTS = {
+    ".growatt_api": ["GrowattApi"],
+    ".async_growatt_api": ["AsyncGrowattApi"],
+    ".backfill": ["HistoryBackfill", "HistoryRecord", "BackfillError"],
+    ".history_sync": ["HistorySync"],
+    ".deferred_build": ["warm_up"],
+    ".pydantic_models": ["enable_fast_parse", "lazy_validation", "raw_responses"],
+    ".user": ["User"],
+    ".datalogger": ["Datalogger"],
+    ".device": ["Device"],
+    ".inverter": ["Inverter"],
+    ".min": ["Min"],
+    ".plant": ["Plant"],
+    ".session": [
+        "GrowattApiSession",
+        "AsyncGrowattApiSession",
+        "RateLimiter",
+        "RateLimit",
+        "ResponseCache",
+        "ConnectionSettings",
+        "RetryPolicy",
+    ],
+    ".storage": ["Storage"],
+    ".vpp": ["Vpp"],
+    ".wit": ["Wit"],
+    ".sphs": ["Sphs"],
+    ".noah": ["Noah"],
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _IMPORTS)
+__all__ = ["DeviceType", "GrowattCountry", "PlantType", "WorkMode", *(n for names in _IMPORTS.values() for n in names)]
+
+if TYPE_CHECKING:  # static type checkers and IDEs do not evaluate __getattr__()
+    from .growatt_api import GrowattApi  # noqa: F401
+    from .async_growatt_api import AsyncGrowattApi  # noqa: F401
+    from .backfill import HistoryBackfill, HistoryRecord, BackfillError  # noqa: F401
+    from .history_sync import HistorySync  # noqa: F401
+    from .deferred_build import warm_up  # noqa: F401
+    from .pydantic_models import enable_fast_parse, lazy_validation, raw_responses  # noqa: F401
+    from .user import User  # noqa: F401
+    from .datalogger import Datalogger  # noqa: F401
+    from .device import Device  # noqa: F401
+    from .inverter import Inverter  # noqa: F401
+    from .min import Min  # noqa: F401
+    from .plant import Plant  # noqa: F401
+    from .session import GrowattApiSession, AsyncGrowattApiSession, RateLimiter, RateLimit, ResponseCache  # noqa: F401
+    from .session import ConnectionSettings, RetryPolicy  # noqa: F401
+    from .storage import Storage  # noqa: F401
+    from .vpp import Vpp  # noqa: F401
+    from .wit import Wit  # noqa: F401
+    from .sphs import Sphs  # noqa: F401
+    from .noah import Noah  # noqa: F401
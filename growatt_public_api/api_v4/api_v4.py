@@ -1,6 +1,7 @@
+import copy
 import datetime
 import json
-from typing import Optional, Literal, List, Union
+from typing import Optional, Literal, List, Union, Dict
 from loguru import logger
 from ..growatt_types import DeviceType, WorkMode
 from ..pydantic_models.api_v4 import (
@@ -14,6 +15,15 @@ from ..pydantic_models.api_v4 import (
     NoahDetailsV4,
     MaxDetailsV4,
     InverterEnergyV4,
+    InverterEnergyDataV4,
+    StorageEnergyDataV4,
+    MaxEnergyDataV4,
+    SphEnergyDataV4,
+    SpaEnergyDataV4,
+    MinEnergyDataV4,
+    WitEnergyDataV4,
+    SphsEnergyDataV4,
+    NoahEnergyDataV4,
     StorageEnergyV4,
     MaxEnergyV4,
     SphEnergyV4,
@@ -45,10 +55,62 @@ from ..pydantic_models.api_v4 import (
     PowerV4,
     WifiStrengthV4,
 )
+from ..pydantic_models import model_responses
+from ..device_registry import DEVICE_FAMILIES, family_key, v4_model
+from ..columnar import HistoryColumns
 from ..session.growatt_api_session import GrowattApiSession
 
 
 DeviceTypeStr = Literal["inv", "storage", "max", "sph", "spa", "min", "wit", "sph-s", "noah"]
+DeviceEnergyDataV4 = Union[
+    InverterEnergyDataV4,
+    StorageEnergyDataV4,
+    MaxEnergyDataV4,
+    SphEnergyDataV4,
+    SpaEnergyDataV4,
+    MinEnergyDataV4,
+    WitEnergyDataV4,
+    SphsEnergyDataV4,
+    NoahEnergyDataV4,
+]
+
+# max number of devices per batch request
+MAX_DEVICES_PER_REQUEST = 100
+
+
+def _chunks(device_sn: List[str]) -> List[List[str]]:
+    return [device_sn[idx : idx + MAX_DEVICES_PER_REQUEST] for idx in range(0, len(device_sn), MAX_DEVICES_PER_REQUEST)]
+
+
+def _merge_responses(responses: List[dict]) -> dict:
+    """
+    Merge responses of requests for chunks of devices into a single response
+    * lists are concatenated, e.g. {"data": {"min": [...]}}
+    * dicts are merged, e.g. {"data": {"<sn1>": [...], "<sn2>": [...]}}
+    * error code/message of the first failed request is kept (data of successful requests is still merged)
+    """
+    merged = copy.deepcopy(responses[0])
+    for response in responses[1:]:
+        if response.get("code", 0) != 0 and merged.get("code", 0) == 0:
+            merged["code"] = response.get("code")
+            merged["message"] = response.get("message")
+        if response.get("error_code", 0) != 0 and merged.get("error_code", 0) == 0:
+            merged["error_code"] = response.get("error_code")
+            merged["error_msg"] = response.get("error_msg")
+        data = response.get("data")
+        if not isinstance(data, dict):
+            continue
+        if not isinstance(merged.get("data"), dict):
+            merged["data"] = {}
+        for key, value in data.items():
+            merged_value = merged["data"].get(key)
+            if isinstance(merged_value, list) and isinstance(value, list):
+                merged_value.extend(value)
+            elif isinstance(merged_value, dict) and isinstance(value, dict):
+                merged_value.update(value)
+            elif merged_value is None:
+                merged["data"][key] = value
+    return merged
 
 
 class ApiV4:
@@ -67,19 +129,43 @@ class ApiV4:
     def __init__(self, session: GrowattApiSession) -> None:
         self.session = session
 
+    def _post_in_chunks(
+        self,
+        endpoint: str,
+        device_sn: Union[str, List[str]],
+        params: dict,
+    ) -> dict:
+        """
+        POST request for any number of devices
+        Requests exceeding MAX_DEVICES_PER_REQUEST are split into chunks sent concurrently and merged into a single response.
+        """
+        if isinstance(device_sn, str):
+            device_sn = device_sn.split(",")
+        chunks = _chunks(device_sn)
+        if len(chunks) <= 1:
+            return self.session.post(endpoint=endpoint, params={"deviceSn": ",".join(device_sn), **params})
+
+        responses = self.session.request_many(
+            [
+                {"endpoint": endpoint, "method": "POST", "params": {"deviceSn": ",".join(chunk), **params}}
+                for chunk in chunks
+            ]
+        )
+        logger.debug(f"Split request to {endpoint} for {len(device_sn)} devices into {len(chunks)} requests")
+        return _merge_responses(responses)
+
     @staticmethod
-    def _device_type(device_type: Union[DeviceType, DeviceTypeStr]) -> DeviceType:
-        if isinstance(device_type, DeviceType):
+    def _device_type(device_type: Union[DeviceType, DeviceTypeStr]) -> str:
+        """v4 "deviceType" parameter (DeviceType value or name of a family registered by register_device_family())"""
+        device_type = family_key(device_type)
+        if device_type in DEVICE_FAMILIES or device_type in [x.value for x in DeviceType]:
             return device_type
 
-        try:
-            return DeviceType(device_type)
-        except ValueError:
-            raise ValueError(
-                f"device type '{device_type}' cannot be mapped to any known device type ({', '.join([x.name for x in DeviceType])})"
-            )
+        raise ValueError(
+            f"device type '{device_type}' cannot be mapped to any known device type ({', '.join([x.name for x in DeviceType])})"
+        )
 
-    def details(  # noqa: C901 'ApiV4.details' is too complex (11)
+    def details(
         self,
         device_sn: Union[str, List[str]],
         device_type: Union[DeviceType, DeviceTypeStr],
@@ -105,7 +191,7 @@ class ApiV4:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
             device_type (Union[DeviceType, DeviceTypeStr]): Device type (as returned by list())
 
         Returns:
@@ -1233,40 +1319,19 @@ class ApiV4:
 
         device_type = self._device_type(device_type=device_type)
 
-        if isinstance(device_sn, list):
-            assert len(device_sn) <= 100, "Max 100 devices per request"
-            device_sn = ",".join(device_sn)
+        details_model = v4_model(device_type, "details_v4")
 
-        response = self.session.post(
+        response = self._post_in_chunks(
             endpoint="new-api/queryDeviceInfo",
+            device_sn=device_sn,
             params={
-                "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
             },
         )
 
-        if device_type == DeviceType.INVERTER:
-            return InverterDetailsV4.model_validate(response)
-        elif device_type == DeviceType.STORAGE:
-            return StorageDetailsV4.model_validate(response)
-        elif device_type == DeviceType.MAX:
-            return MaxDetailsV4.model_validate(response)
-        elif device_type == DeviceType.SPH:
-            return SphDetailsV4.model_validate(response)
-        elif device_type == DeviceType.SPA:
-            return SpaDetailsV4.model_validate(response)
-        elif device_type == DeviceType.MIN:
-            return MinDetailsV4.model_validate(response)
-        elif device_type == DeviceType.WIT:
-            return WitDetailsV4.model_validate(response)
-        elif device_type == DeviceType.SPHS:
-            return SphsDetailsV4.model_validate(response)
-        elif device_type == DeviceType.NOAH:
-            return NoahDetailsV4.model_validate(response)
-        else:
-            raise ValueError(f"Unknown device type: {device_type}")
+        return details_model.model_validate(response)
 
-    def energy(  # noqa: C901 'ApiV4.energy' is too complex (11)
+    def energy(
         self,
         device_sn: Union[str, List[str]],
         device_type: Union[DeviceType, DeviceTypeStr],
@@ -1293,7 +1358,7 @@ class ApiV4:
         * NOAH devices have a frequency of once every minute.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
             device_type (Union[DeviceType, DeviceTypeStr]): Device type (as returned by list())
 
         Returns:
@@ -3258,38 +3323,70 @@ class ApiV4:
 
         device_type = self._device_type(device_type=device_type)
 
-        if isinstance(device_sn, list):
-            assert len(device_sn) <= 100, "Max 100 devices per request"
-            device_sn = ",".join(device_sn)
+        energy_model = v4_model(device_type, "energy_v4")
 
-        response = self.session.post(
+        response = self._post_in_chunks(
             endpoint="new-api/queryLastData",
+            device_sn=device_sn,
             params={
-                "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
             },
         )
 
-        if device_type == DeviceType.INVERTER:
-            return InverterEnergyV4.model_validate(response)
-        elif device_type == DeviceType.STORAGE:
-            return StorageEnergyV4.model_validate(response)
-        elif device_type == DeviceType.MAX:
-            return MaxEnergyV4.model_validate(response)
-        elif device_type == DeviceType.SPH:
-            return SphEnergyV4.model_validate(response)
-        elif device_type == DeviceType.SPA:
-            return SpaEnergyV4.model_validate(response)
-        elif device_type == DeviceType.MIN:
-            return MinEnergyV4.model_validate(response)
-        elif device_type == DeviceType.WIT:
-            return WitEnergyV4.model_validate(response)
-        elif device_type == DeviceType.SPHS:
-            return SphsEnergyV4.model_validate(response)
-        elif device_type == DeviceType.NOAH:
-            return NoahEnergyV4.model_validate(response)
-        else:
-            raise ValueError(f"Unknown device type: {device_type}")
+        return energy_model.model_validate(response)
+
+    def energy_multiple_types(
+        self,
+        device_sn: Dict[Union[DeviceType, DeviceTypeStr], List[str]],
+    ) -> Dict[str, DeviceEnergyDataV4]:
+        """
+        Last data of devices of multiple device types
+        Same as energy(), but for devices of different types at once.
+        All requests (one per device type and chunk of max 100 devices) are sent concurrently.
+        Devices of failed requests are missing in the result (see log).
+
+        Rate limit(s):
+        * The retrieval frequency is once every 5 minutes.
+        * NOAH devices have a frequency of once every minute.
+
+        Args:
+            device_sn (Dict[Union[DeviceType, DeviceTypeStr], List[str]]): serial numbers by device type
+
+        Returns:
+            Dict[str, Union[InverterEnergyDataV4, StorageEnergyDataV4, MaxEnergyDataV4, SphEnergyDataV4, SpaEnergyDataV4, MinEnergyDataV4, WitEnergyDataV4, SphsEnergyDataV4, NoahEnergyDataV4]]
+            device data by serial number
+            e.g.
+            {   'BZP0000000': MinEnergyDataV4(device_sn='BZP0000000', ...),
+                '0PVP0000000000': NoahEnergyDataV4(device_sn='0PVP0000000000', ...)}
+        """
+
+        requests_ = []
+        request_device_types = []
+        for device_type, device_sns in device_sn.items():
+            device_type = self._device_type(device_type=device_type)
+            v4_model(device_type, "energy_v4")  # fail early for unsupported device types
+            for chunk in _chunks(device_sns):
+                requests_.append(
+                    {
+                        "endpoint": "new-api/queryLastData",
+                        "method": "POST",
+                        "params": {"deviceSn": ",".join(chunk), "deviceType": device_type},
+                    }
+                )
+                request_device_types.append(device_type)
+
+        responses = self.session.request_many(requests_) if requests_ else []
+
+        devices = {}
+        for device_type, response in zip(request_device_types, responses):
+            with model_responses():
+                energy = v4_model(device_type, "energy_v4").model_validate(response)
+            if energy.error_code != 0:
+                logger.warning(f"Error {energy.error_code}: '{energy.error_msg}' querying {device_type} last data")
+                continue
+            for device in (energy.data.devices if energy.data else None) or []:
+                devices[device.device_sn] = device
+        return devices
 
     def power(  # noqa: C901 'ApiV4.power' is too complex (11)
         self,
@@ -3320,13 +3417,13 @@ class ApiV4:
             endpoint="new-api/readPower",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
             },
         )
 
         return PowerV4.model_validate(response)
 
-    def energy_history(  # noqa: C901 'ApiV4.energy' is too complex (11)
+    def energy_history(
         self,
         device_sn: str,
         device_type: Union[DeviceType, DeviceTypeStr],
@@ -3371,40 +3468,69 @@ class ApiV4:
         """
 
         device_type = self._device_type(device_type=device_type)
+        energy_history_model = v4_model(device_type, "energy_history_v4")
+        response = self._energy_history_response(device_sn=device_sn, device_type=device_type, date_=date_)
+
+        return energy_history_model.model_validate(response)
 
+    def _energy_history_response(
+        self,
+        device_sn: str,
+        device_type: str,
+        date_: Optional[datetime.date] = None,
+    ) -> dict:
         date_ = date_ or datetime.date.today()
 
-        response = self.session.post(
+        return self.session.post(
             endpoint="new-api/queryHistoricalData",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "date": date_.strftime("%Y-%m-%d"),
             },
         )
 
-        if device_type == DeviceType.INVERTER:
-            return InverterEnergyHistoryV4.model_validate(response)
-        elif device_type == DeviceType.STORAGE:
-            return StorageEnergyHistoryV4.model_validate(response)
-        elif device_type == DeviceType.MAX:
-            return MaxEnergyHistoryV4.model_validate(response)
-        elif device_type == DeviceType.SPH:
-            return SphEnergyHistoryV4.model_validate(response)
-        elif device_type == DeviceType.SPA:
-            return SpaEnergyHistoryV4.model_validate(response)
-        elif device_type == DeviceType.MIN:
-            return MinEnergyHistoryV4.model_validate(response)
-        elif device_type == DeviceType.WIT:
-            return WitEnergyHistoryV4.model_validate(response)
-        elif device_type == DeviceType.SPHS:
-            return SphsEnergyHistoryV4.model_validate(response)
-        elif device_type == DeviceType.NOAH:
-            return NoahEnergyHistoryV4.model_validate(response)
-        else:
-            raise ValueError(f"Unknown device type: {device_type}")
+    def energy_history_columns(
+        self,
+        device_sn: str,
+        device_type: Union[DeviceType, DeviceTypeStr],
+        date_: Optional[datetime.date] = None,
+        fields: Optional[List[str]] = None,
+    ) -> HistoryColumns:
+        """
+        One day data as columns (field name -> NumPy array)
+        Same request as energy_history(), but records are converted to columns directly from the JSON response
+        (without creating a pydantic model per record). Requires optional dependency "numpy".
+
+        Rate limit(s):
+        * The retrieval frequency is once every 5 minutes.
+
+        Args:
+            device_sn (str): Device unique serial number (SN)
+            device_type (Union[DeviceType, DeviceTypeStr]): Device type (as returned by list())
+            date_ (Optional[date]): Start Date - defaults to today
+            fields (Optional[List[str]]): fields to return, e.g. ["time", "ppv"] - defaults to all fields
 
-    def energy_history_multiple(  # noqa: C901 'ApiV4.energy' is too complex (11)
+        Returns:
+            HistoryColumns
+            e.g.
+            HistoryColumns(
+                error_code=0,
+                error_msg='SUCCESSFUL_OPERATION',
+                columns={
+                    'time': array(['2024-05-25T16:56:33.000', ...], dtype='datetime64[ms]'),
+                    'ppv': array([1234.5, ...]),
+                    <see energy() for attributes>
+                }
+            )
+        """
+
+        device_type = self._device_type(device_type=device_type)
+        energy_data_model = v4_model(device_type, "energy_data_v4")
+        response = self._energy_history_response(device_sn=device_sn, device_type=device_type, date_=date_)
+        return HistoryColumns.from_response(response, model=energy_data_model, fields=fields)
+
+    def energy_history_multiple(
         self,
         device_sn: Union[str, List[str]],
         device_type: Union[DeviceType, DeviceTypeStr],
@@ -3431,7 +3557,7 @@ class ApiV4:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
             device_type (Union[DeviceType, DeviceTypeStr]): Device type (as returned by list())
             date_ (Optional[date]): Start Date - defaults to today
 
@@ -3448,41 +3574,20 @@ class ApiV4:
 
         device_type = self._device_type(device_type=device_type)
 
-        date_ = date_ or datetime.date.today()
+        energy_history_multiple_model = v4_model(device_type, "energy_history_multiple_v4")
 
-        if isinstance(device_sn, list):
-            assert len(device_sn) <= 100, "Max 100 devices per request"
-            device_sn = ",".join(device_sn)
+        date_ = date_ or datetime.date.today()
 
-        response = self.session.post(
+        response = self._post_in_chunks(
             endpoint="new-api/queryDevicesHistoricalData",
+            device_sn=device_sn,
             params={
-                "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "date": date_.strftime("%Y-%m-%d"),
             },
         )
 
-        if device_type == DeviceType.INVERTER:
-            return InverterEnergyHistoryMultipleV4.model_validate(response)
-        elif device_type == DeviceType.STORAGE:
-            return StorageEnergyHistoryMultipleV4.model_validate(response)
-        elif device_type == DeviceType.MAX:
-            return MaxEnergyHistoryMultipleV4.model_validate(response)
-        elif device_type == DeviceType.SPH:
-            return SphEnergyHistoryMultipleV4.model_validate(response)
-        elif device_type == DeviceType.SPA:
-            return SpaEnergyHistoryMultipleV4.model_validate(response)
-        elif device_type == DeviceType.MIN:
-            return MinEnergyHistoryMultipleV4.model_validate(response)
-        elif device_type == DeviceType.WIT:
-            return WitEnergyHistoryMultipleV4.model_validate(response)
-        elif device_type == DeviceType.SPHS:
-            return SphsEnergyHistoryMultipleV4.model_validate(response)
-        elif device_type == DeviceType.NOAH:
-            return NoahEnergyHistoryMultipleV4.model_validate(response)
-        else:
-            raise ValueError(f"Unknown device type: {device_type}")
+        return energy_history_multiple_model.model_validate(response)
 
     def setting_write_on_off(  # noqa: C901 'ApiV4.energy' is too complex (11)
         self,
@@ -3519,7 +3624,7 @@ class ApiV4:
 
         device_type = self._device_type(device_type=device_type)
 
-        if device_type == DeviceType.NOAH:
+        if device_type == DeviceType.NOAH.value:
             raise AttributeError("NOAH devices do not support power on/off setting")
 
         if power_on:
@@ -3529,15 +3634,15 @@ class ApiV4:
             value = 0
             log_txt = "off"
 
-        logger.info(f"Turning {device_type.name} device '{device_sn}' {log_txt}")
         response = self.session.post(
             endpoint="new-api/setOnOrOff",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "value": value,
             },
         )
+        logger.info(f"Turning {device_type} device '{device_sn}' {log_txt}")
 
         return SettingWriteV4.model_validate(response)
 
@@ -3578,21 +3683,22 @@ class ApiV4:
         device_type = self._device_type(device_type=device_type)
 
         active_power = int(active_power)
-        if device_type == DeviceType.NOAH:
+        if device_type == DeviceType.NOAH.value:
             assert 0 <= active_power <= 800, "NOAH devices can be configured to 0 ~ 800 W"
-            logger.info(f"Setting {device_type} device '{device_sn}' power to {active_power} W")
+            log_txt = f"power to {active_power} W"
         else:
             assert 0 <= active_power <= 100, "active power must be in range 0 ~ 100 %"
-            logger.info(f"Setting {device_type} device '{device_sn}' active power to {active_power} %")
+            log_txt = f"active power to {active_power} %"
 
         response = self.session.post(
             endpoint="new-api/setPower",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "value": active_power,
             },
         )
+        logger.info(f"Setting {device_type} device '{device_sn}' {log_txt}")
 
         return SettingWriteV4.model_validate(response)
 
@@ -3632,19 +3738,18 @@ class ApiV4:
         device_type = self._device_type(device_type=device_type)
 
         soc_limit = int(soc_limit)
-        if device_type != DeviceType.NOAH:
+        if device_type != DeviceType.NOAH.value:
             raise AttributeError("This API is only applicable to NOAH device type")
 
-        logger.info(f"Setting {device_type} device '{device_sn}' SOC discharge upper limit to {soc_limit} %")
-
         response = self.session.post(
             endpoint="new-api/setHighLimitSoc",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "value": soc_limit,
             },
         )
+        logger.info(f"Setting {device_type} device '{device_sn}' SOC discharge upper limit to {soc_limit} %")
 
         return SettingWriteV4.model_validate(response)
 
@@ -3683,21 +3788,20 @@ class ApiV4:
 
         device_type = self._device_type(device_type=device_type)
 
-        if device_type != DeviceType.NOAH:
+        if device_type != DeviceType.NOAH.value:
             raise AttributeError("This API is only applicable to NOAH device type")
 
         soc_limit = int(soc_limit)
 
-        logger.info(f"Setting {device_type} device '{device_sn}' SOC discharge lower limit to {soc_limit} %")
-
         response = self.session.post(
             endpoint="new-api/setLowLimitSoc",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "value": soc_limit,
             },
         )
+        logger.info(f"Setting {device_type} device '{device_sn}' SOC discharge lower limit to {soc_limit} %")
 
         return SettingWriteV4.model_validate(response)
 
@@ -3746,7 +3850,7 @@ class ApiV4:
 
         device_type = self._device_type(device_type=device_type)
 
-        if device_type != DeviceType.NOAH:
+        if device_type != DeviceType.NOAH.value:
             raise AttributeError("This API is only applicable to NOAH device type")
 
         time_period_nr = int(time_period_nr)
@@ -3770,7 +3874,7 @@ class ApiV4:
             endpoint="new-api/setTimeSegment",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "type": time_period_nr,
                 "startTime": start_time.strftime("%H:%M"),
                 "endTime": end_time.strftime("%H:%M"),
@@ -3839,7 +3943,7 @@ class ApiV4:
             endpoint="new-api/readVppParameter",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "setType": parameter_id,
             },
         )
@@ -4034,7 +4138,7 @@ class ApiV4:
             endpoint="new-api/setVppParameter",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "setType": parameter_id,
                 "value": str(value),
             },
@@ -4235,7 +4339,7 @@ class ApiV4:
             endpoint="new-api/setNewVppParameter",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "setType": parameter_id,
                 "value": str(value),
             },
@@ -4298,7 +4402,7 @@ class ApiV4:
             endpoint="new-api/removeVppTimePeriod",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "setType": parameter_id,
             },
         )
@@ -4348,7 +4452,7 @@ class ApiV4:
 
         device_type = self._device_type(device_type=device_type)
 
-        if device_type != DeviceType.NOAH:
+        if device_type != DeviceType.NOAH.value:
             raise AttributeError("This API is only applicable to NOAH device type")
 
         # the parameter value set, Device Model List:Device Model List,
@@ -4367,7 +4471,7 @@ class ApiV4:
             endpoint="new-api/setDevice",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "value": _value,
             },
         )
@@ -4407,14 +4511,14 @@ class ApiV4:
 
         device_type = self._device_type(device_type=device_type)
 
-        if device_type != DeviceType.NOAH:
+        if device_type != DeviceType.NOAH.value:
             raise AttributeError("This API is only applicable to NOAH device type")
 
         response = self.session.post(
             endpoint="new-api/setGridCharge",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "value": int(bool(grid_charging)),
             },
         )
@@ -4454,14 +4558,14 @@ class ApiV4:
 
         device_type = self._device_type(device_type=device_type)
 
-        if device_type != DeviceType.NOAH:
+        if device_type != DeviceType.NOAH.value:
             raise AttributeError("This API is only applicable to NOAH device type")
 
         response = self.session.post(
             endpoint="new-api/setOffGrid",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
                 "value": int(bool(off_grid)),
             },
         )
@@ -4497,7 +4601,7 @@ class ApiV4:
             endpoint="new-api/getWiFiSignalByDevice",
             params={
                 "deviceSn": device_sn,
-                "deviceType": device_type.value,
+                "deviceType": device_type,
             },
         )
 
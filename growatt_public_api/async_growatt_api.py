@@ -0,0 +1,663 @@
+import asyncio
+import functools
+import inspect
+import json
+import typing
+from typing import Optional, Self, Union, Literal, List, Any, Type, Dict, Iterable, Callable, Awaitable, Tuple
+from loguru import logger
+from .growatt_types import DeviceType
+from .pagination import PageIterator, AsyncPageIterator
+from .session.async_growatt_api_session import AsyncGrowattApiSession
+from .session.connection import ConnectionSettings
+from .session.rate_limiter import RateLimiter
+from .session.response_cache import ResponseCache
+from .session.retry import RetryPolicy
+from .api_v4.api_v4 import ApiV4, DeviceEnergyDataV4
+from .growatt_api import group_devices_by_type
+from .user.user import User
+from .plant.plant import Plant
+from .datalogger.datalogger import Datalogger
+from .device.device import Device
+from .device.device_type_index import DeviceTypeIndex
+from .device_registry import device_api_class
+from .inverter.inverter import Inverter
+from .storage.storage import Storage
+from .min.min import Min
+from .max.max import Max
+from .sph.sph import Sph
+from .spa.spa import Spa
+from .pcs.pcs import Pcs
+from .hps.hps import Hps
+from .pbd.pbd import Pbd
+from .smart_meter.smart_meter import SmartMeter
+from .env_sensor.env_sensor import EnvSensor
+from .groboost.groboost import Groboost
+from .wit.wit import Wit
+from .sphs.sphs import Sphs
+from .noah.noah import Noah
+from .vpp.vpp import Vpp
+
+
+class _PendingRequests(BaseException):
+    """
+    Raised by _RequestRecorder for requests without a response yet, aborting the sync method
+    (BaseException, so it is not caught by error handling of the sync method)
+    """
+
+    def __init__(self, requests_: List[dict], max_workers: Optional[int] = None) -> None:
+        super().__init__(requests_)
+        self.requests = requests_
+        self.max_workers = max_workers  # None = single request()
+
+
+class _RequestRecorder:
+    """
+    Stands in for GrowattApiSession while a sync API method is executed on behalf of its async variant.
+
+    Requests are answered by the responses received so far. Otherwise the request is recorded and the method aborted
+    (see _PendingRequests), so AsyncApi._call() can await it using AsyncGrowattApiSession and call the method again.
+    Endpoint methods send a single request (or a single request_many() batch), so they are executed twice:
+    once to build the request, once to validate the response - both on the event loop.
+    """
+
+    def __init__(self) -> None:
+        self._responses: Dict[str, Any] = {}
+
+    def get(
+        self,
+        endpoint: Optional[str] = None,
+        params: Optional[dict] = None,
+    ):
+        return self.request(endpoint=endpoint, method="GET", params=params)
+
+    def post(
+        self,
+        endpoint: Optional[str] = None,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ):
+        return self.request(endpoint=endpoint, method="POST", params=params, data=data)
+
+    def request(
+        self,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        use_cache: bool = True,
+    ):
+        request_ = {"endpoint": endpoint, "method": method, "params": params, "data": data, "use_cache": use_cache}
+        key = self._key(request_)
+        if key not in self._responses:
+            raise _PendingRequests([request_])
+        return self._responses[key]
+
+    def request_many(self, requests_: List[dict], max_workers: int = 8) -> List[dict]:
+        pending = [request_ for request_ in requests_ if self._key(request_) not in self._responses]
+        if pending:
+            raise _PendingRequests(pending, max_workers=max_workers)
+        return [self._responses[self._key(request_)] for request_ in requests_]
+
+    def add(self, requests_: List[dict], responses: List[Any]) -> None:
+        for request_, response in zip(requests_, responses):
+            self._responses[self._key(request_)] = response
+
+    @staticmethod
+    def _key(request_: dict) -> str:
+        request_ = {"method": "GET", "params": None, "data": None, "use_cache": True, **request_}
+        return json.dumps(request_, sort_keys=True, default=str)
+
+
+class _SessionBridge:
+    """
+    Stands in for GrowattApiSession while a sync API method is executed in a worker thread
+    (see AsyncGrowattApiSession.run_sync() and AsyncApi._run_sync_methods).
+
+    Its requests are sent by the AsyncGrowattApiSession on the event loop, while the worker thread waits for the response.
+    Requests issued together using request_many() are sent concurrently.
+    """
+
+    def __init__(self, session: AsyncGrowattApiSession, loop: asyncio.AbstractEventLoop) -> None:
+        self._session = session
+        self._loop = loop
+        self.cancelled = False  # awaiting call has been cancelled - do not send further requests
+
+    def get(
+        self,
+        endpoint: Optional[str] = None,
+        params: Optional[dict] = None,
+    ):
+        return self.request(endpoint=endpoint, method="GET", params=params)
+
+    def post(
+        self,
+        endpoint: Optional[str] = None,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ):
+        return self.request(endpoint=endpoint, method="POST", params=params, data=data)
+
+    def request(
+        self,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        use_cache: bool = True,
+    ):
+        return self._wait(
+            lambda: self._session.request(
+                endpoint=endpoint, method=method, params=params, data=data, use_cache=use_cache
+            )
+        )
+
+    def request_many(self, requests_: List[dict], max_workers: int = 8) -> List[dict]:
+        return self._wait(lambda: self._session.request_many(requests_, max_workers=max_workers))
+
+    def _wait(self, coroutine_function: Callable[[], Awaitable[Any]]) -> Any:
+        if self.cancelled:
+            raise asyncio.CancelledError()
+        return asyncio.run_coroutine_threadsafe(coroutine_function(), self._loop).result()
+
+
+def _async_method(name: str, sync_method):
+    @functools.wraps(sync_method)
+    async def method(self, *args, **kwargs):
+        return await self._call(name, *args, **kwargs)
+
+    return method
+
+
+def _async_page_iterator_method(name: str, sync_method):
+    @functools.wraps(sync_method)
+    def method(self, *args, **kwargs) -> AsyncPageIterator:
+        # creating the PageIterator does not send any request - pages are fetched by the AsyncPageIterator
+        api = self._api_class(session=_RequestRecorder(), **self._init_kwargs)
+        return getattr(api, name)(*args, **kwargs).to_async(fetch=self._call)
+
+    return method
+
+
+def _returns_page_iterator(sync_method) -> bool:
+    return_type = inspect.signature(sync_method).return_annotation
+    return (typing.get_origin(return_type) or return_type) is PageIterator
+
+
+class AsyncApi:
+    """
+    Base class for async variants of the (sync) device APIs.
+
+    The sync implementation is re-used: its methods are executed on the event loop with a _RequestRecorder,
+    their requests are awaited using AsyncGrowattApiSession (no worker threads involved).
+    Methods issuing several requests one after another (each depending on the previous response)
+    are listed in `_run_sync_methods` and executed in a worker thread instead (see AsyncGrowattApiSession.run_sync()).
+
+    Subclasses just need to set `_api_class`. All public methods of `_api_class` are available as coroutines
+    (except iter_...() methods returning a PageIterator, which return an AsyncPageIterator for use with `async for`).
+    """
+
+    _api_class: Type = None
+    _run_sync_methods: Tuple[str, ...] = ()
+    session: AsyncGrowattApiSession
+
+    def __init__(self, session: AsyncGrowattApiSession, **kwargs) -> None:
+        self.session = session
+        self._init_kwargs = kwargs
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, sync_method in inspect.getmembers(cls._api_class, predicate=inspect.isfunction):
+            if name.startswith("_") or name in cls.__dict__:
+                continue  # private or overridden by subclass
+            if _returns_page_iterator(sync_method):
+                # iter_...() methods return async iterators
+                setattr(cls, name, _async_page_iterator_method(name, sync_method))
+            else:
+                setattr(cls, name, _async_method(name, sync_method))
+
+    async def _call(self, name: str, *args, **kwargs) -> Any:
+        if name in self._run_sync_methods:
+            return await self._run_sync(name, *args, **kwargs)
+
+        recorder = _RequestRecorder()
+        while True:
+            api = self._api_class(session=recorder, **self._init_kwargs)
+            try:
+                return getattr(api, name)(*args, **kwargs)
+            except _PendingRequests as pending:
+                if pending.max_workers is None:
+                    responses = [await self.session.request(**pending.requests[0])]
+                else:
+                    responses = await self.session.request_many(pending.requests, max_workers=pending.max_workers)
+                recorder.add(pending.requests, responses)
+
+    async def _run_sync(self, name: str, *args, **kwargs) -> Any:
+        bridge = _SessionBridge(self.session, loop=asyncio.get_running_loop())
+        api = self._api_class(session=bridge, **self._init_kwargs)
+        try:
+            return await self.session.run_sync(getattr(api, name), *args, **kwargs)
+        except asyncio.CancelledError:
+            bridge.cancelled = True
+            raise
+
+
+class AsyncApiV4(AsyncApi):
+    """async variant of ApiV4"""
+
+    _api_class = ApiV4
+
+
+class AsyncUser(AsyncApi):
+    """async variant of User"""
+
+    _api_class = User
+
+
+class AsyncPlant(AsyncApi):
+    """async variant of Plant"""
+
+    _api_class = Plant
+
+
+class AsyncDatalogger(AsyncApi):
+    """async variant of Datalogger"""
+
+    _api_class = Datalogger
+
+
+class AsyncDevice(AsyncApi):
+    """async variant of Device"""
+
+    _api_class = Device
+    # walk device lists page by page (each request depends on the previous response)
+    _run_sync_methods = ("get_device_type", "get_device_types")
+    device_type_index: DeviceTypeIndex
+
+    def __init__(
+        self, session: AsyncGrowattApiSession, device_type_index: Optional[DeviceTypeIndex] = None, **kwargs
+    ) -> None:
+        # session bridges are not bound to a token - share the index of the async session
+        if device_type_index is None:
+            device_type_index = DeviceTypeIndex.for_session(session)
+        super().__init__(session, device_type_index=device_type_index, **kwargs)
+
+
+class AsyncInverter(AsyncApi):
+    """async variant of Inverter"""
+
+    _api_class = Inverter
+
+
+class AsyncStorage(AsyncApi):
+    """async variant of Storage"""
+
+    _api_class = Storage
+
+
+class AsyncMin(AsyncApi):
+    """async variant of Min"""
+
+    _api_class = Min
+
+
+class AsyncMax(AsyncApi):
+    """async variant of Max"""
+
+    _api_class = Max
+
+
+class AsyncSph(AsyncApi):
+    """async variant of Sph"""
+
+    _api_class = Sph
+
+
+class AsyncSpa(AsyncApi):
+    """async variant of Spa"""
+
+    _api_class = Spa
+
+
+class AsyncPcs(AsyncApi):
+    """async variant of Pcs"""
+
+    _api_class = Pcs
+
+
+class AsyncHps(AsyncApi):
+    """async variant of Hps"""
+
+    _api_class = Hps
+
+
+class AsyncPbd(AsyncApi):
+    """async variant of Pbd"""
+
+    _api_class = Pbd
+
+
+class AsyncSmartMeter(AsyncApi):
+    """async variant of SmartMeter"""
+
+    _api_class = SmartMeter
+
+
+class AsyncEnvSensor(AsyncApi):
+    """async variant of EnvSensor"""
+
+    _api_class = EnvSensor
+
+
+class AsyncGroboost(AsyncApi):
+    """async variant of Groboost"""
+
+    _api_class = Groboost
+
+
+class AsyncWit(AsyncApi):
+    """async variant of Wit"""
+
+    _api_class = Wit
+
+
+class AsyncSphs(AsyncApi):
+    """async variant of Sphs"""
+
+    _api_class = Sphs
+
+
+class AsyncNoah(AsyncApi):
+    """async variant of Noah"""
+
+    _api_class = Noah
+
+
+class AsyncVpp(AsyncApi):
+    """async variant of Vpp"""
+
+    _api_class = Vpp
+
+
+def _async_api_class(api_class: Type) -> Type[AsyncApi]:
+    """async variant of a device API class (created on demand for classes registered by register_device_family())"""
+    for subclass in AsyncApi.__subclasses__():
+        if subclass._api_class is api_class:
+            return subclass
+    return type(
+        f"Async{api_class.__name__}",
+        (AsyncApi,),
+        {"__doc__": f"async variant of {api_class.__name__}", "_api_class": api_class},
+    )
+
+
+class AsyncGrowattApi:
+    """
+    asyncio variant of GrowattApi
+
+    All endpoint methods are coroutines, e.g.
+        async with AsyncGrowattApi(token="your_token") as api:
+            min_details = await api.min.details(device_sn="your_device_sn")
+    """
+
+    session: AsyncGrowattApiSession
+    _api_v4: AsyncApiV4 = None
+    _user: AsyncUser = None
+    _plant: AsyncPlant = None
+    _datalogger: AsyncDatalogger = None
+    _device: AsyncDevice = None
+    _inverter: AsyncInverter = None
+    _storage: AsyncStorage = None
+    _min: AsyncMin = None
+    _max: AsyncMax = None
+    _sph: AsyncSph = None
+    _spa: AsyncSpa = None
+    _pcs: AsyncPcs = None
+    _hps: AsyncHps = None
+    _pbd: AsyncPbd = None
+    _smart_meter: AsyncSmartMeter = None
+    _env_sensor: AsyncEnvSensor = None
+    _groboost: AsyncGroboost = None
+    _wit: AsyncWit = None
+    _sphs: AsyncSphs = None
+    _noah: AsyncNoah = None
+
+    def __init__(
+        self,
+        token: str,
+        server_url: Optional[str] = None,
+        use_cache: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = True,
+        connection: Optional[ConnectionSettings] = None,
+        retry: Optional[RetryPolicy] = None,
+    ) -> None:
+        """
+        Initialize the AsyncGrowattApi with a session.
+
+        :param token: The API token for authentication.
+        :param server_url: The URL of the Growatt API server. If not provided, it defaults to the production server.
+        :param use_cache: Cache requests to Growatt API to avoid 'API rate limit exceeded' errors.
+        :param rate_limiter: Delay or reject requests exceeding documented rate limits before they are sent.
+        :param cache: Cache configuration (e.g. ResponseCache(mode="read-through")). Defaults to fallback-only cache.
+        :param coalesce_requests: Identical concurrent requests share a single request to the server.
+        :param connection: Connection pool size, timeouts and keep-alive (e.g. ConnectionSettings(pool_maxsize=64)).
+        :param retry: Retry transport errors, server errors and rate limited requests (e.g. RetryPolicy()).
+
+        :raises AssertionError: If no token is provided.
+        """
+        assert token
+
+        self.session = AsyncGrowattApiSession(
+            token=token,
+            server_url=server_url,
+            use_cache=use_cache,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            coalesce_requests=coalesce_requests,
+            connection=connection,
+            retry=retry,
+        )
+
+    @classmethod
+    def using_test_server_v1(cls) -> Self:
+        """
+        Create a session using the test server
+        """
+        return cls(
+            server_url="https://test.growatt.com",
+            # test token from official API docs https://www.showdoc.com.cn/262556420217021/1494053950115877
+            token="6eb6f069523055a339d71e5b1f6c88cc",  # gitleaks:allow
+        )
+
+    @classmethod
+    def using_test_server_v4(cls) -> Self:
+        """
+        Create a session using the test server
+        """
+        return cls(
+            server_url="http://183.62.216.35:8081",
+            # test token from official API docs https://www.showdoc.com.cn/2540838290984246/11292912972201443
+            token="wa265d2h1og0873ml07142r81564hho6",  # gitleaks:allow
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self) -> None:
+        await self.session.close()
+
+    # ##############################################################################
+    # init specific apis on demand
+    @property
+    def api_v4(self):
+        if self._api_v4 is None:
+            self._api_v4 = AsyncApiV4(self.session)
+        return self._api_v4
+
+    @property
+    def user(self):
+        if self._user is None:
+            self._user = AsyncUser(self.session)
+        return self._user
+
+    @property
+    def plant(self):
+        if self._plant is None:
+            self._plant = AsyncPlant(self.session)
+        return self._plant
+
+    @property
+    def datalogger(self):
+        if self._datalogger is None:
+            self._datalogger = AsyncDatalogger(self.session)
+        return self._datalogger
+
+    @property
+    def device(self):
+        if self._device is None:
+            self._device = AsyncDevice(self.session)
+        return self._device
+
+    @property
+    def inverter(self):
+        if self._inverter is None:
+            self._inverter = AsyncInverter(self.session)
+        return self._inverter
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            self._storage = AsyncStorage(self.session)
+        return self._storage
+
+    @property
+    def min(self):
+        if self._min is None:
+            self._min = AsyncMin(self.session)
+        return self._min
+
+    @property
+    def max(self):
+        if self._max is None:
+            self._max = AsyncMax(self.session)
+        return self._max
+
+    @property
+    def sph(self):
+        if self._sph is None:
+            self._sph = AsyncSph(self.session)
+        return self._sph
+
+    @property
+    def spa(self):
+        if self._spa is None:
+            self._spa = AsyncSpa(self.session)
+        return self._spa
+
+    @property
+    def pcs(self):
+        if self._pcs is None:
+            self._pcs = AsyncPcs(self.session)
+        return self._pcs
+
+    @property
+    def hps(self):
+        if self._hps is None:
+            self._hps = AsyncHps(self.session)
+        return self._hps
+
+    @property
+    def pbd(self):
+        if self._pbd is None:
+            self._pbd = AsyncPbd(self.session)
+        return self._pbd
+
+    @property
+    def smart_meter(self):
+        if self._smart_meter is None:
+            self._smart_meter = AsyncSmartMeter(self.session)
+        return self._smart_meter
+
+    @property
+    def env_sensor(self):
+        if self._env_sensor is None:
+            self._env_sensor = AsyncEnvSensor(self.session)
+        return self._env_sensor
+
+    @property
+    def groboost(self):
+        if self._groboost is None:
+            self._groboost = AsyncGroboost(self.session)
+        return self._groboost
+
+    @property
+    def wit(self):
+        if self._wit is None:
+            self._wit = AsyncWit(self.session)
+        return self._wit
+
+    @property
+    def sphs(self):
+        if self._sphs is None:
+            self._sphs = AsyncSphs(self.session)
+        return self._sphs
+
+    @property
+    def noah(self):
+        if self._noah is None:
+            self._noah = AsyncNoah(self.session)
+        return self._noah
+
+    # ##############################################################################
+
+    async def fleet_snapshot(
+        self, device_types: Optional[Iterable[DeviceType]] = None
+    ) -> Dict[str, DeviceEnergyDataV4]:
+        """
+        Latest data of all devices accessible with the token (see GrowattApi.fleet_snapshot()).
+
+        :param device_types: Only include these device types (default: all)
+        :return: Latest data by device serial number, e.g. {"BZP0000000": MinEnergyDataV4(...), ...}
+        """
+        devices = [device async for device in self.device.iter_list()]
+        return await self.api_v4.energy_multiple_types(
+            device_sn=group_devices_by_type(devices, device_types=device_types)
+        )
+
+    async def api_for_device(self, device_sn: str, device_type: Optional[DeviceType] = None) -> Optional[
+        Union[
+            AsyncGroboost,
+            AsyncHps,
+            AsyncInverter,
+            AsyncMax,
+            AsyncMin,
+            AsyncNoah,
+            AsyncPbd,
+            AsyncPcs,
+            AsyncSpa,
+            AsyncSph,
+            AsyncSphs,
+            AsyncStorage,
+            AsyncWit,
+        ]
+    ]:
+        """
+        Get the (async) API for a specific device.
+
+        :param device_sn: The serial number of the device.
+        :param device_type: The type of the device. If not provided, it will be automatically determined from the device's serial number.
+        """
+        if device_type is None:
+            device_type = await self.device.get_device_type(device_sn)
+
+        api_class = device_api_class(device_type)
+        if api_class is None:
+            logger.error(f"Unknown device type: {device_type} for {device_sn=}")
+            return None
+        return _async_api_class(api_class)(session=self.session, device_sn=device_sn)
@@ -0,0 +1,315 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional, Union, List, Dict, Iterator, NamedTuple, Tuple, Any
+from loguru import logger
+from .growatt_api import GrowattApi
+from .growatt_types import DeviceType
+from .pagination import PageIterator
+from .session.rate_limiter import RateLimit, ENDPOINT_RATE_LIMITS
+
+# max interval of energy_history() endpoints
+HISTORY_WINDOW_DAYS = 7
+
+# history method and its (rate limited) endpoint by device type
+HISTORY_METHODS: Dict[DeviceType, Tuple[str, str, str]] = {
+    # device_type: (method, items, endpoint)
+    DeviceType.INVERTER: ("energy_history", "datas", "device/inverter/data"),
+    DeviceType.STORAGE: ("energy_history", "datas", "device/storage/storage_data"),
+    DeviceType.MAX: ("energy_history", "datas", "device/max/max_data"),
+    DeviceType.MIN: ("energy_history", "datas", "device/tlx/tlx_data"),
+    DeviceType.SPH: ("energy_history", "datas", "device/mix/mix_data"),
+    DeviceType.SPA: ("energy_history", "datas", "device/spa/spa_data"),
+    DeviceType.PCS: ("energy_history", "datas", "device/pcs/pcs_data"),
+    DeviceType.HPS: ("energy_history", "datas", "device/hps/hps_data"),
+    DeviceType.PBD: ("energy_history", "datas", "device/pbd/pbd_data"),
+    DeviceType.GROBOOST: ("metrics_history", "datas", "device/boost/boost_data"),
+}
+
+# error code returned if rate limit is exceeded
+_RATE_LIMIT_ERROR_CODE = 10012
+
+
+class BackfillError(Exception):
+    """a page could not be retrieved (other error than rate limit) within max_retries"""
+
+
+class HistoryRecord(NamedTuple):
+    device_sn: str
+    device_type: DeviceType
+    data: Any  # single item of the device's energy_history() response, e.g. MinEnergyOverviewData
+
+
+def history_windows(start_date: date, end_date: date) -> List[Tuple[date, date]]:
+    """
+    split date range into windows allowed by energy_history() (max 7 days, start and end date inclusive)
+    e.g. 2025-01-01 - 2025-01-10 -> [(2025-01-01, 2025-01-07), (2025-01-08, 2025-01-10)]
+    """
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        window_end = min(window_start + timedelta(days=HISTORY_WINDOW_DAYS - 1), end_date)
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+    return windows
+
+
+class _DeviceBackfill:
+    """
+    backfill progress of a single device: next window and page to request
+    """
+
+    def __init__(
+        self,
+        device_sn: str,
+        device_type: DeviceType,
+        device_api: Any,
+        windows: List[Tuple[date, date]],
+        request_interval: float,
+        timezone: Optional[str],
+        limit: int,
+        max_retries: int,
+    ) -> None:
+        self.device_sn = device_sn
+        self.device_type = device_type
+        self.device_api = device_api
+        self.windows = windows
+        self.request_interval = request_interval
+        self.timezone = timezone
+        self.limit = limit
+        self.max_retries = max_retries
+        self.window = 0
+        self.page = 1
+        self.next_request_at = 0.0
+        self.retries = 0
+
+    @property
+    def done(self) -> bool:
+        return self.window >= len(self.windows)
+
+    def _pages(self) -> PageIterator:
+        method, items, _ = HISTORY_METHODS[self.device_type]
+        start_date, end_date = self.windows[self.window]
+        return PageIterator(
+            self.device_api,
+            method,
+            items=items,
+            start_date=start_date,
+            end_date=end_date,
+            timezone=self.timezone,
+            limit=self.limit,
+        )
+
+    def fetch(self):
+        return self._pages().fetch_page(self.page)
+
+    def advance(self, response) -> List[Any]:
+        """move to next page (or window) after `response` has been received - returns items of response"""
+        self.next_request_at = time.monotonic() + self.request_interval
+        if response.error_code == _RATE_LIMIT_ERROR_CODE:
+            logger.debug(f"Rate limit exceeded for {self.device_sn} - retrying in {self.request_interval:.0f}s")
+            return []
+        if response.error_code != 0:
+            # same page is requested again - window is not advanced (and checkpoint stays unchanged)
+            self._retry(response)
+            return []
+        self.retries = 0
+        pages = self._pages()
+        page_items = pages.page_items(response)
+        item_count = (self.page - 1) * self.limit + len(page_items or [])
+        if pages.has_next_page(response, page_items=page_items, item_count=item_count):
+            self.page += 1
+        else:
+            self.window += 1
+            self.page = 1
+        return page_items or []
+
+    def _retry(self, response) -> None:
+        """retry current page after an error - raises BackfillError if max_retries is exceeded"""
+        start_date, end_date = self.windows[self.window]
+        error = (
+            f"Error {response.error_code}: '{response.error_msg}' requesting history of {self.device_sn} "
+            f"({start_date} - {end_date}, page {self.page})"
+        )
+        self.retries += 1
+        if self.retries > self.max_retries:
+            raise BackfillError(error)
+        logger.warning(f"{error} - retrying in {self.request_interval:.0f}s ({self.retries}/{self.max_retries})")
+
+    def checkpoint(self) -> dict:
+        if self.done:
+            return {"done": True}
+        return {"window_start": self.windows[self.window][0].isoformat(), "page": self.page}
+
+    def restore(self, checkpoint: dict) -> None:
+        if checkpoint.get("done"):
+            self.window = len(self.windows)
+            return
+        window_start = date.fromisoformat(checkpoint["window_start"])
+        self.window = next(idx for idx, (start, _) in enumerate(self.windows) if start == window_start)
+        self.page = checkpoint["page"]
+
+
+class HistoryBackfill:
+    """
+    Backfill history data (energy_history() / metrics_history()) of one or many devices for an arbitrary date range
+
+    * the date range is split into windows of max 7 days (as required by the API)
+    * each window is paged through (100 records per page)
+    * requests are scheduled according to the documented per-device rate limits (see ENDPOINT_RATE_LIMITS),
+      requests for different devices are sent concurrently, rate limited requests are retried
+    * progress is saved to `checkpoint_file` after each page, so an interrupted backfill resumes where it stopped
+      (records of the page being processed when interrupted are returned again)
+    * pages failing with other errors are retried up to `max_retries` times, then BackfillError is raised
+      (the checkpoint still points to the failed page, so the backfill can be resumed later)
+    * records are streamed in order of arrival (ordered by date per device)
+
+    Supported device types: INVERTER, STORAGE, MAX, MIN, SPH, SPA, PCS, HPS, PBD, GROBOOST.
+    WIT, SPH-S and NOAH only provide daily history using the v4 API and are skipped.
+
+    Usage:
+        backfill = HistoryBackfill(
+            api=GrowattApi(token="your_token"),
+            devices=["BZP0000000", "BZP0000001"],
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            checkpoint_file=Path("backfill_2024.json"),
+        )
+        for record in backfill:
+            print(record.device_sn, record.data.time)
+    """
+
+    api: GrowattApi
+    start_date: date
+    end_date: date
+    checkpoint_file: Optional[Path]
+
+    def __init__(
+        self,
+        api: GrowattApi,
+        devices: Union[List[str], Dict[str, DeviceType]],
+        start_date: date,
+        end_date: Optional[date] = None,
+        checkpoint_file: Optional[Path] = None,
+        timezone: Optional[str] = None,
+        limit: int = 100,
+        max_workers: int = 8,
+        limits: Optional[Dict[str, List[RateLimit]]] = None,
+        max_retries: int = 3,
+    ) -> None:
+        """
+        :param api: GrowattApi instance
+        :param devices: device serial numbers (device types are retrieved by device.get_device_types())
+                        or dict of device serial number -> device type
+        :param start_date: first day to retrieve
+        :param end_date: last day to retrieve - defaults to today (set explicitly to resume from checkpoint on another day)
+        :param checkpoint_file: JSON file to save progress to (and resume from if it exists)
+        :param timezone: time zone code for energy_history() (default: UTC)
+        :param limit: records per page (max 100)
+        :param max_workers: max number of concurrent requests
+        :param limits: rate limits to schedule requests by - defaults to the documented limits (ENDPOINT_RATE_LIMITS)
+        :param max_retries: max number of retries of a page failing with an error (other than rate limit)
+        """
+        self.api = api
+        self.start_date = start_date
+        self.end_date = end_date or date.today()
+        self.checkpoint_file = checkpoint_file
+        self.max_workers = max_workers
+        self._limits = ENDPOINT_RATE_LIMITS if limits is None else limits
+
+        if not isinstance(devices, dict):
+            devices = self.api.device.get_device_types(device_sns=devices)
+        windows = history_windows(self.start_date, self.end_date)
+        self._devices: List[_DeviceBackfill] = []
+        for device_sn, device_type in devices.items():
+            if device_type not in HISTORY_METHODS:
+                logger.warning(f"History backfill not supported for device {device_sn} ({device_type})")
+                continue
+            _, _, endpoint = HISTORY_METHODS[device_type]
+            self._devices.append(
+                _DeviceBackfill(
+                    device_sn=device_sn,
+                    device_type=device_type,
+                    device_api=self.api.api_for_device(device_sn=device_sn, device_type=device_type),
+                    windows=windows,
+                    request_interval=self._request_interval(endpoint),
+                    timezone=timezone,
+                    limit=limit,
+                    max_retries=max_retries,
+                )
+            )
+        self._load_checkpoint()
+
+    def _request_interval(self, endpoint: str) -> float:
+        """min seconds between two requests for the same device"""
+        return max(
+            [
+                limit.period.total_seconds() / limit.calls
+                for limit in self._limits.get(endpoint, [])
+                if limit.per_device
+            ],
+            default=0.0,
+        )
+
+    @property
+    def done(self) -> bool:
+        return all(device.done for device in self._devices)
+
+    def __iter__(self) -> Iterator[HistoryRecord]:
+        pending = [device for device in self._devices if not device.done]
+        running: Dict[Future, _DeviceBackfill] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # send requests for all devices allowed to be requested again
+                now = time.monotonic()
+                pending.sort(key=lambda d: d.next_request_at)
+                while pending and len(running) < self.max_workers and pending[0].next_request_at <= now:
+                    device = pending.pop(0)
+                    running[executor.submit(device.fetch)] = device
+                next_due = pending[0].next_request_at - now if pending else None
+                if not running:
+                    time.sleep(max(0.0, next_due))
+                    continue
+
+                done, _ = wait(running, timeout=next_due, return_when=FIRST_COMPLETED)
+                for future in done:
+                    device = running.pop(future)
+                    for item in device.advance(future.result()):
+                        yield HistoryRecord(device_sn=device.device_sn, device_type=device.device_type, data=item)
+                    # page has been consumed completely
+                    self._save_checkpoint()
+                    if not device.done:
+                        pending.append(device)
+
+    def _load_checkpoint(self) -> None:
+        if self.checkpoint_file is None or not self.checkpoint_file.exists():
+            return
+        checkpoint = json.loads(self.checkpoint_file.read_text())
+        if (checkpoint["start_date"], checkpoint["end_date"]) != (
+            self.start_date.isoformat(),
+            self.end_date.isoformat(),
+        ):
+            raise ValueError(
+                f"checkpoint file {self.checkpoint_file} was created for date range "
+                f"{checkpoint['start_date']} - {checkpoint['end_date']}"
+            )
+        for device in self._devices:
+            if device.device_sn in checkpoint["devices"]:
+                device.restore(checkpoint["devices"][device.device_sn])
+        logger.info(f"Resuming history backfill from {self.checkpoint_file}")
+
+    def _save_checkpoint(self) -> None:
+        if self.checkpoint_file is None:
+            return
+        checkpoint = {
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat(),
+            "devices": {device.device_sn: device.checkpoint() for device in self._devices},
+        }
+        # write to temporary file first, so the checkpoint is never corrupted by interruptions
+        tmp_file = self.checkpoint_file.with_name(f"{self.checkpoint_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(checkpoint, indent=2))
+        tmp_file.replace(self.checkpoint_file)
@@ -0,0 +1,137 @@
+import datetime
+import typing
+from typing import Optional, List, Dict, Any, NamedTuple, Type, Iterable
+from pydantic import BaseModel
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+# raw values treated as missing (see pydantic_models.api_model.EmptyStrToNone)
+_MISSING = (None, "", "null", "None")
+
+
+def _field_type(annotation: Any) -> Any:
+    """
+    scalar type of a field, e.g. Union[EmptyStrToNone, float] -> float
+    returns None for anything else (lists, nested models, ...)
+    """
+    types = [t for t in typing.get_args(annotation) or (annotation,) if typing.get_origin(t) is not typing.Annotated]
+    types = [t for t in types if t is not type(None)]
+    if len(types) == 1 and types[0] in (float, int, bool, str, datetime.datetime, datetime.date):
+        return types[0]
+    return None
+
+
+def _to_float(value: Any) -> float:
+    if value in _MISSING:
+        return np.nan
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return float(value.lower() == "true")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _to_datetime64(value: Any) -> "np.datetime64":
+    if isinstance(value, dict):  # e.g. GrowattTime {"time": 1740414721500, "year": 125, ...}
+        value = value.get("time")
+    if value in _MISSING or isinstance(value, bool):
+        return np.datetime64("NaT", "ms")
+    if isinstance(value, (int, float)):  # epoch milliseconds
+        return np.datetime64(int(value), "ms")
+    try:
+        return np.datetime64(str(value).strip().replace(" ", "T", 1), "ms")
+    except ValueError:
+        return np.datetime64("NaT", "ms")
+
+
+def _column(values: List[Any], field_type: Any) -> "np.ndarray":
+    """
+    convert raw values to a typed array
+    * float: float64, missing values are NaN
+    * int/bool: int64/bool, masked array if values are missing
+    * datetime/date: datetime64[ms], missing values are NaT
+    * anything else: object array of raw values (str: None if missing)
+    """
+    if field_type in (datetime.datetime, datetime.date):
+        return np.array([_to_datetime64(v) for v in values], dtype="datetime64[ms]")
+    if field_type in (float, int, bool):
+        floats = np.array([_to_float(v) for v in values], dtype=np.float64)
+        if field_type is float:
+            return floats
+        missing = np.isnan(floats)
+        column = np.where(missing, 0, floats).astype(np.int64 if field_type is int else np.bool_)
+        return np.ma.masked_array(column, mask=missing) if missing.any() else column
+    if field_type is str:
+        values = [None if v in _MISSING else str(v) for v in values]
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def to_columns(
+    records: List[dict],
+    model: Type[BaseModel],
+    fields: Optional[Iterable[str]] = None,
+) -> Dict[str, "np.ndarray"]:
+    """
+    Convert raw JSON records to columns (field name -> NumPy array) without validating each record by `model`
+
+    Field names and types are taken from `model` (e.g. MinEnergyOverviewData),
+    raw values are read using the model's aliases (e.g. "eacToday" -> "eac_today").
+    Fields missing in all records are returned as columns of missing values.
+
+    :param records: raw JSON records, e.g. response["data"]["datas"]
+    :param model: pydantic model of a single record
+    :param fields: field names to return (default: all fields of model)
+    """
+    if np is None:
+        raise ImportError("Columnar results require 'numpy' (pip install growatt-public-api[columnar])")
+    # aliases are set when the model is built (see DEFER_BUILD)
+    if not model.__pydantic_complete__:
+        model.model_rebuild()
+    model_fields = model.model_fields
+    if fields is None:
+        fields = model_fields.keys()
+    columns = {}
+    for name in fields:
+        field = model_fields[name]
+        key = field.alias or name
+        columns[name] = _column([record.get(key) for record in records], _field_type(field.annotation))
+    return columns
+
+
+class HistoryColumns(NamedTuple):
+    """
+    Columnar variant of an energy_history() response
+
+    columns: field name -> NumPy array (one element per record, see to_columns()) - empty if the request failed
+    """
+
+    error_code: Optional[int]
+    error_msg: Optional[str]
+    columns: Dict[str, "np.ndarray"]
+
+    @classmethod
+    def from_response(
+        cls,
+        response: dict,
+        model: Type[BaseModel],
+        fields: Optional[Iterable[str]] = None,
+    ) -> "HistoryColumns":
+        """
+        :param response: raw JSON response of v1 API ({"error_code", "error_msg", "data": {"datas": [...]}})
+                         or v4 API ({"code", "message", "data": {"datas": [...]}})
+        :param model: pydantic model of a single record
+        :param fields: field names to return (default: all fields of model)
+        """
+        error_code = response.get("error_code", response.get("code"))
+        error_msg = response.get("error_msg", response.get("message"))
+        data = response.get("data")
+        if error_code != 0 or not isinstance(data, dict):
+            return cls(error_code=error_code, error_msg=error_msg, columns={})
+        records = data.get("datas") or []
+        return cls(error_code=error_code, error_msg=error_msg, columns=to_columns(records, model=model, fields=fields))
@@ -1,9 +1,12 @@
 from typing import Union, Optional
 from ..pydantic_models import EnvSensorList, SmartMeterList
+from ..pydantic_models.env_sensor import EnvSensorData
+from ..pydantic_models.smart_meter import SmartMeterData
 from ..pydantic_models.device import (
     DataloggerValidation,
 )
 from ..session.growatt_api_session import GrowattApiSession
+from ..pagination import PageIterator
 
 
 class Datalogger:
@@ -108,6 +111,28 @@ class Datalogger:
 
         return EnvSensorList.model_validate(response)
 
+    def iter_list_env_sensors(
+        self,
+        datalogger_sn: str,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[EnvSensorData]:
+        """
+        Iterate over all environmental sensors of list_env_sensors() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            datalogger_sn (str): Datalogger serial number
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[EnvSensorData]
+        """
+
+        return PageIterator(
+            self, "list_env_sensors", items="envs", prefetch=prefetch, datalogger_sn=datalogger_sn, limit=limit
+        )
+
     def list_smart_meters(
         self,
         datalogger_sn: str,
@@ -166,3 +191,25 @@ class Datalogger:
         )
 
         return SmartMeterList.model_validate(response)
+
+    def iter_list_smart_meters(
+        self,
+        datalogger_sn: str,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[SmartMeterData]:
+        """
+        Iterate over all smart meters of list_smart_meters() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            datalogger_sn (str): Datalogger serial number
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[SmartMeterData]
+        """
+
+        return PageIterator(
+            self, "list_smart_meters", items="meters", prefetch=prefetch, datalogger_sn=datalogger_sn, limit=limit
+        )
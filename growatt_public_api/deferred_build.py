@@ -0,0 +1,79 @@
+import importlib
+import inspect
+import pkgutil
+import threading
+import typing
+from types import ModuleType
+from typing import Any, Iterator, List, Type
+from loguru import logger
+from pydantic import BaseModel
+
+
+def _annotation_models(annotation: Any) -> Iterator[Type[BaseModel]]:
+    """models of a type annotation, e.g. MinDetails, PageIterator[MinAlarm], Union[MinEnergyDataV4, ...]"""
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        yield annotation
+    for arg in typing.get_args(annotation):
+        yield from _annotation_models(arg)
+
+
+def _module_models(module: ModuleType) -> Iterator[Type[BaseModel]]:
+    for obj in vars(module).values():
+        if inspect.isclass(obj) and issubclass(obj, BaseModel) and obj.__module__ == module.__name__:
+            yield obj
+
+
+def _all_model_modules() -> Iterator[ModuleType]:
+    from . import pydantic_models
+
+    for module_info in pkgutil.iter_modules(pydantic_models.__path__):
+        yield importlib.import_module(f"{pydantic_models.__name__}.{module_info.name}")
+
+
+def _models(target: Any) -> Iterator[Type[BaseModel]]:
+    if inspect.isclass(target) and issubclass(target, BaseModel):
+        yield target
+    elif isinstance(target, ModuleType):
+        yield from _module_models(target)
+    else:
+        # device API (class or instance) - response models of its public methods
+        api_class = target if inspect.isclass(target) else type(target)
+        for name, method in inspect.getmembers(api_class, predicate=inspect.isfunction):
+            if not name.startswith("_"):
+                yield from _annotation_models(inspect.signature(method).return_annotation)
+
+
+def _build(models: List[Type[BaseModel]]) -> None:
+    models = [model for model in models if not model.__pydantic_complete__]
+    for model in models:
+        model.model_rebuild()
+    logger.debug(f"Built validators of {len(models)} models")
+
+
+def warm_up(*targets: Any, background: bool = False) -> List[Type[BaseModel]]:
+    """
+    Build validators of pydantic models upfront (instead of on first use - see DEFER_BUILD in api_model.py),
+    so the first request of each endpoint does not pay for it
+
+    Args:
+        *targets: anything of
+            * device APIs (class or instance, sync or async, e.g. Min, api.min) - models returned by their methods
+            * pydantic model classes
+            * pydantic_models modules
+            default: all models of all modules (= building on import, but at a time of your choice)
+        background (bool): build in a daemon thread (e.g. while the application starts up)
+
+    Returns:
+        models built (or being built in background)
+
+    Usage:
+        api = GrowattApi(token="your_token")
+        warm_up(api.min, api.noah, background=True)
+    """
+    targets = targets or tuple(_all_model_modules())
+    models = list(dict.fromkeys(model for target in targets for model in _models(target)))
+    if background:
+        threading.Thread(target=_build, args=(models,), name="growatt-warm-up", daemon=True).start()
+    else:
+        _build(models)
+    return models
@@ -1 +1,10 @@
-from .device import Device  # noqa: F401
+from ..lazy_imports import lazy_attributes
+
+# imported on first access (the device type index does not need any models)
+_IMPORTS = {
+    ".device": ["Device"],
+    ".device_type_index": ["DeviceTypeIndex", "IncompleteRefresh"],
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _IMPORTS)
+__all__ = [name for names in _IMPORTS.values() for name in names]
@@ -1,9 +1,10 @@
+import itertools
 from datetime import date
-from typing import Optional, Union, List
+from typing import Optional, Union, List, Dict, Iterator
 from loguru import logger
 from ..growatt_types import DeviceType
-from ..pydantic_models import PlantInfo
-from ..pydantic_models.api_v4 import DeviceListV4
+from ..pydantic_models import PlantInfo, model_responses
+from ..pydantic_models.api_v4 import DeviceListV4, DeviceDataV4
 from ..pydantic_models.device import (
     DeviceTypeInfo,
     DeviceEnergyDay,
@@ -12,6 +13,16 @@ from ..pydantic_models.device import (
 )
 from ..plant.plant import Plant
 from ..session.growatt_api_session import GrowattApiSession
+from ..pagination import PageIterator
+from .device_type_index import DeviceTypeIndex, IncompleteRefresh
+
+
+def _iter_pages(page_iterator: PageIterator, errors: List[str]) -> Iterator[list]:
+    """items of all pages (one list per page) - failed pages are reported in `errors`"""
+    for response in page_iterator.pages():
+        if response.error_code != 0:
+            errors.append(f"{page_iterator.method}(): error {response.error_code} '{response.error_msg}'")
+        yield page_iterator.page_items(response) or []
 
 
 class Device:
@@ -20,30 +31,225 @@ class Device:
     """
 
     session: GrowattApiSession
+    device_type_index: DeviceTypeIndex
 
-    def __init__(self, session: GrowattApiSession) -> None:
+    def __init__(self, session: GrowattApiSession, device_type_index: Optional[DeviceTypeIndex] = None) -> None:
         self.session = session
+        self.device_type_index = (
+            DeviceTypeIndex.for_session(session) if device_type_index is None else device_type_index
+        )
 
-    def get_device_type(  # noqa: C901 'Device.get_device_type' is too complex (12)
+    def get_device_type(
         self,
         device_sn: str,
+        plant_id: Optional[int] = None,
     ) -> Optional[DeviceType]:
         """
         convenience method to get device type by device_sn
 
-        will use following endpoints to retrieve device type
+        device types are looked up in the (persistent) device type index (refreshed daily in background).
+        Devices not in the index are searched in the device list of `plant_id` (if given) first,
+        then the index is filled by walking all device lists once:
+        * device.list()
+        * plant.list_devices() for all plants in plant.list()
+
+        devices not found in the index are searched using following endpoints
         * device.type_info()
         * device.list()
         * plant.list_devices() (via device.get_plant())
 
         Args:
             device_sn (str): Device serial number
+            plant_id (Optional[int]): Plant the device belongs to - avoids walking all device lists if the device is found
 
         Returns:
             DeviceType
             e.g. DeviceType.MIN
         """
 
+        with model_responses():
+            device_type = self.device_type_index.get(device_sn)
+            if device_type is None and plant_id is not None:
+                device_type = self._index_plant_device_types(plant_id=plant_id).get(device_sn)
+            if device_type is None or self.device_type_index.updated is not None:
+                # only outdated indexes are refreshed for devices already known (in background)
+                self._refresh_device_type_index()
+                device_type = self.device_type_index.get(device_sn)
+            if device_type is None:
+                device_type = self._search_device_type(device_sn=device_sn)
+                if device_type is not None:
+                    self.device_type_index.set(device_sn, device_type)
+        return device_type
+
+    def get_device_types(
+        self,
+        device_sns: List[str],
+    ) -> Dict[str, Optional[DeviceType]]:
+        """
+        convenience method to get device types of multiple devices
+
+        same as get_device_type(), but each source is used at most once for all devices (instead of once per device):
+        * device type index
+        * device.type_info() (requested concurrently for devices not in the index)
+        * device.list() (all pages, unless all devices have been found)
+        * plant.list_devices() for all plants in plant.list() (unless all devices have been found)
+
+        Args:
+            device_sns (List[str]): Device serial numbers
+
+        Returns:
+            Dict[str, Optional[DeviceType]]
+            device type by device_sn (None if not found)
+            e.g. {"BZP0000000": DeviceType.MIN, "0PVP0000000000": DeviceType.NOAH}
+        """
+
+        with model_responses():
+            index_built = self._refresh_device_type_index()
+            return self._resolve_device_types(device_sns=device_sns, search_device_lists=not index_built)
+
+    def _resolve_device_types(
+        self,
+        device_sns: List[str],
+        search_device_lists: bool = True,
+    ) -> Dict[str, Optional[DeviceType]]:
+        """get_device_types() without (re-)filling the device type index"""
+        device_types = {device_sn: self.device_type_index.get(device_sn) for device_sn in device_sns}
+
+        with model_responses():
+            # 1. get device types via v1 API device/check/sn
+            missing = [sn for sn, device_type in device_types.items() if device_type is None]
+            if missing:
+                device_types.update(self._type_info_device_types(device_sns=missing))
+
+            # 2./3. search v4 device list and v1 plant device lists (not required if index has just been built)
+            missing = [sn for sn, device_type in device_types.items() if device_type is None]
+            if missing and search_device_lists:
+                for device_types_found in self._iter_all_device_types():
+                    device_types.update({sn: device_types_found[sn] for sn in missing if sn in device_types_found})
+                    missing = [sn for sn in missing if device_types[sn] is None]
+                    if not missing:
+                        break
+
+        found = {sn: device_type for sn, device_type in device_types.items() if device_type is not None}
+        self.device_type_index.update(found)
+        for device_sn in device_types.keys() - found.keys():
+            logger.warning(f"Device type of device {device_sn} not found")
+        return device_types
+
+    def _refresh_device_type_index(self) -> bool:
+        """
+        fill device type index if not done yet, refresh in background if outdated
+
+        returns True if the index has been filled (synchronously) by this call
+        """
+        if not self.device_type_index.refresh_due:
+            return False
+        # background refresh is only possible using a real (sync) session
+        if self.device_type_index.updated is not None and isinstance(self.session, GrowattApiSession):
+            self.device_type_index.refresh(fetch=self._all_device_types, background=True)
+            return False
+        try:
+            self.device_type_index.refresh(fetch=self._all_device_types)
+        except IncompleteRefresh as e:
+            logger.warning(f"Device type index is incomplete: {e}")
+            return False
+        return True
+
+    def _type_info_device_types(self, device_sns: List[str]) -> Dict[str, DeviceType]:
+        """device types by device.type_info() (requested concurrently)"""
+        responses = self.session.request_many(
+            [
+                {"endpoint": "device/check/sn", "method": "GET", "params": {"dataloggerSn": device_sn}}
+                for device_sn in device_sns
+            ]
+        )
+        device_types = {}
+        for device_sn, response in zip(device_sns, responses):
+            device_type_info = DeviceTypeInfo.model_validate(response)
+            if device_type_info.result != 1:
+                continue
+            device_type = DeviceType.from_device_type_info(device_type=device_type_info.device_type)
+            if device_type and device_type != DeviceType.OTHER:
+                device_types[device_sn] = device_type
+        return device_types
+
+    def _iter_device_list_types(self, errors: List[str]) -> Iterator[Dict[str, DeviceType]]:
+        """device types of all devices in v4 device.list() (one dict per page) - failed pages are added to `errors`"""
+        for devices in _iter_pages(self.iter_list(), errors=errors):
+            yield {x.device_sn: DeviceType.from_device_list(x.device_type) for x in devices}
+
+    def _iter_plant_device_types(self, errors: List[str]) -> Iterator[Dict[str, DeviceType]]:
+        """
+        device types of all devices in v1 plant.list_devices() of all plants (one dict per plant)
+
+        failed pages are added to `errors` (remaining plants are still read)
+        """
+        api_plant = Plant(session=self.session)
+        for plants in _iter_pages(api_plant.iter_list(limit=100), errors=errors):
+            for plant in plants:
+                yield self._plant_device_types(plant_id=plant.plant_id, errors=errors)
+
+    def _plant_device_types(self, plant_id: int, errors: List[str]) -> Dict[str, DeviceType]:
+        """device types of all devices in v1 plant.list_devices() of a plant - failed pages are added to `errors`"""
+        api_plant = Plant(session=self.session)
+        return {
+            x.device_sn: DeviceType.from_plant_list_devices(x.type)
+            for devices in _iter_pages(api_plant.iter_list_devices(plant_id=plant_id, limit=100), errors=errors)
+            for x in devices
+        }
+
+    def _index_plant_device_types(self, plant_id: int) -> Dict[str, DeviceType]:
+        """add the known device types of a plant's devices to the device type index (without marking it as complete)"""
+        errors = []
+        device_types = {
+            sn: device_type
+            for sn, device_type in self._plant_device_types(plant_id=plant_id, errors=errors).items()
+            if device_type not in (None, DeviceType.OTHER)
+        }
+        if errors:
+            logger.warning(f"Failed to read device list of plant {plant_id}: {', '.join(errors)}")
+        self.device_type_index.update(device_types)
+        return device_types
+
+    def _iter_all_device_types(self, errors: Optional[List[str]] = None) -> Iterator[Dict[str, DeviceType]]:
+        """
+        known device types of all devices in v4 device.list() and v1 plant.list_devices() (one dict per page/plant)
+
+        failed pages are added to `errors` (if given)
+        """
+        errors = [] if errors is None else errors
+        # v4 device list first (plant device lists do not know newer types like WIT, SPH-S or NOAH)
+        for device_types in itertools.chain(
+            self._iter_device_list_types(errors=errors), self._iter_plant_device_types(errors=errors)
+        ):
+            yield {
+                sn: device_type
+                for sn, device_type in device_types.items()
+                if device_type not in (None, DeviceType.OTHER)
+            }
+
+    def _all_device_types(self) -> Dict[str, DeviceType]:
+        """
+        device types of all devices accessible by the token (single walk of all device lists)
+
+        raises IncompleteRefresh (containing the devices found) if some device lists could not be read
+        """
+        device_types = {}
+        errors = []
+        with model_responses():
+            for device_types_found in self._iter_all_device_types(errors=errors):
+                # first source wins
+                device_types.update({sn: t for sn, t in device_types_found.items() if sn not in device_types})
+        if errors:
+            raise IncompleteRefresh(", ".join(errors), device_types=device_types)
+        return device_types
+
+    def _search_device_type(  # noqa: C901 'Device._search_device_type' is too complex (12)
+        self,
+        device_sn: str,
+    ) -> Optional[DeviceType]:
+        """search device type of a single device using device.type_info(), device.list(), plant.list_devices()"""
+
         # 1. get device type via v1 API device/check/sn
         device_type_info = self.type_info(device_sn=device_sn)
         if device_type_info.result == 1:
@@ -168,6 +374,22 @@ class Device:
 
         return DeviceListV4.model_validate(response)
 
+    def iter_list(
+        self,
+        prefetch: bool = False,
+    ) -> PageIterator[DeviceDataV4]:
+        """
+        Iterate over all devices of list() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[DeviceDataV4]
+        """
+
+        return PageIterator(self, "list", items="data", prefetch=prefetch)
+
     def type_info(
         self,
         device_sn: str,
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional, Dict, Callable, ClassVar
+from loguru import logger
+from ..growatt_types import DeviceType
+
+
+class IncompleteRefresh(Exception):
+    """
+    Some device lists could not be read while refreshing the device type index
+
+    device_types contains the devices found in all other device lists
+    """
+
+    def __init__(self, message: str, device_types: Dict[str, DeviceType]) -> None:
+        super().__init__(message)
+        self.device_types = device_types
+
+
+class DeviceTypeIndex:
+    """
+    Index of device serial number -> DeviceType
+
+    Filled in bulk (by a single walk of all device lists) instead of searching the device lists for every device.
+    The index is persisted as JSON file in the response cache folder, so it survives restarts
+    (and is shared by all processes using the same token).
+    Once older than `max_age`, it is refreshed in the background while lookups are still answered from the index.
+    The index is only marked as up-to-date if all device lists have been read, a failed refresh is retried
+    after `retry_interval`.
+
+    Usually created by Device using DeviceTypeIndex.for_session(), which shares one index per token.
+    """
+
+    path: Optional[Path]
+    max_age: timedelta
+    retry_interval: timedelta
+    updated: Optional[float]
+    failed: Optional[float]
+
+    _instances: ClassVar[Dict[str, "DeviceTypeIndex"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_age: timedelta = timedelta(days=1),
+        retry_interval: timedelta = timedelta(minutes=5),
+    ) -> None:
+        """
+        :param path: JSON file to persist the index to - in-memory only if None
+        :param max_age: refresh index (in background) if last full refresh is older
+        :param retry_interval: do not refresh again within this interval after a failed refresh
+        """
+        self.path = path
+        self.max_age = max_age
+        self.retry_interval = retry_interval
+        self.updated = None  # time of last full refresh
+        self.failed = None  # time of last failed refresh
+        self._device_types: Dict[str, DeviceType] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._load()
+
+    @classmethod
+    def for_session(cls, session) -> "DeviceTypeIndex":
+        """
+        Index shared by all sessions using the same server and token (persisted in the session's cache folder)
+        """
+        token = getattr(session, "token", None)
+        if not token:
+            # e.g. session bridges of async APIs
+            return cls()
+        key = hashlib.sha256(f"{getattr(session, 'server_url', '')}|{token}".encode()).hexdigest()[:16]
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None:
+                cache = getattr(session, "cache", None)
+                path = cache.folder / f"device_types_{key}.json" if cache is not None else None
+                index = cls._instances[key] = cls(path=path)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._device_types)
+
+    def __contains__(self, device_sn: str) -> bool:
+        return device_sn in self._device_types
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the index has never been filled completely or its last refresh is older than max_age"""
+        return self.updated is None or time.time() - self.updated > self.max_age.total_seconds()
+
+    @property
+    def refresh_due(self) -> bool:
+        """True if the index is stale and no refresh failed within retry_interval"""
+        if not self.is_stale:
+            return False
+        return self.failed is None or time.time() - self.failed > self.retry_interval.total_seconds()
+
+    def get(self, device_sn: str) -> Optional[DeviceType]:
+        return self._device_types.get(device_sn)
+
+    def set(self, device_sn: str, device_type: DeviceType) -> None:
+        """add a single device (e.g. found by Device.get_device_type() fallbacks)"""
+        self.update({device_sn: device_type})
+
+    def update(self, device_types: Dict[str, DeviceType], complete: bool = False) -> None:
+        """
+        Add devices to the index
+
+        :param device_types: device_sn -> DeviceType
+        :param complete: device_types contains all devices (marks the index as up-to-date)
+        """
+        with self._lock:
+            if complete:
+                # devices only found by fallbacks (e.g. device.type_info()) are kept
+                self._device_types = {**self._device_types, **device_types}
+                self.updated = time.time()
+            else:
+                if all(self._device_types.get(sn) == device_type for sn, device_type in device_types.items()):
+                    return
+                self._device_types.update(device_types)
+            self._save()
+
+    def refresh_failed(self, error: Exception) -> None:
+        """
+        Record a failed refresh (not retried within retry_interval)
+
+        devices found anyway (see IncompleteRefresh) are added, but the index is not marked as up-to-date
+        """
+        self.failed = time.time()
+        if isinstance(error, IncompleteRefresh):
+            self.update(error.device_types)
+
+    def refresh(self, fetch: Callable[[], Dict[str, DeviceType]], background: bool = False) -> None:
+        """
+        Update the index by the result of `fetch` (which should return the types of all devices)
+
+        :param fetch: callable returning device_sn -> DeviceType for all devices
+            raising IncompleteRefresh if some device lists could not be read
+        :param background: run in a background thread - no-op if a background refresh is already running
+        """
+        if not background:
+            updated = self.updated
+            with self._refresh_lock:
+                if self.updated != updated:
+                    return  # refreshed by another thread while waiting
+                try:
+                    device_types = fetch()
+                except Exception as e:
+                    self.refresh_failed(e)
+                    raise
+                self.failed = None
+                self.update(device_types, complete=True)
+            return
+
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_in_background, args=(fetch,), name="device-type-index", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _refresh_in_background(self, fetch: Callable[[], Dict[str, DeviceType]]) -> None:
+        try:
+            self.refresh(fetch=fetch)
+        except Exception as e:
+            logger.warning(f"Failed to refresh device type index: {e}")
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            content = json.loads(self.path.read_text())
+            self._device_types = {sn: DeviceType(value) for sn, value in content["device_types"].items()}
+            self.updated = content["updated"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring invalid device type index file {self.path}: {e}")
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        content = {
+            "updated": self.updated,
+            "device_types": {sn: device_type.value for sn, device_type in self._device_types.items()},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # write to temporary file first, so concurrent readers never see partial files
+            tmp_file = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_file.write_text(json.dumps(content))
+            tmp_file.replace(self.path)
+        except OSError as e:
+            logger.debug(f"Failed to write device type index file {self.path}: {e}")
@@ -0,0 +1,126 @@
+import importlib
+import threading
+from typing import Optional, Union, Dict, Type, NamedTuple, Literal, Tuple, Any
+from pydantic import BaseModel
+from .growatt_types import DeviceType
+
+V4Endpoint = Literal["details_v4", "energy_v4", "energy_data_v4", "energy_history_v4", "energy_history_multiple_v4"]
+
+
+class DeviceFamily(NamedTuple):
+    """
+    Device specific API and v4 response models of a device type
+
+    Classes can be given as class or as "module:Class" (imported on first use, relative to this package),
+    so registering a family does not import its API or models.
+
+    api_class: device specific API
+    *_v4: response models of ApiV4 endpoints - None if the device type is not supported by v4 API
+        details_v4: ApiV4.details()
+        energy_v4: ApiV4.energy()
+        energy_data_v4: a single record of energy() / energy_history() (e.g. used for columnar data)
+        energy_history_v4: ApiV4.energy_history()
+        energy_history_multiple_v4: ApiV4.energy_history_multiple()
+    """
+
+    api_class: Union[Type, str]
+    details_v4: Union[Type[BaseModel], str, None] = None
+    energy_v4: Union[Type[BaseModel], str, None] = None
+    energy_data_v4: Union[Type[BaseModel], str, None] = None
+    energy_history_v4: Union[Type[BaseModel], str, None] = None
+    energy_history_multiple_v4: Union[Type[BaseModel], str, None] = None
+
+
+def _v4_family(api_class: str, prefix: str) -> DeviceFamily:
+    """family of a built-in device type supported by v4 API (models named e.g. MinDetailsV4, MinEnergyV4, ...)"""
+    models = ".pydantic_models.api_v4"
+    return DeviceFamily(
+        api_class=api_class,
+        details_v4=f"{models}:{prefix}DetailsV4",
+        energy_v4=f"{models}:{prefix}EnergyV4",
+        energy_data_v4=f"{models}:{prefix}EnergyDataV4",
+        energy_history_v4=f"{models}:{prefix}EnergyHistoryV4",
+        energy_history_multiple_v4=f"{models}:{prefix}EnergyHistoryMultipleV4",
+    )
+
+
+# device families by DeviceType value (e.g. "min") or name of a registered family (see register_device_family())
+DEVICE_FAMILIES: Dict[str, DeviceFamily] = {
+    DeviceType.GROBOOST.value: DeviceFamily(api_class=".groboost.groboost:Groboost"),
+    DeviceType.HPS.value: DeviceFamily(api_class=".hps.hps:Hps"),
+    DeviceType.INVERTER.value: _v4_family(".inverter.inverter:Inverter", "Inverter"),
+    DeviceType.MAX.value: _v4_family(".max.max:Max", "Max"),
+    DeviceType.MIN.value: _v4_family(".min.min:Min", "Min"),
+    DeviceType.NOAH.value: _v4_family(".noah.noah:Noah", "Noah"),
+    DeviceType.PBD.value: DeviceFamily(api_class=".pbd.pbd:Pbd"),
+    DeviceType.PCS.value: DeviceFamily(api_class=".pcs.pcs:Pcs"),
+    DeviceType.SPA.value: _v4_family(".spa.spa:Spa", "Spa"),
+    DeviceType.SPH.value: _v4_family(".sph.sph:Sph", "Sph"),
+    DeviceType.SPHS.value: _v4_family(".sphs.sphs:Sphs", "Sphs"),
+    DeviceType.STORAGE.value: _v4_family(".storage.storage:Storage", "Storage"),
+    DeviceType.WIT.value: _v4_family(".wit.wit:Wit", "Wit"),
+}
+
+# imported classes by (family key, DeviceFamily field)
+_classes: Dict[Tuple[str, str], Any] = {}
+_lock = threading.Lock()
+
+
+def family_key(device_type: Union[DeviceType, str]) -> str:
+    """key of a device type in DEVICE_FAMILIES (DeviceType value, e.g. "min", or name of a registered family)"""
+    return device_type.value if isinstance(device_type, DeviceType) else device_type
+
+
+def register_device_family(device_type: Union[DeviceType, str], family: DeviceFamily) -> None:
+    """
+    Register (or replace) the device specific API and v4 response models of a device type
+    (used by api_for_device() and ApiV4)
+
+    Device types not known by DeviceType can be registered by name (v4 API "deviceType" parameter).
+
+    Usage:
+        register_device_family(
+            DeviceType.GROBOOST,
+            DeviceFamily(api_class=MyGroboost, details_v4="my_package.models:MyGroboostDetailsV4", ...),
+        )
+        register_device_family("new-type", DeviceFamily(api_class="my_package.new_type:NewType", ...))
+    """
+    key = family_key(device_type)
+    with _lock:
+        DEVICE_FAMILIES[key] = family
+        for field in DeviceFamily._fields:
+            _classes.pop((key, field), None)
+
+
+def _family_class(device_type: Union[DeviceType, str], field: str) -> Optional[Any]:
+    """class of a DeviceFamily field, imported on first use (None if the device type or class is unknown)"""
+    key = family_key(device_type)
+    cls = _classes.get((key, field))
+    if cls is None:
+        family = DEVICE_FAMILIES.get(key)
+        cls = getattr(family, field) if family is not None else None
+        if cls is None:
+            return None
+        if isinstance(cls, str):
+            module_name, class_name = cls.split(":")
+            cls = getattr(importlib.import_module(module_name, __package__), class_name)
+        with _lock:
+            _classes[(key, field)] = cls
+    return cls
+
+
+def device_api_class(device_type: Union[DeviceType, str]) -> Optional[Type]:
+    """device specific API class of a device type (None if unknown)"""
+    return _family_class(device_type, "api_class")
+
+
+def v4_model(device_type: Union[DeviceType, str], endpoint: V4Endpoint) -> Type[BaseModel]:
+    """
+    response model of a v4 endpoint for a device type
+
+    :raises ValueError: if the device type is not supported by v4 API
+    """
+    model = _family_class(device_type, endpoint)
+    if model is None:
+        raise ValueError(f"Unknown device type: {family_key(device_type)}")
+    return model
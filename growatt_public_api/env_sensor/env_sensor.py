@@ -3,8 +3,10 @@ from typing import Optional
 from ..pydantic_models.env_sensor import (
     EnvSensorMetricsOverview,
     EnvSensorMetricsHistory,
+    EnvSensorMetricsOverviewData,
 )
 from ..session.growatt_api_session import GrowattApiSession
+from ..pagination import PageIterator
 
 
 class EnvSensor:
@@ -211,3 +213,39 @@ class EnvSensor:
         )
 
         return EnvSensorMetricsHistory.model_validate(response)
+
+    def iter_metrics_history(
+        self,
+        datalogger_sn: str,
+        sensor_address: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[EnvSensorMetricsOverviewData]:
+        """
+        Iterate over all history records of metrics_history() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            datalogger_sn (str): Serial number of the datalogger the meter is attached to
+            sensor_address (int): Address of the sensor (see SmartMeter.list() output)
+            start_date (Optional[date]): Start Date - defaults to today
+            end_date (Optional[date]): End Date (date interval cannot exceed 7 days) - defaults to today
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[EnvSensorMetricsOverviewData]
+        """
+
+        return PageIterator(
+            self,
+            "metrics_history",
+            items="env_data",
+            prefetch=prefetch,
+            datalogger_sn=datalogger_sn,
+            sensor_address=sensor_address,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+        )
@@ -6,8 +6,10 @@ from ..pydantic_models.groboost import (
     GroboostMetricsHistory,
     GroboostMetricsOverviewMultiple,
     GroboostMetricsOverviewMultipleItem,
+    BoostData,
 )
 from ..session.growatt_api_session import GrowattApiSession
+from ..pagination import PageIterator
 
 
 class Groboost:
@@ -826,3 +828,39 @@ class Groboost:
         )
 
         return GroboostMetricsHistory.model_validate(response)
+
+    def iter_metrics_history(
+        self,
+        device_sn: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        timezone: Optional[str] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[BoostData]:
+        """
+        Iterate over all history records of metrics_history() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            device_sn (str): GROBOOST serial number
+            start_date (Optional[date]): Start Date - defaults to today
+            end_date (Optional[date]): End Date (date interval cannot exceed 7 days) - defaults to today
+            timezone (Optional[str]): The time zone code of the data display, the default is UTC
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[BoostData]
+        """
+
+        return PageIterator(
+            self,
+            "metrics_history",
+            items="datas",
+            prefetch=prefetch,
+            device_sn=device_sn,
+            start_date=start_date,
+            end_date=end_date,
+            timezone=timezone,
+            limit=limit,
+        )
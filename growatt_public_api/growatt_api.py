@@ -1,49 +1,79 @@
-from typing import Optional, Self, Union
+from typing import TYPE_CHECKING, Optional, Self, Union, List, Dict, Iterable
 from loguru import logger
 from .growatt_types import DeviceType
+from .device_registry import device_api_class
+from .session.connection import ConnectionSettings
 from .session.growatt_api_session import GrowattApiSession
-from .user.user import User
-from .plant.plant import Plant
-from .datalogger.datalogger import Datalogger
-from .device.device import Device
-from .inverter.inverter import Inverter
-from .storage.storage import Storage
-from .min.min import Min
-from .max.max import Max
-from .sph.sph import Sph
-from .spa.spa import Spa
-from .pcs.pcs import Pcs
-from .hps.hps import Hps
-from .pbd.pbd import Pbd
-from .smart_meter.smart_meter import SmartMeter
-from .env_sensor.env_sensor import EnvSensor
-from .groboost.groboost import Groboost
-from .wit.wit import Wit
-from .sphs.sphs import Sphs
-from .noah.noah import Noah
+from .session.rate_limiter import RateLimiter
+from .session.response_cache import ResponseCache
+from .session.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    # device APIs are imported on first use (see properties below), as they import their pydantic models
+    from .api_v4.api_v4 import ApiV4, DeviceEnergyDataV4
+    from .pydantic_models.api_v4 import DeviceDataV4
+    from .user.user import User
+    from .plant.plant import Plant
+    from .datalogger.datalogger import Datalogger
+    from .device.device import Device
+    from .inverter.inverter import Inverter
+    from .storage.storage import Storage
+    from .min.min import Min
+    from .max.max import Max
+    from .sph.sph import Sph
+    from .spa.spa import Spa
+    from .pcs.pcs import Pcs
+    from .hps.hps import Hps
+    from .pbd.pbd import Pbd
+    from .smart_meter.smart_meter import SmartMeter
+    from .env_sensor.env_sensor import EnvSensor
+    from .groboost.groboost import Groboost
+    from .wit.wit import Wit
+    from .sphs.sphs import Sphs
+    from .noah.noah import Noah
+
+
+def group_devices_by_type(
+    devices: List["DeviceDataV4"], device_types: Optional[Iterable[DeviceType]] = None
+) -> Dict[DeviceType, List[str]]:
+    """
+    Group serial numbers of devices (as returned by device.list()) by device type (v4 device types only)
+    """
+    device_types = set(device_types) if device_types is not None else None
+    device_sn = {}
+    for device in devices:
+        device_type = DeviceType.from_device_list(device.device_type)
+        if device_type is None:
+            logger.debug(f"Skipping device {device.device_sn} of unsupported device type '{device.device_type}'")
+            continue
+        if device_types is not None and device_type not in device_types:
+            continue
+        device_sn.setdefault(device_type, []).append(device.device_sn)
+    return device_sn
 
 
 class GrowattApi:
     session: GrowattApiSession
-    _user: User = None
-    _plant: Plant = None
-    _datalogger: Datalogger = None
-    _device: Device = None
-    _inverter: Inverter = None
-    _storage: Storage = None
-    _min: Min = None
-    _max: Max = None
-    _sph: Sph = None
-    _spa: Spa = None
-    _pcs: Pcs = None
-    _hps: Hps = None
-    _pbd: Pbd = None
-    _smart_meter: SmartMeter = None
-    _env_sensor: EnvSensor = None
-    _groboost: Groboost = None
-    _wit: Wit = None
-    _sphs: Sphs = None
-    _noah: Noah = None
+    _api_v4: "ApiV4" = None
+    _user: "User" = None
+    _plant: "Plant" = None
+    _datalogger: "Datalogger" = None
+    _device: "Device" = None
+    _inverter: "Inverter" = None
+    _storage: "Storage" = None
+    _min: "Min" = None
+    _max: "Max" = None
+    _sph: "Sph" = None
+    _spa: "Spa" = None
+    _pcs: "Pcs" = None
+    _hps: "Hps" = None
+    _pbd: "Pbd" = None
+    _smart_meter: "SmartMeter" = None
+    _env_sensor: "EnvSensor" = None
+    _groboost: "Groboost" = None
+    _wit: "Wit" = None
+    _sphs: "Sphs" = None
+    _noah: "Noah" = None
 
     """
     API documents:
@@ -53,19 +83,43 @@ class GrowattApi:
       https://www.showdoc.com.cn/2540838290984246/0
     """
 
-    def __init__(self, token: str, server_url: Optional[str] = None, use_cache: bool = True) -> None:
+    def __init__(
+        self,
+        token: str,
+        server_url: Optional[str] = None,
+        use_cache: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = True,
+        connection: Optional[ConnectionSettings] = None,
+        retry: Optional[RetryPolicy] = None,
+    ) -> None:
         """
         Initialize the GrowattApi with a session.
 
         :param token: The API token for authentication.
         :param server_url: The URL of the Growatt API server. If not provided, it defaults to the production server.
         :param use_cache: Cache requests to Growatt API to avoid 'API rate limit exceeded' errors.
+        :param rate_limiter: Delay or reject requests exceeding documented rate limits before they are sent.
+        :param cache: Cache configuration (e.g. ResponseCache(mode="read-through")). Defaults to fallback-only cache.
+        :param coalesce_requests: Identical concurrent requests share a single request to the server.
+        :param connection: Connection pool size, timeouts and keep-alive (e.g. ConnectionSettings(pool_maxsize=64)).
+        :param retry: Retry transport errors, server errors and rate limited requests (e.g. RetryPolicy()).
 
         :raises AssertionError: If no token is provided.
         """
         assert token
 
-        self.session = GrowattApiSession(token=token, server_url=server_url, use_cache=use_cache)
+        self.session = GrowattApiSession(
+            token=token,
+            server_url=server_url,
+            use_cache=use_cache,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            coalesce_requests=coalesce_requests,
+            connection=connection,
+            retry=retry,
+        )
 
     @classmethod
     def using_test_server_v1(cls) -> Self:
@@ -92,124 +146,188 @@ class GrowattApi:
     # ##############################################################################
     # init specific apis on demand
     @property
-    def user(self):
+    def api_v4(self) -> "ApiV4":
+        if self._api_v4 is None:
+            from .api_v4.api_v4 import ApiV4
+
+            self._api_v4 = ApiV4(self.session)
+        return self._api_v4
+
+    @property
+    def user(self) -> "User":
         if self._user is None:
+            from .user.user import User
+
             self._user = User(self.session)
         return self._user
 
     @property
-    def plant(self):
+    def plant(self) -> "Plant":
         if self._plant is None:
+            from .plant.plant import Plant
+
             self._plant = Plant(self.session)
         return self._plant
 
     @property
-    def datalogger(self):
+    def datalogger(self) -> "Datalogger":
         if self._datalogger is None:
+            from .datalogger.datalogger import Datalogger
+
             self._datalogger = Datalogger(self.session)
         return self._datalogger
 
     @property
-    def device(self):
+    def device(self) -> "Device":
         if self._device is None:
+            from .device.device import Device
+
             self._device = Device(self.session)
         return self._device
 
     @property
-    def inverter(self):
+    def inverter(self) -> "Inverter":
         if self._inverter is None:
+            from .inverter.inverter import Inverter
+
             self._inverter = Inverter(self.session)
         return self._inverter
 
     @property
-    def storage(self):
+    def storage(self) -> "Storage":
         if self._storage is None:
+            from .storage.storage import Storage
+
             self._storage = Storage(self.session)
         return self._storage
 
     @property
-    def min(self):
+    def min(self) -> "Min":
         if self._min is None:
+            from .min.min import Min
+
             self._min = Min(self.session)
         return self._min
 
     @property
-    def max(self):
+    def max(self) -> "Max":
         if self._max is None:
+            from .max.max import Max
+
             self._max = Max(self.session)
         return self._max
 
     @property
-    def sph(self):
+    def sph(self) -> "Sph":
         if self._sph is None:
+            from .sph.sph import Sph
+
             self._sph = Sph(self.session)
         return self._sph
 
     @property
-    def spa(self):
+    def spa(self) -> "Spa":
         if self._spa is None:
+            from .spa.spa import Spa
+
             self._spa = Spa(self.session)
         return self._spa
 
     @property
-    def pcs(self):
+    def pcs(self) -> "Pcs":
         if self._pcs is None:
+            from .pcs.pcs import Pcs
+
             self._pcs = Pcs(self.session)
         return self._pcs
 
     @property
-    def hps(self):
+    def hps(self) -> "Hps":
         if self._hps is None:
+            from .hps.hps import Hps
+
             self._hps = Hps(self.session)
         return self._hps
 
     @property
-    def pbd(self):
+    def pbd(self) -> "Pbd":
         if self._pbd is None:
+            from .pbd.pbd import Pbd
+
             self._pbd = Pbd(self.session)
         return self._pbd
 
     @property
-    def smart_meter(self):
+    def smart_meter(self) -> "SmartMeter":
         if self._smart_meter is None:
+            from .smart_meter.smart_meter import SmartMeter
+
             self._smart_meter = SmartMeter(self.session)
         return self._smart_meter
 
     @property
-    def env_sensor(self):
+    def env_sensor(self) -> "EnvSensor":
         if self._env_sensor is None:
+            from .env_sensor.env_sensor import EnvSensor
+
             self._env_sensor = EnvSensor(self.session)
         return self._env_sensor
 
     @property
-    def groboost(self):
+    def groboost(self) -> "Groboost":
         if self._groboost is None:
+            from .groboost.groboost import Groboost
+
             self._groboost = Groboost(self.session)
         return self._groboost
 
     @property
-    def wit(self):
+    def wit(self) -> "Wit":
         if self._wit is None:
+            from .wit.wit import Wit
+
             self._wit = Wit(self.session)
         return self._wit
 
     @property
-    def sphs(self):
+    def sphs(self) -> "Sphs":
         if self._sphs is None:
+            from .sphs.sphs import Sphs
+
             self._sphs = Sphs(self.session)
         return self._sphs
 
     @property
-    def noah(self):
+    def noah(self) -> "Noah":
         if self._noah is None:
+            from .noah.noah import Noah
+
             self._noah = Noah(self.session)
         return self._noah
 
     # ##############################################################################
 
-    def api_for_device(  # noqa: C901 'GrowattApi.api_for_device' is too complex (14)
+    def fleet_snapshot(self, device_types: Optional[Iterable[DeviceType]] = None) -> Dict[str, "DeviceEnergyDataV4"]:
+        """
+        Latest data of all devices accessible with the token.
+
+        * all devices are listed using device.iter_list() (all pages of device.list())
+        * devices are grouped by device type
+        * latest data is requested for all device types concurrently, 100 devices per request (see api_v4.energy())
+
+        Only device types supported by v4 API are included (inverter, storage, max, sph, spa, min, wit, sph-s, noah).
+
+        :param device_types: Only include these device types (default: all)
+        :return: Latest data by device serial number, e.g. {"BZP0000000": MinEnergyDataV4(...), ...}
+        """
+        devices = list(self.device.iter_list())
+        return self.api_v4.energy_multiple_types(device_sn=group_devices_by_type(devices, device_types=device_types))
+
+    def api_for_device(
         self, device_sn: str, device_type: Optional[DeviceType] = None
-    ) -> Optional[Union[Groboost, Hps, Inverter, Max, Min, Noah, Pbd, Pcs, Spa, Sph, Sphs, Storage, Wit]]:
+    ) -> Optional[
+        Union["Groboost", "Hps", "Inverter", "Max", "Min", "Noah", "Pbd", "Pcs", "Spa", "Sph", "Sphs", "Storage", "Wit"]
+    ]:
         """
         Get the API for a specific device.
 
@@ -219,33 +337,8 @@ class GrowattApi:
         if device_type is None:
             device_type = self.device.get_device_type(device_sn)
 
-        if device_type == DeviceType.GROBOOST:
-            return Groboost(session=self.session, device_sn=device_sn)
-        elif device_type == DeviceType.HPS:
-            return Hps(session=self.session, device_sn=device_sn)
-        elif device_type == DeviceType.INVERTER:
-            return Inverter(session=self.session, device_sn=device_sn)
-        elif device_type == DeviceType.MAX:
-            return Max(session=self.session, device_sn=device_sn)
-        elif device_type == DeviceType.MIN:
-            return Min(session=self.session, device_sn=device_sn)
-        elif device_type == DeviceType.NOAH:
-            return Noah(session=self.session, device_sn=device_sn)
-        elif device_type == DeviceType.PBD:
-            return Pbd(session=self.session, device_sn=device_sn)
-        elif device_type == DeviceType.PCS:
-            return Pcs(session=self.session, device_sn=device_sn)
-        elif device_type == DeviceType.SPA:
-            return Spa(session=self.session, device_sn=device_sn)
-        elif device_type == DeviceType.SPH:
-            return Sph(session=self.session, device_sn=device_sn)
-        elif device_type == DeviceType.SPHS:
-            return Sphs(session=self.session, device_sn=device_sn)
-        elif device_type == DeviceType.STORAGE:
-            return Storage(session=self.session, device_sn=device_sn)
-        elif device_type == DeviceType.WIT:
-            return Wit(session=self.session, device_sn=device_sn)
-        else:
+        api_class = device_api_class(device_type)
+        if api_class is None:
             logger.error(f"Unknown device type: {device_type} for {device_sn=}")
-
-        return None
+            return None
+        return api_class(session=self.session, device_sn=device_sn)
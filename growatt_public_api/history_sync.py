@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional, List, Dict, Set
+from loguru import logger
+from .backfill import HistoryRecord
+from .growatt_api import GrowattApi
+from .growatt_types import DeviceType
+from .pydantic_models import model_responses
+
+# endpoint of ApiV4.energy_history() - high-water marks are tracked per endpoint and device
+_ENDPOINT = "new-api/queryHistoricalData"
+
+
+class _SyncState:
+    """
+    sync progress of a single device
+    * mark: timestamp of the latest record returned so far (high-water mark)
+    * day: day to request next (the day of the mark until all records of that day have been retrieved)
+    * seen: timestamps of records returned within `lookback` before the mark (to detect late records)
+    """
+
+    def __init__(self, day: date, mark: Optional[datetime] = None, seen: Optional[Set[datetime]] = None) -> None:
+        self.day = day
+        self.mark = mark
+        self.seen = seen or set()
+
+    def new_records(self, records: list, lookback: timedelta) -> list:
+        """records not returned before - newer than the mark or arrived late (within `lookback` before the mark)"""
+        if self.mark is None:
+            return [r for r in records if r.time is not None]
+        return [
+            r
+            for r in records
+            if r.time is not None
+            and (r.time > self.mark or (r.time >= self.mark - lookback and r.time not in self.seen))
+        ]
+
+    def update(self, records: list, lookback: timedelta) -> None:
+        timestamps = {r.time for r in records}
+        if not timestamps:
+            return
+        self.mark = max(timestamps | ({self.mark} if self.mark else set()))
+        self.seen = {t for t in self.seen | timestamps if t >= self.mark - lookback}
+
+    def to_json(self) -> dict:
+        return {
+            "day": self.day.isoformat(),
+            "mark": self.mark.isoformat() if self.mark else None,
+            "seen": sorted(t.isoformat() for t in self.seen),
+        }
+
+    @classmethod
+    def from_json(cls, state: dict) -> "_SyncState":
+        return cls(
+            day=date.fromisoformat(state["day"]),
+            mark=datetime.fromisoformat(state["mark"]) if state["mark"] else None,
+            seen={datetime.fromisoformat(t) for t in state["seen"]},
+        )
+
+
+class HistorySync:
+    """
+    Incremental sync of v4 history data (ApiV4.energy_history() / <device>.energy_history_v4())
+
+    Polling energy_history_v4() for today returns all records since midnight on each call.
+    HistorySync keeps a high-water mark (timestamp of the latest record) per device and endpoint
+    and only returns records newer than the mark.
+
+    * late records (arriving after newer records have already been returned) are returned
+      if they are at most `lookback` older than the mark
+    * day rollover: after midnight, the previous day is requested once more to get its remaining records,
+      the next sync continues with today. If syncs have been paused for several days, one day is retrieved per sync.
+    * marks are saved to `state_file` (if given), so syncing continues where it stopped after a restart
+
+    Each sync sends (at most) one request per device. energy_history_v4() is limited to once every 5 minutes per device.
+
+    Usage:
+        history_sync = HistorySync(api=GrowattApi(token="your_token"), state_file=Path("history_sync.json"))
+        while True:
+            for record in history_sync.sync(device_sn="0PVP000000", device_type=DeviceType.NOAH):
+                print(record.data.time)
+            time.sleep(300)
+    """
+
+    api: GrowattApi
+    state_file: Optional[Path]
+    lookback: timedelta
+
+    def __init__(
+        self,
+        api: GrowattApi,
+        state_file: Optional[Path] = None,
+        lookback: timedelta = timedelta(minutes=30),
+    ) -> None:
+        """
+        :param api: GrowattApi instance
+        :param state_file: JSON file to save high-water marks to (and load from if it exists)
+        :param lookback: max age (relative to the high-water mark) of late records to be returned
+        """
+        self.api = api
+        self.state_file = state_file
+        self.lookback = lookback
+        self._states: Dict[str, Dict[str, _SyncState]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def _today() -> date:
+        return date.today()
+
+    def high_water_mark(self, device_sn: str) -> Optional[datetime]:
+        """timestamp of the latest record returned for the device"""
+        state = self._states.get(_ENDPOINT, {}).get(device_sn)
+        return state.mark if state else None
+
+    def reset(self, device_sn: Optional[str] = None) -> None:
+        """forget high-water mark of a device (or all devices) - the next sync returns all records of today"""
+        with self._lock:
+            if device_sn is None:
+                self._states.get(_ENDPOINT, {}).clear()
+            else:
+                self._states.get(_ENDPOINT, {}).pop(device_sn, None)
+            self._save()
+
+    def sync(self, device_sn: str, device_type: Optional[DeviceType] = None) -> List[HistoryRecord]:
+        """
+        Retrieve records of a device added since the last sync
+
+        :param device_sn: device serial number
+        :param device_type: device type - retrieved by device.get_device_type() if not given
+        :return: new records (ordered by time) - empty list if none or if the request failed
+        """
+        if device_type is None:
+            device_type = self.api.device.get_device_type(device_sn=device_sn)
+
+        today = self._today()
+        state = self._states.get(_ENDPOINT, {}).get(device_sn) or _SyncState(day=today)
+        day = min(state.day, today)
+        with model_responses():
+            response = self.api.api_v4.energy_history(device_sn=device_sn, device_type=device_type, date_=day)
+        if response.error_code != 0 or response.data is None:
+            logger.warning(
+                f"Error {response.error_code}: '{response.error_msg}' syncing history of {device_sn} for {day}"
+            )
+            return []
+
+        with self._lock:
+            new_records = sorted(state.new_records(response.data.datas, lookback=self.lookback), key=lambda r: r.time)
+            state.update(new_records, lookback=self.lookback)
+            # past days are complete - continue with the next day
+            state.day = day + timedelta(days=1) if day < today else day
+            self._states.setdefault(_ENDPOINT, {})[device_sn] = state
+            self._save()
+        return [HistoryRecord(device_sn=device_sn, device_type=device_type, data=record) for record in new_records]
+
+    def _load(self) -> None:
+        if self.state_file is None or not self.state_file.exists():
+            return
+        states = json.loads(self.state_file.read_text())
+        self._states = {
+            endpoint: {device_sn: _SyncState.from_json(state) for device_sn, state in devices.items()}
+            for endpoint, devices in states.items()
+        }
+
+    def _save(self) -> None:
+        if self.state_file is None:
+            return
+        states = {
+            endpoint: {device_sn: state.to_json() for device_sn, state in devices.items()}
+            for endpoint, devices in self._states.items()
+        }
+        # write to temporary file first, so the state is never corrupted by interruptions
+        tmp_file = self.state_file.with_name(f"{self.state_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(states, indent=2))
+        tmp_file.replace(self.state_file)
@@ -5,8 +5,11 @@ from ..pydantic_models.hps import (
     HpsEnergyOverview,
     HpsEnergyHistory,
     HpsAlarms,
+    HpsAlarm,
+    HpsEnergyOverviewData,
 )
 from ..session.growatt_api_session import GrowattApiSession
+from ..pagination import PageIterator
 
 
 class Hps:
@@ -559,6 +562,42 @@ class Hps:
 
         return HpsEnergyHistory.model_validate(response)
 
+    def iter_energy_history(
+        self,
+        device_sn: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        timezone: Optional[str] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[HpsEnergyOverviewData]:
+        """
+        Iterate over all history records of energy_history() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            device_sn (str): HPS serial number
+            start_date (Optional[date]): Start Date - defaults to today
+            end_date (Optional[date]): End Date (date interval cannot exceed 7 days) - defaults to today
+            timezone (Optional[str]): The time zone code of the data display, the default is UTC
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[HpsEnergyOverviewData]
+        """
+
+        return PageIterator(
+            self,
+            "energy_history",
+            items="datas",
+            prefetch=prefetch,
+            device_sn=device_sn,
+            start_date=start_date,
+            end_date=end_date,
+            timezone=timezone,
+            limit=limit,
+        )
+
     def alarms(
         self,
         device_sn: Optional[str] = None,
@@ -631,3 +670,27 @@ class Hps:
         )
 
         return HpsAlarms.model_validate(response)
+
+    def iter_alarms(
+        self,
+        device_sn: Optional[str] = None,
+        date_: Optional[date] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[HpsAlarm]:
+        """
+        Iterate over all alarms of alarms() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            device_sn (str): HPS device serial number
+            date_ (Optional[date]): Date - defaults to today
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[HpsAlarm]
+        """
+
+        return PageIterator(
+            self, "alarms", items="alarms", prefetch=prefetch, device_sn=device_sn, date_=date_, limit=limit
+        )
@@ -19,8 +19,12 @@ from ..pydantic_models.inverter import (
     InverterEnergyOverviewMultiple,
     InverterSettingRead,
     InverterEnergyOverviewMultipleItem,
+    InverterAlarm,
+    InverterEnergyHistoryDataItem,
 )
 from ..session.growatt_api_session import GrowattApiSession
+from ..columnar import HistoryColumns
+from ..pagination import PageIterator
 from ..api_v4.api_v4 import ApiV4
 
 
@@ -115,9 +119,12 @@ class Inverter:
             },
         )
 
+        if response.get("error_code") == 10002:
+            response = {
+                **response,
+                "error_msg": f"{response.get('error_msg') or ''} (or type != 1 - check with plant.list_devices())",
+            }
         inv_setting_response = InverterSettingRead.model_validate(response)
-        if inv_setting_response.error_code == 10002:
-            inv_setting_response.error_msg += " (or type != 1 - check with plant.list_devices())"
 
         return inv_setting_response
 
@@ -235,9 +242,12 @@ class Inverter:
             },
         )
 
+        if response.get("error_code") == 10012:
+            response = {
+                **response,
+                "error_msg": f"{response.get('error_msg') or ''} (or type != 1 - check with plant.list_devices())",
+            }
         inv_setting_response = InverterSettingWrite.model_validate(response)
-        if inv_setting_response.error_code == 10012:
-            inv_setting_response.error_msg += " (or type != 1 - check with plant.list_devices())"
 
         return inv_setting_response
 
@@ -413,7 +423,7 @@ class Inverter:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
 
         Returns:
             InverterDetailsV4
@@ -730,7 +740,7 @@ class Inverter:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
 
         Returns:
             InverterEnergyV4
@@ -1203,6 +1213,42 @@ class Inverter:
 
         return InverterEnergyHistory.model_validate(response)
 
+    def iter_energy_history(
+        self,
+        device_sn: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        timezone: Optional[str] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[InverterEnergyHistoryDataItem]:
+        """
+        Iterate over all history records of energy_history() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            device_sn (str): Inverter serial number
+            start_date (Optional[date]): Start Date - defaults to today
+            end_date (Optional[date]): End Date (date interval cannot exceed 7 days) - defaults to today
+            timezone (Optional[str]): The time zone code of the data display, the default is UTC
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[InverterEnergyHistoryDataItem]
+        """
+
+        return PageIterator(
+            self,
+            "energy_history",
+            items="datas",
+            prefetch=prefetch,
+            device_sn=device_sn,
+            start_date=start_date,
+            end_date=end_date,
+            timezone=timezone,
+            limit=limit,
+        )
+
     def energy_history_v4(
         self,
         device_sn: Optional[str] = None,
@@ -1236,6 +1282,33 @@ class Inverter:
             device_sn=self._device_sn(device_sn), device_type=DeviceType.INVERTER, date_=date_
         )
 
+    def energy_history_columns_v4(
+        self,
+        device_sn: Optional[str] = None,
+        date_: Optional[date] = None,
+        fields: Optional[List[str]] = None,
+    ) -> HistoryColumns:
+        """
+        One day data using "new-api" endpoint as columns (field name -> NumPy array)
+        Same request as energy_history_v4(), but records are converted to columns directly from the JSON response
+        (without creating a pydantic model per record). Requires optional dependency "numpy".
+
+        Rate limit(s):
+        * The retrieval frequency is once every 5 minutes.
+
+        Args:
+            device_sn (str): Device unique serial number (SN)
+            date_ (Optional[date]): Start Date - defaults to today
+            fields (Optional[List[str]]): fields to return, e.g. ["time", "ppv"] - defaults to all fields
+
+        Returns:
+            HistoryColumns (see ApiV4.energy_history_columns())
+        """
+
+        return self._api_v4.energy_history_columns(
+            device_sn=self._device_sn(device_sn), device_type=DeviceType.INVERTER, date_=date_, fields=fields
+        )
+
     def energy_history_multiple_v4(  # noqa: C901 'ApiV4.energy' is too complex (11)
         self,
         device_sn: Optional[Union[str, List[str]]] = None,
@@ -1250,7 +1323,7 @@ class Inverter:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
             date_ (Optional[date]): Start Date - defaults to today
 
         Returns:
@@ -1333,6 +1406,30 @@ class Inverter:
 
         return InverterAlarms.model_validate(response)
 
+    def iter_alarms(
+        self,
+        device_sn: Optional[str] = None,
+        date_: Optional[date] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[InverterAlarm]:
+        """
+        Iterate over all alarms of alarms() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            device_sn (str): Inverter serial number
+            date_ (Optional[date]): Date - defaults to today
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[InverterAlarm]
+        """
+
+        return PageIterator(
+            self, "alarms", items="alarms", prefetch=prefetch, device_sn=device_sn, date_=date_, limit=limit
+        )
+
     def wifi_strength(  # noqa: C901 'ApiV4.power' is too complex (11)
         self,
         device_sn: str,
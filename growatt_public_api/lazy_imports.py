@@ -0,0 +1,37 @@
+import importlib
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+def lazy_attributes(
+    package: str,
+    imports: Dict[str, Iterable[str]],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Module-level __getattr__() and __dir__() (PEP 562) importing a package's public names on first access
+
+    Pydantic models build their validators on import, which takes seconds for all models of this package.
+    Using lazy attributes, only the modules actually used are imported.
+
+    :param package: __name__ of the package
+    :param imports: names by module (relative to package), e.g. {".growatt_api": ["GrowattApi"]}
+
+    Usage (in __init__.py):
+        __getattr__, __dir__ = lazy_attributes(__name__, {".growatt_api": ["GrowattApi"]})
+    """
+    modules = {name: module for module, names in imports.items() for name in names}
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = modules.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        # cache in package namespace - __getattr__() is not called again for this name
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(namespace.keys() | modules.keys())
+
+    return __getattr__, __dir__
@@ -23,8 +23,12 @@ from ..pydantic_models.min import (
     MinEnergyOverviewMultiple,
     MinEnergyOverviewMultipleItem,
     MinSettings,
+    MinAlarm,
+    MinEnergyOverviewData,
 )
 from ..session.growatt_api_session import GrowattApiSession  # noqa: E402
+from ..columnar import HistoryColumns  # noqa: E402
+from ..pagination import PageIterator  # noqa: E402
 from ..api_v4.api_v4 import ApiV4  # noqa: E402
 from ..vpp.vpp import Vpp  # noqa: E402
 
@@ -1329,7 +1333,7 @@ class Min:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
 
         Returns:
             MinDetailsV4
@@ -1714,7 +1718,7 @@ class Min:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
 
         Returns:
             MinEnergyV4
@@ -2505,6 +2509,26 @@ class Min:
                 'error_msg': None}
         """
 
+        response = self._energy_history_response(
+            device_sn=device_sn,
+            start_date=start_date,
+            end_date=end_date,
+            timezone=timezone,
+            page=page,
+            limit=limit,
+        )
+
+        return MinEnergyHistory.model_validate(response)
+
+    def _energy_history_response(
+        self,
+        device_sn: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        timezone: Optional[str] = None,
+        page: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> dict:
         if start_date is None and end_date is None:
             start_date = date.today()
             end_date = date.today()
@@ -2517,7 +2541,7 @@ class Min:
         if end_date - start_date >= timedelta(days=7):
             raise ValueError("date interval must not exceed 7 days")
 
-        response = self.session.post(
+        return self.session.post(
             endpoint="device/tlx/tlx_data",
             data={
                 "tlx_sn": self._device_sn(device_sn),
@@ -2529,7 +2553,93 @@ class Min:
             },
         )
 
-        return MinEnergyHistory.model_validate(response)
+    def energy_history_columns(
+        self,
+        device_sn: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        timezone: Optional[str] = None,
+        page: Optional[int] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ) -> HistoryColumns:
+        """
+        Get historical data of a Min as columns (field name -> NumPy array)
+        Same request as energy_history(), but records are converted to columns directly from the JSON response
+        (without creating a pydantic model per record). Requires optional dependency "numpy".
+
+        Rate limit(s):
+        * The frequency of acquisition is once every 10 seconds
+
+        Args:
+            device_sn (str): Inverter serial number
+            start_date (Optional[date]): Start Date - defaults to today
+            end_date (Optional[date]): End Date (date interval cannot exceed 7 days) - defaults to today
+            timezone (Optional[str]): The time zone code of the data display, the default is UTC
+            page (Optional[int]): page number, default 1
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            fields (Optional[List[str]]): fields to return, e.g. ["time", "ppv"] - defaults to all fields
+
+        Returns:
+            HistoryColumns
+            e.g.
+            HistoryColumns(
+                error_code=0,
+                error_msg=None,
+                columns={
+                    'time': array(['2024-05-25T16:56:33.000', ...], dtype='datetime64[ms]'),
+                    'ppv': array([1234.5, ...]),
+                    <see energy_history() for attributes>
+                }
+            )
+        """
+
+        response = self._energy_history_response(
+            device_sn=device_sn,
+            start_date=start_date,
+            end_date=end_date,
+            timezone=timezone,
+            page=page,
+            limit=limit,
+        )
+
+        return HistoryColumns.from_response(response, model=MinEnergyOverviewData, fields=fields)
+
+    def iter_energy_history(
+        self,
+        device_sn: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        timezone: Optional[str] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[MinEnergyOverviewData]:
+        """
+        Iterate over all history records of energy_history() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            device_sn (str): Inverter serial number
+            start_date (Optional[date]): Start Date - defaults to today
+            end_date (Optional[date]): End Date (date interval cannot exceed 7 days) - defaults to today
+            timezone (Optional[str]): The time zone code of the data display, the default is UTC
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[MinEnergyOverviewData]
+        """
+
+        return PageIterator(
+            self,
+            "energy_history",
+            items="datas",
+            prefetch=prefetch,
+            device_sn=device_sn,
+            start_date=start_date,
+            end_date=end_date,
+            timezone=timezone,
+            limit=limit,
+        )
 
     def energy_history_v4(
         self,
@@ -2564,6 +2674,33 @@ class Min:
             device_sn=self._device_sn(device_sn), device_type=DeviceType.MIN, date_=date_
         )
 
+    def energy_history_columns_v4(
+        self,
+        device_sn: Optional[str] = None,
+        date_: Optional[date] = None,
+        fields: Optional[List[str]] = None,
+    ) -> HistoryColumns:
+        """
+        One day data using "new-api" endpoint as columns (field name -> NumPy array)
+        Same request as energy_history_v4(), but records are converted to columns directly from the JSON response
+        (without creating a pydantic model per record). Requires optional dependency "numpy".
+
+        Rate limit(s):
+        * The retrieval frequency is once every 5 minutes.
+
+        Args:
+            device_sn (str): Device unique serial number (SN)
+            date_ (Optional[date]): Start Date - defaults to today
+            fields (Optional[List[str]]): fields to return, e.g. ["time", "ppv"] - defaults to all fields
+
+        Returns:
+            HistoryColumns (see ApiV4.energy_history_columns())
+        """
+
+        return self._api_v4.energy_history_columns(
+            device_sn=self._device_sn(device_sn), device_type=DeviceType.MIN, date_=date_, fields=fields
+        )
+
     def energy_history_multiple_v4(  # noqa: C901 'ApiV4.energy' is too complex (11)
         self,
         device_sn: Optional[Union[str, List[str]]] = None,
@@ -2578,7 +2715,7 @@ class Min:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
             date_ (Optional[date]): Start Date - defaults to today
 
         Returns:
@@ -2663,6 +2800,30 @@ class Min:
 
         return MinAlarms.model_validate(response)
 
+    def iter_alarms(
+        self,
+        device_sn: Optional[str] = None,
+        date_: Optional[date] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[MinAlarm]:
+        """
+        Iterate over all alarms of alarms() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            device_sn (str): Inverter serial number
+            date_ (Optional[date]): Date - defaults to today
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[MinAlarm]
+        """
+
+        return PageIterator(
+            self, "alarms", items="alarms", prefetch=prefetch, device_sn=device_sn, date_=date_, limit=limit
+        )
+
     def soc(
         self,
         device_sn: Optional[str] = None,
@@ -4,6 +4,7 @@ from typing import Union, List, Optional, Literal
 
 from ..api_v4 import ApiV4
 from ..growatt_types import DeviceType, WorkMode
+from ..pydantic_models import model_responses
 from ..pydantic_models.noah import (
     NoahStatus,
     NoahBatteryStatus,
@@ -22,6 +23,7 @@ from ..pydantic_models.api_v4 import (
     WifiStrengthV4,
 )
 from ..session.growatt_api_session import GrowattApiSession  # noqa: E402
+from ..columnar import HistoryColumns  # noqa: E402
 from ..device import Device
 
 
@@ -67,7 +69,8 @@ class Noah:
         device_sn = self._device_sn(device_sn)
         if device_sn not in self._noah_or_nexa_cache:
             device_api = Device(session=self.session)
-            device_type_info = device_api.type_info(device_sn=self._device_sn(device_sn))
+            with model_responses():
+                device_type_info = device_api.type_info(device_sn=self._device_sn(device_sn))
             model_name = device_type_info.model or ""
             model_name = model_name.lower()
             model_name = model_name.split(" ")[0]
@@ -426,6 +429,17 @@ class Noah:
         for _time_string in sorted(response.get("obj", {}).keys()):
             _data_item = response.get("obj", {}).get(_time_string, {}).copy()
             _data_item["time"] = f"{_date_string} {_time_string}"  # make it datetime
+            # nexa has integer overflow on negative values for total_household_load
+            try:
+                _load_power = float(_data_item.get("totalHouseholdLoad") or 0.0)
+            except (TypeError, ValueError):
+                _load_power = 0.0
+            if _load_power > 50000.0:
+                # fix overflow by subtracting 65536.0
+                _data_item["totalHouseholdLoad"] = _load_power - 65536.0
+            elif _load_power > 25000.0:
+                # as chart data shows mean values, still values like 32755.5 can occur
+                _data_item["totalHouseholdLoad"] = _load_power - 65536.0 / 2.0
             _data.append(_data_item)
 
         npc = NoahPowerChart.model_validate(
@@ -436,17 +450,6 @@ class Noah:
             }
         )
 
-        # nexa has integer overflow on negative values for total_household_load
-        for entry in npc.data:
-            if not entry.total_household_load:
-                continue
-            elif entry.total_household_load > 50000.0:
-                # fix overflow by subtracting 65536.0
-                entry.total_household_load -= 65536.0
-            elif entry.total_household_load > 25000.0:
-                # as chart data shows mean values, still values like 32755.5 can occur
-                entry.total_household_load -= 65536.0 / 2.0
-
         return npc
 
     def energy_chart(
@@ -559,7 +562,7 @@ class Noah:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
 
         Returns:
             NoahDetailsV4
@@ -673,7 +676,7 @@ class Noah:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
 
         Returns:
             {   'data': {   'devices': [   {   'ac_couple_protect_status': 4,
@@ -820,6 +823,33 @@ class Noah:
             device_sn=self._device_sn(device_sn), device_type=DeviceType.NOAH, date_=date_
         )
 
+    def energy_history_columns_v4(
+        self,
+        device_sn: Optional[str] = None,
+        date_: Optional[date] = None,
+        fields: Optional[List[str]] = None,
+    ) -> HistoryColumns:
+        """
+        One day data using "new-api" endpoint as columns (field name -> NumPy array)
+        Same request as energy_history_v4(), but records are converted to columns directly from the JSON response
+        (without creating a pydantic model per record). Requires optional dependency "numpy".
+
+        Rate limit(s):
+        * The retrieval frequency is once every 5 minutes.
+
+        Args:
+            device_sn (str): Device unique serial number (SN)
+            date_ (Optional[date]): Start Date - defaults to today
+            fields (Optional[List[str]]): fields to return, e.g. ["time", "ppv"] - defaults to all fields
+
+        Returns:
+            HistoryColumns (see ApiV4.energy_history_columns())
+        """
+
+        return self._api_v4.energy_history_columns(
+            device_sn=self._device_sn(device_sn), device_type=DeviceType.NOAH, date_=date_, fields=fields
+        )
+
     def energy_history_multiple_v4(  # noqa: C901 'ApiV4.energy' is too complex (11)
         self,
         device_sn: Optional[Union[str, List[str]]] = None,
@@ -834,7 +864,7 @@ class Noah:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
             date_ (Optional[date]): Start Date - defaults to today
 
         Returns:
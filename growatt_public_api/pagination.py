@@ -0,0 +1,157 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Any, Generic, TypeVar, Iterator, AsyncIterator, Callable, Awaitable, List
+from loguru import logger
+from .pydantic_models import model_responses
+from .session.growatt_api_session import GrowattApiSession
+
+T = TypeVar("T")
+
+
+class PageIterator(Generic[T]):
+    """
+    Iterate over all items of a paginated endpoint, fetching pages lazily (one page at a time)
+
+    Pages are requested using the api's method `method` (with `page=1, 2, ...` and the given `kwargs`),
+    items are taken from attribute `items` of the response's data.
+    Iteration stops after the last page, which is detected by (whichever is available)
+    * "last_pager" flag (v4 API)
+    * "count" (total number of items)
+    * a page with less than `limit` items
+    * an empty page
+    * an error response (logged as warning)
+
+    prefetch: request next page while the current page is consumed (sync: in a background thread)
+
+    Usage:
+        for alarm in api.min.iter_alarms(device_sn="BZP0000000", prefetch=True):
+            print(alarm)
+        async for alarm in async_api.min.iter_alarms(device_sn="BZP0000000"):
+            print(alarm)
+        for page in api.min.iter_alarms(device_sn="BZP0000000").pages():
+            print(page.data.count)
+    """
+
+    method: str
+    items: str
+    kwargs: dict
+    prefetch: bool
+
+    def __init__(self, api: Any, method: str, items: str, prefetch: bool = False, **kwargs) -> None:
+        self.api = api
+        self.method = method
+        self.items = items
+        self.prefetch = prefetch
+        self.kwargs = kwargs
+
+    def fetch_page(self, page: int):
+        """request a single page"""
+        # pages are inspected, so models are required (even within raw_responses() / lazy_validation())
+        with model_responses():
+            return getattr(self.api, self.method)(page=page, **self.kwargs)
+
+    def page_items(self, response) -> Optional[List[T]]:
+        """items of a page - None if response is an error"""
+        if response.error_code != 0 or response.data is None:
+            return None
+        return getattr(response.data, self.items) or []
+
+    def has_next_page(self, response, page_items: Optional[List[T]], item_count: int) -> bool:
+        """
+        True if another page follows the page `response`
+
+        :param page_items: items of the page (see page_items())
+        :param item_count: number of items on this and all previous pages
+        """
+        if page_items is None:
+            logger.warning(
+                f"Error {response.error_code}: '{response.error_msg}' querying {self.method}() - stopping iteration"
+            )
+            return False
+        if not page_items:
+            return False
+        if getattr(response.data, "last_pager", None):
+            return False
+        count = getattr(response.data, "count", None)
+        if count is not None:
+            return item_count < count
+        limit = self.kwargs.get("limit")
+        if limit is not None:
+            return len(page_items) >= limit
+        return True
+
+    def pages(self) -> Iterator[Any]:
+        """iterate over page responses (including an error response stopping the iteration)"""
+        # threads are not possible while executed on behalf of the async API
+        executor = (
+            ThreadPoolExecutor(max_workers=1)
+            if self.prefetch and isinstance(self.api.session, GrowattApiSession)
+            else None
+        )
+        try:
+            page = 1
+            item_count = 0
+            next_page: Optional[Future] = None
+            while True:
+                response = next_page.result() if next_page is not None else self.fetch_page(page)
+                page_items = self.page_items(response)
+                item_count += len(page_items or [])
+                has_next_page = self.has_next_page(response, page_items=page_items, item_count=item_count)
+                page += 1
+                next_page = executor.submit(self.fetch_page, page) if has_next_page and executor else None
+                yield response
+                if not has_next_page:
+                    return
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def __iter__(self) -> Iterator[T]:
+        for response in self.pages():
+            yield from self.page_items(response) or []
+
+    def to_async(self, fetch: Callable[..., Awaitable[Any]]) -> "AsyncPageIterator[T]":
+        """async variant fetching pages using `fetch(method, page=..., **kwargs)`"""
+        return AsyncPageIterator(page_iterator=self, fetch=fetch)
+
+
+class AsyncPageIterator(Generic[T]):
+    """
+    async variant of PageIterator (prefetch runs as asyncio task)
+    """
+
+    def __init__(self, page_iterator: PageIterator[T], fetch: Callable[..., Awaitable[Any]]) -> None:
+        self._page_iterator = page_iterator
+        self._fetch = fetch
+
+    async def _fetch_page(self, page: int) -> Any:
+        with model_responses():
+            return await self._fetch(self._page_iterator.method, page=page, **self._page_iterator.kwargs)
+
+    async def pages(self) -> AsyncIterator[Any]:
+        """iterate over page responses (including an error response stopping the iteration)"""
+        page_iterator = self._page_iterator
+        page = 1
+        item_count = 0
+        next_page: Optional[asyncio.Task] = None
+        try:
+            while True:
+                response = await next_page if next_page is not None else await self._fetch_page(page)
+                page_items = page_iterator.page_items(response)
+                item_count += len(page_items or [])
+                has_next_page = page_iterator.has_next_page(response, page_items=page_items, item_count=item_count)
+                page += 1
+                next_page = None
+                if has_next_page and page_iterator.prefetch:
+                    next_page = asyncio.ensure_future(self._fetch_page(page))
+                yield response
+                if not has_next_page:
+                    return
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
+    async def __aiter__(self) -> AsyncIterator[T]:
+        async for response in self.pages():
+            for item in self._page_iterator.page_items(response) or []:
+                yield item
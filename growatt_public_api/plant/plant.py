@@ -7,6 +7,8 @@ from ..pydantic_models.device import (
     DataloggerDelete,
     DataloggerList,
     DeviceList,
+    DeviceData,
+    DataloggerData,
 )
 from ..pydantic_models.plant import (
     PlantList,
@@ -17,8 +19,11 @@ from ..pydantic_models.plant import (
     PlantAdd,
     PlantModify,
     PlantDelete,
+    PlantEnergyHistoryDate,
+    PlantData,
 )
 from ..session.growatt_api_session import GrowattApiSession
+from ..pagination import PageIterator
 
 
 class Plant:
@@ -286,6 +291,26 @@ class Plant:
 
         return PlantList.model_validate(response)
 
+    def iter_list_by_user(
+        self,
+        username: str,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[PlantData]:
+        """
+        Iterate over all plants of list_by_user() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            username (str): 	User Account
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[PlantData]
+        """
+
+        return PageIterator(self, "list_by_user", items="plants", prefetch=prefetch, username=username, limit=limit)
+
     def list(
         self,
         page: Optional[int] = None,
@@ -348,6 +373,36 @@ class Plant:
 
         return PlantList.model_validate(response)
 
+    def iter_list(
+        self,
+        limit: Optional[int] = None,
+        search_type: Optional[str] = None,
+        search_keyword: Optional[str] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[PlantData]:
+        """
+        Iterate over all plants of list() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            search_type (Optional[str]): search type
+            search_keyword (Optional[str]): search keywords
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[PlantData]
+        """
+
+        return PageIterator(
+            self,
+            "list",
+            items="plants",
+            prefetch=prefetch,
+            limit=limit,
+            search_type=search_type,
+            search_keyword=search_keyword,
+        )
+
     def details(
         self,
         plant_id: int,
@@ -598,6 +653,42 @@ class Plant:
 
         return PlantEnergyHistory.model_validate(response)
 
+    def iter_energy_history(
+        self,
+        plant_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        date_interval: Optional[Literal["day", "month", "year"]] = "day",
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[PlantEnergyHistoryDate]:
+        """
+        Iterate over all energy records of energy_history() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            plant_id (int): Power Station ID
+            start_date (Optional[date]): Start Date - defaults to today
+            end_date (Optional[date]): End Date (date interval cannot exceed 7 days) - defaults to today
+            date_interval (Literal["day", "month", "year"]): Time unit - defaults to day
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[PlantEnergyHistoryDate]
+        """
+
+        return PageIterator(
+            self,
+            "energy_history",
+            items="energys",
+            prefetch=prefetch,
+            plant_id=plant_id,
+            start_date=start_date,
+            end_date=end_date,
+            date_interval=date_interval,
+            limit=limit,
+        )
+
     def power(
         self,
         plant_id: int,
@@ -932,6 +1023,28 @@ class Plant:
 
         return DataloggerList.model_validate(response)
 
+    def iter_list_dataloggers(
+        self,
+        plant_id: int,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[DataloggerData]:
+        """
+        Iterate over all dataloggers of list_dataloggers() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            plant_id (int): Power Station ID
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[DataloggerData]
+        """
+
+        return PageIterator(
+            self, "list_dataloggers", items="dataloggers", prefetch=prefetch, plant_id=plant_id, limit=limit
+        )
+
     def list_devices(
         self,
         plant_id: int,
@@ -1005,3 +1118,23 @@ class Plant:
         )
 
         return DeviceList.model_validate(response)
+
+    def iter_list_devices(
+        self,
+        plant_id: int,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[DeviceData]:
+        """
+        Iterate over all devices of list_devices() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            plant_id (int): Power Station ID
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[DeviceData]
+        """
+
+        return PageIterator(self, "list_devices", items="devices", prefetch=prefetch, plant_id=plant_id, limit=limit)
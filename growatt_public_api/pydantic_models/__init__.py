@@ -1,113 +1,136 @@
-from ..pydantic_models.device import (  # noqa: F401
-    DeviceList,
-    DataloggerList,
-    DeviceTypeInfo,
-    DataloggerValidation,
-    DeviceEnergyDay,
-    DeviceDatalogger,
-    DeviceAdd,
-)
-from ..pydantic_models.env_sensor import (  # noqa: F401
-    EnvSensorList,
-    EnvSensorMetricsOverview,
-    EnvSensorMetricsHistory,
-)
-from ..pydantic_models.groboost import (  # noqa: F401
-    GroboostDetails,
-    GroboostMetricsOverview,
-    GroboostMetricsOverviewMultiple,
-    GroboostMetricsHistory,
-)
-from ..pydantic_models.hps import (  # noqa: F401
-    HpsDetails,
-    HpsEnergyOverview,
-    HpsEnergyHistory,
-    HpsAlarms,
-)
-from ..pydantic_models.inverter import (  # noqa: F401
-    InverterSettingRead,
-    InverterSettingWrite,
-    InverterDetails,
-    InverterEnergyOverview,
-    InverterEnergyOverviewMultiple,
-    InverterEnergyHistory,
-    InverterAlarms,
-)
-from ..pydantic_models.max import (  # noqa: F401
-    MaxSettingRead,
-    MaxSettingWrite,
-    MaxDetails,
-    MaxEnergyOverview,
-    MaxEnergyOverviewMultiple,
-    MaxEnergyHistory,
-    MaxAlarms,
-)
-from ..pydantic_models.min import (  # noqa: F401
-    MinSettings,
-    MinSettingRead,
-    MinSettingWrite,
-    MinDetails,
-    MinEnergyOverview,
-    MinEnergyOverviewMultiple,
-    MinEnergyHistory,
-    MinAlarms,
-)
-from ..pydantic_models.pcs import (  # noqa: F401
-    PcsDetails,
-    PcsEnergyOverview,
-    PcsEnergyHistory,
-    PcsAlarms,
-)
-from ..pydantic_models.pbd import (  # noqa: F401
-    PbdDetails,
-    PbdEnergyOverview,
-    PbdEnergyHistory,
-    PbdAlarms,
-)
-from ..pydantic_models.plant import (  # noqa: F401
-    PlantList,
-    PlantDetails,
-    PlantEnergyOverview,
-    PlantEnergyHistory,
-    PlantPower,
-    PlantInfo,
-)
-from ..pydantic_models.smart_meter import (  # noqa: F401
-    SmartMeterList,
-    SmartMeterEnergyOverview,
-    SmartMeterEnergyHistory,
-)
-from ..pydantic_models.spa import (  # noqa: F401
-    SpaSettingRead,
-    SpaSettingWrite,
-    SpaDetails,
-    SpaEnergyOverview,
-    SpaEnergyHistory,
-    SpaAlarms,
-)
-from ..pydantic_models.sph import (  # noqa: F401
-    SphSettingRead,
-    SphSettingWrite,
-    SphDetails,
-    SphEnergyOverview,
-    SphEnergyHistory,
-    SphAlarms,
-)
-from ..pydantic_models.storage import (  # noqa: F401
-    StorageSettingRead,
-    StorageSettingWrite,
-    StorageDetails,
-    StorageEnergyOverview,
-    StorageEnergyHistory,
-    StorageAlarms,
-)
-from ..pydantic_models.user import (  # noqa: F401
-    UserRegistration,
-    UserModification,
-    UsernameAvailabilityCheck,
-    UserList,
-)
-from ..pydantic_models.vpp import (  # noqa: F401
-    VppSoc,
-    VppWrite,
-)
+from ..lazy_imports import lazy_attributes
+
+# parsing modes are cheap to import (no models) - imported eagerly, as `raw_response` shares its module's name
+from .fast_parse import fast_validate, enable_fast_parse  # noqa: F401
+from .lazy_model import LazyModel, lazy_validate, lazy_validation  # noqa: F401
+from .raw_response import raw_response, raw_responses, model_responses  # noqa: F401
+
+# models are imported on first access (each module builds its validators on import)
+_IMPORTS = {
+    ".device": [
+        "DeviceList",
+        "DataloggerList",
+        "DeviceTypeInfo",
+        "DataloggerValidation",
+        "DeviceEnergyDay",
+        "DeviceDatalogger",
+        "DeviceAdd",
+    ],
+    ".env_sensor": [
+        "EnvSensorList",
+        "EnvSensorMetricsOverview",
+        "EnvSensorMetricsHistory",
+    ],
+    ".groboost": [
+        "GroboostDetails",
+        "GroboostMetricsOverview",
+        "GroboostMetricsOverviewMultiple",
+        "GroboostMetricsHistory",
+    ],
+    ".hps": [
+        "HpsDetails",
+        "HpsEnergyOverview",
+        "HpsEnergyHistory",
+        "HpsAlarms",
+    ],
+    ".inverter": [
+        "InverterSettingRead",
+        "InverterSettingWrite",
+        "InverterDetails",
+        "InverterEnergyOverview",
+        "InverterEnergyOverviewMultiple",
+        "InverterEnergyHistory",
+        "InverterAlarms",
+    ],
+    ".max": [
+        "MaxSettingRead",
+        "MaxSettingWrite",
+        "MaxDetails",
+        "MaxEnergyOverview",
+        "MaxEnergyOverviewMultiple",
+        "MaxEnergyHistory",
+        "MaxAlarms",
+    ],
+    ".min": [
+        "MinSettings",
+        "MinSettingRead",
+        "MinSettingWrite",
+        "MinDetails",
+        "MinEnergyOverview",
+        "MinEnergyOverviewMultiple",
+        "MinEnergyHistory",
+        "MinAlarms",
+    ],
+    ".pcs": [
+        "PcsDetails",
+        "PcsEnergyOverview",
+        "PcsEnergyHistory",
+        "PcsAlarms",
+    ],
+    ".pbd": [
+        "PbdDetails",
+        "PbdEnergyOverview",
+        "PbdEnergyHistory",
+        "PbdAlarms",
+    ],
+    ".plant": [
+        "PlantList",
+        "PlantDetails",
+        "PlantEnergyOverview",
+        "PlantEnergyHistory",
+        "PlantPower",
+        "PlantInfo",
+    ],
+    ".smart_meter": [
+        "SmartMeterList",
+        "SmartMeterEnergyOverview",
+        "SmartMeterEnergyHistory",
+    ],
+    ".spa": [
+        "SpaSettingRead",
+        "SpaSettingWrite",
+        "SpaDetails",
+        "SpaEnergyOverview",
+        "SpaEnergyHistory",
+        "SpaAlarms",
+    ],
+    ".sph": [
+        "SphSettingRead",
+        "SphSettingWrite",
+        "SphDetails",
+        "SphEnergyOverview",
+        "SphEnergyHistory",
+        "SphAlarms",
+    ],
+    ".storage": [
+        "StorageSettingRead",
+        "StorageSettingWrite",
+        "StorageDetails",
+        "StorageEnergyOverview",
+        "StorageEnergyHistory",
+        "StorageAlarms",
+    ],
+    ".user": [
+        "UserRegistration",
+        "UserModification",
+        "UsernameAvailabilityCheck",
+        "UserList",
+    ],
+    ".vpp": [
+        "VppSoc",
+        "VppWrite",
+    ],
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _IMPORTS)
+__all__ = [
+    "fast_validate",
+    "enable_fast_parse",
+    "LazyModel",
+    "lazy_validate",
+    "lazy_validation",
+    "raw_response",
+    "raw_responses",
+    "model_responses",
+    *(name for names in _IMPORTS.values() for name in names),
+]
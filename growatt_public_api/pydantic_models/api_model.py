@@ -2,6 +2,7 @@
 # Fastapi-restful was deprecated in favor of fastapi-utils (which is MIT as well).
 # This code is a rewritten and simplified version of the code from fastapi-restful and adjusted to work with pydantic V2.
 import datetime
+import os
 from typing import Any, TypeAlias, Annotated, Union, Optional
 
 from loguru import logger
@@ -46,13 +47,41 @@ EmptyStrToNone: TypeAlias = Annotated[None, BeforeValidator(_empty_str_to_none)]
 ForcedTime: TypeAlias = Annotated[Union[datetime.time, None], BeforeValidator(parse_forced_time)]
 
 
+# build validators on first use instead of on import - most models are never used by a given application
+# (see warm_up() to build them upfront, set environment variable GROWATT_DEFER_BUILD=0 to build on import)
+DEFER_BUILD = os.environ.get("GROWATT_DEFER_BUILD", "1") != "0"
+
+
 class ApiModel(BaseModel):
     model_config = ConfigDict(
         from_attributes=True,
         populate_by_name=True,
         alias_generator=to_camel,
+        defer_build=DEFER_BUILD,
     )
 
+    @classmethod
+    def model_validate(
+        cls,
+        obj: Any,
+        *,
+        strict: Optional[bool] = None,
+        from_attributes: Optional[bool] = None,
+        context: Optional[Any] = None,
+    ):
+        # imported here as these modules depend on this module
+        from .fast_parse import fast_parse_enabled, fast_validate
+        from .lazy_model import lazy_validation_enabled, LazyModel
+        from .raw_response import raw_responses_enabled, raw_response
+
+        if raw_responses_enabled() and isinstance(obj, dict):
+            return raw_response(cls, obj)
+        if lazy_validation_enabled() and isinstance(obj, dict):
+            return LazyModel(cls, obj)
+        if fast_parse_enabled() and isinstance(obj, dict) and (strict, from_attributes, context) == (None, None, None):
+            return fast_validate(cls, obj)
+        return super().model_validate(obj, strict=strict, from_attributes=from_attributes, context=context)
+
 
 class ApiResponse(ApiModel):
     """
@@ -62,6 +91,7 @@ class ApiResponse(ApiModel):
     data: Union[EmptyStrToNone, Any] = None
     error_code: Union[EmptyStrToNone, int]
     error_msg: Union[EmptyStrToNone, str]
+    cache_age: Union[EmptyStrToNone, float] = None  # seconds since received from server (None = not from cache)
 
 
 def _new_api_response_to_camel(snake: str) -> str:
@@ -88,6 +118,7 @@ class NewApiResponse(ApiModel):
     data: Union[EmptyStrToNone, Any] = None
     error_code: Union[EmptyStrToNone, int]
     error_msg: Union[EmptyStrToNone, str]
+    cache_age: Union[EmptyStrToNone, float] = None  # seconds since received from server (None = not from cache)
 
 
 class GrowattTime(ApiModel):
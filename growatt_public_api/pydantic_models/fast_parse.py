@@ -0,0 +1,218 @@
+import copy
+import threading
+from typing import Optional, Callable, Dict, Tuple, Type, TypeVar, Any
+from pydantic import BaseModel
+from pydantic_core import SchemaValidator, CoreSchema
+from .api_model import _empty_str_to_none
+
+M = TypeVar("M", bound=BaseModel)
+
+# raw values converted to None by EmptyStrToNone
+_EMPTY_VALUES = frozenset(["", "null", "None"])
+
+Normalizer = Callable[[Any], Any]
+
+
+def _is_empty_str_to_none(schema: CoreSchema) -> bool:
+    """union choice generated for EmptyStrToNone"""
+    return (
+        schema.get("type") == "function-before"
+        and schema.get("function", {}).get("function") is _empty_str_to_none
+        and schema.get("schema", {}).get("type") == "none"
+    )
+
+
+def _empty_to_none(value: Any) -> Any:
+    if isinstance(value, str) and value in _EMPTY_VALUES:
+        return None
+    return value
+
+
+def _compile_union(schema: CoreSchema) -> Tuple[CoreSchema, Optional[Normalizer]]:
+    choices = schema["choices"]
+    if any(isinstance(choice, tuple) for choice in choices):  # labeled choices are not generated by this package
+        return schema, None
+    other_choices = [choice for choice in choices if not _is_empty_str_to_none(choice)]
+    compiled = [_compile(choice) for choice in other_choices]
+    nested = [normalizer for _, normalizer in compiled if normalizer is not None]
+    if len(nested) > 1:
+        # not known which choice raw value belongs to - keep original (slow) validation
+        return schema, None
+    nested_normalizer = nested[0] if nested else None
+    if len(other_choices) == len(choices):
+        if nested_normalizer is None:
+            return schema, None
+        return {**schema, "choices": [s for s, _ in compiled]}, nested_normalizer
+
+    # Union[EmptyStrToNone, X] -> Optional[X] (raw value normalized before validation)
+    if len(compiled) == 1:
+        inner = compiled[0][0]
+    else:
+        inner = {**schema, "choices": [s for s, _ in compiled]}
+
+    if nested_normalizer is None:
+        return {"type": "nullable", "schema": inner}, _empty_to_none
+
+    def normalize(value: Any) -> Any:
+        value = _empty_to_none(value)
+        if value is None:
+            return value
+        return nested_normalizer(value)
+
+    return {"type": "nullable", "schema": inner}, normalize
+
+
+def _compile_model_fields(schema: CoreSchema) -> Tuple[CoreSchema, Optional[Normalizer]]:
+    fields = {}
+    normalizers: Dict[str, Normalizer] = {}
+    for name, field in schema["fields"].items():
+        field_schema, normalizer = _compile(field["schema"])
+        fields[name] = {**field, "schema": field_schema}
+        if normalizer is None:
+            continue
+        alias = field.get("validation_alias")
+        if alias is not None and not isinstance(alias, str):  # alias paths are not generated by this package
+            return schema, None
+        normalizers[alias or name] = normalizer
+        normalizers.setdefault(name, normalizer)  # populate_by_name
+    if not normalizers:
+        return {**schema, "fields": fields}, None
+    # fields only converting "" to None are handled inline (the majority), others by their normalizer
+    empty_keys = frozenset(key for key, normalizer in normalizers.items() if normalizer is _empty_to_none)
+    nested = {key: normalizer for key, normalizer in normalizers.items() if normalizer is not _empty_to_none}
+
+    def normalize(value: Any) -> Any:
+        if not isinstance(value, dict):
+            return value
+        value = {
+            key: None if item.__class__ is str and item in _EMPTY_VALUES and key in empty_keys else item
+            for key, item in value.items()
+        }
+        for key in nested.keys() & value.keys():
+            if value[key] is not None:
+                value[key] = nested[key](value[key])
+        return value
+
+    return {**schema, "fields": fields}, normalize
+
+
+def _compile_container(schema: CoreSchema, key: str) -> Tuple[CoreSchema, Optional[Normalizer]]:
+    if key not in schema:
+        return schema, None
+    item_schema, item_normalizer = _compile(schema[key])
+    if item_normalizer is None:
+        return {**schema, key: item_schema}, None
+    if schema["type"] == "list":
+
+        def normalize(value: Any) -> Any:
+            if not isinstance(value, list):
+                return value
+            return [item_normalizer(item) if item is not None else item for item in value]
+
+    else:
+
+        def normalize(value: Any) -> Any:
+            if not isinstance(value, dict):
+                return value
+            return {k: item_normalizer(item) if item is not None else item for k, item in value.items()}
+
+    return {**schema, key: item_schema}, normalize
+
+
+def _compile(
+    schema: CoreSchema,
+) -> Tuple[CoreSchema, Optional[Normalizer]]:
+    """
+    Compile a core schema for raw values normalized upfront
+    * EmptyStrToNone union choices are removed (Union[EmptyStrToNone, X] -> Optional[X])
+    * returns the compiled schema and a function normalizing raw values ("", "null", "None" -> None)
+      for these fields (None if nothing to normalize)
+    Anything not known to be normalized (e.g. input of other validators) keeps its original schema.
+    """
+    schema_type = schema.get("type")
+    if schema_type == "union":
+        return _compile_union(schema)
+    if schema_type == "model":
+        if schema.get("root_model"):
+            return schema, None
+        inner, normalizer = _compile(schema["schema"])
+        return {**schema, "schema": inner}, normalizer
+    if schema_type == "model-fields":
+        return _compile_model_fields(schema)
+    if schema_type in ("default", "nullable"):
+        inner, normalizer = _compile(schema["schema"])
+        return {**schema, "schema": inner}, normalizer
+    if schema_type == "list":
+        return _compile_container(schema, "items_schema")
+    if schema_type == "dict":
+        return _compile_container(schema, "values_schema")
+    # e.g. function validators (input is not the raw value), definitions, scalars
+    return schema, None
+
+
+class _FastParser:
+    """compiled validator and normalizer of a single model class"""
+
+    def __init__(self, model: Type[BaseModel]) -> None:
+        if not model.__pydantic_complete__:
+            model.model_rebuild()  # build deferred schema (see DEFER_BUILD)
+        schema, self.normalize = _compile(copy.deepcopy(model.__pydantic_core_schema__))
+        self.validator = SchemaValidator(schema)
+
+    def validate(self, obj: Any) -> Any:
+        if self.normalize is not None:
+            obj = self.normalize(obj)
+        return self.validator.validate_python(obj)
+
+
+_parsers: Dict[Type[BaseModel], _FastParser] = {}
+_parsers_lock = threading.Lock()
+_fast_parse_enabled = False
+
+
+def _parser(model: Type[BaseModel]) -> _FastParser:
+    parser = _parsers.get(model)
+    if parser is None:
+        with _parsers_lock:
+            parser = _parsers.get(model)
+            if parser is None:
+                parser = _parsers[model] = _FastParser(model)
+    return parser
+
+
+def fast_validate(model: Type[M], obj: Any) -> M:
+    """
+    Validate raw JSON `obj` as `model` - same result as model.model_validate(obj), but faster for large responses
+
+    Most fields are typed `Union[EmptyStrToNone, X]`, which runs a Python validator on every single value
+    (raising and catching an exception for every non-empty value).
+    Instead, raw values ("", "null", "None") are normalized to None in a single pass over `obj`,
+    then `obj` is validated by a compiled schema using `Optional[X]` for these fields.
+    The compiled schema is created on first use per model.
+    """
+    return _parser(model).validate(obj)
+
+
+def normalize(model: Type[BaseModel], obj: Any) -> Any:
+    """
+    Raw JSON `obj` with empty values ("", "null", "None") of `model`'s EmptyStrToNone fields replaced by None
+    (`obj` is not modified)
+    """
+    normalizer = _parser(model).normalize
+    return obj if normalizer is None else normalizer(obj)
+
+
+def enable_fast_parse(enabled: bool = True) -> None:
+    """
+    Use fast_validate() for all responses (ApiModel.model_validate()) - models returned are identical
+
+    Usage:
+        from growatt_public_api.pydantic_models import enable_fast_parse
+        enable_fast_parse()
+    """
+    global _fast_parse_enabled
+    _fast_parse_enabled = enabled
+
+
+def fast_parse_enabled() -> bool:
+    return _fast_parse_enabled
@@ -0,0 +1,198 @@
+import contextlib
+import contextvars
+import inspect
+import threading
+import typing
+from typing import Optional, Any, Dict, Tuple, Type, TypeVar, Generic, Iterator
+from pydantic import BaseModel, TypeAdapter
+from pydantic.fields import FieldInfo
+
+M = TypeVar("M", bound=BaseModel)
+
+_MISSING = object()
+
+# return LazyModel from ApiModel.model_validate() (see lazy_validation())
+_lazy_validation: contextvars.ContextVar[bool] = contextvars.ContextVar("lazy_validation", default=False)
+
+
+def _model_type(annotation: Any) -> Tuple[Optional[str], Optional[Type[BaseModel]]]:
+    """
+    (kind, model) of a field returned lazily
+    * ("model", Model) for Model, Optional[Model], Union[EmptyStrToNone, Model]
+    * ("list", Model) for List[Model]
+    * ("dict_list", Model) for Dict[str, List[Model]] (e.g. responses of v4 *_multiple() endpoints)
+    * (None, None) for anything else (validated on access)
+    """
+    types = [annotation]
+    if typing.get_origin(annotation) is typing.Union:
+        # EmptyStrToNone / None
+        types = [
+            t
+            for t in typing.get_args(annotation)
+            if typing.get_origin(t) is not typing.Annotated and t is not type(None)
+        ]
+    if len(types) != 1:
+        return None, None
+    type_ = types[0]
+    origin, args = typing.get_origin(type_), typing.get_args(type_)
+    if inspect.isclass(type_) and issubclass(type_, BaseModel):
+        return "model", type_
+    if origin is list and inspect.isclass(args[0]) and issubclass(args[0], BaseModel):
+        return "list", args[0]
+    if origin is dict and typing.get_origin(args[1]) is list:
+        item_type = typing.get_args(args[1])[0]
+        if inspect.isclass(item_type) and issubclass(item_type, BaseModel):
+            return "dict_list", item_type
+    return None, None
+
+
+class _FieldAccessor:
+    """validates the raw value of a single field"""
+
+    def __init__(self, name: str, field: FieldInfo) -> None:
+        self.name = name
+        self.field = field
+        self.keys = (field.alias, name) if field.alias and field.alias != name else (name,)
+        self.kind, self.model = _model_type(field.annotation)
+        self._adapter: Optional[TypeAdapter] = None
+
+    @property
+    def adapter(self) -> TypeAdapter:
+        if self._adapter is None:
+            annotation = self.field.annotation
+            if self.field.metadata:
+                annotation = typing.Annotated[(annotation, *self.field.metadata)]
+            self._adapter = TypeAdapter(annotation)
+        return self._adapter
+
+    def raw_value(self, raw: dict) -> Any:
+        for key in self.keys:
+            if key in raw:
+                return raw[key]
+        return _MISSING
+
+    def value(self, raw_value: Any) -> Any:
+        if self.kind == "model" and isinstance(raw_value, dict):
+            return LazyModel(self.model, raw_value)
+        if self.kind == "list" and isinstance(raw_value, list) and all(isinstance(v, dict) for v in raw_value):
+            return [LazyModel(self.model, v) for v in raw_value]
+        if (
+            self.kind == "dict_list"
+            and isinstance(raw_value, dict)
+            and all(isinstance(v, list) and all(isinstance(i, dict) for i in v) for v in raw_value.values())
+        ):
+            return {key: [LazyModel(self.model, v) for v in values] for key, values in raw_value.items()}
+        return self.adapter.validate_python(raw_value)
+
+
+_accessors: Dict[Type[BaseModel], Dict[str, _FieldAccessor]] = {}
+_accessors_lock = threading.Lock()
+
+
+def _field_accessors(model: Type[BaseModel]) -> Dict[str, _FieldAccessor]:
+    accessors = _accessors.get(model)
+    if accessors is None:
+        with _accessors_lock:
+            accessors = _accessors.get(model)
+            if accessors is None:
+                # aliases are set when the model is built (see DEFER_BUILD)
+                if not model.__pydantic_complete__:
+                    model.model_rebuild()
+                accessors = {name: _FieldAccessor(name, field) for name, field in model.model_fields.items()}
+                if model.__pydantic_complete__:
+                    _accessors[model] = accessors
+    return accessors
+
+
+class LazyModel(Generic[M]):
+    """
+    Lazily validated model: keeps the raw JSON and validates each field on first access (cached afterwards)
+
+    Attributes have the same names and types as `model`.
+    Nested models (and lists of models) are returned as LazyModel as well.
+    to_model() validates all fields and returns the `model` instance.
+
+    Usage:
+        history = lazy_validate(MinEnergyHistory, response)
+        for data in history.data.datas:
+            print(data.time, data.ppv)  # only these fields are validated
+
+        with lazy_validation():
+            history = api.min.energy_history(device_sn="BZP0000000")  # returns LazyModel[MinEnergyHistory]
+    """
+
+    __slots__ = ("_model", "_raw", "_values")
+
+    def __init__(self, model: Type[M], raw: dict) -> None:
+        object.__setattr__(self, "_model", model)
+        object.__setattr__(self, "_raw", raw)
+        object.__setattr__(self, "_values", {})
+
+    @property
+    def model_class(self) -> Type[M]:
+        return self._model
+
+    @property
+    def raw(self) -> dict:
+        return self._raw
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        values = self._values
+        if name in values:
+            return values[name]
+        accessor = _field_accessors(self._model).get(name)
+        if accessor is None:
+            raise AttributeError(f"'{self._model.__name__}' object has no attribute '{name}'")
+        raw_value = accessor.raw_value(self._raw)
+        if raw_value is _MISSING:
+            if accessor.field.is_required():
+                self.to_model()  # raises ValidationError
+            value = accessor.field.get_default(call_default_factory=True)
+        else:
+            value = accessor.value(raw_value)
+        values[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"'{self._model.__name__}' is read-only")
+
+    def __dir__(self) -> Iterator[str]:
+        return iter([*super().__dir__(), *self._model.model_fields])
+
+    def __repr__(self) -> str:
+        return f"LazyModel[{self._model.__name__}]({self._raw!r})"
+
+    def to_model(self) -> M:
+        """validate all fields"""
+        with lazy_validation(False):
+            return self._model.model_validate(self._raw)
+
+
+def lazy_validate(model: Type[M], obj: dict) -> LazyModel[M]:
+    """
+    Wrap raw JSON `obj` as LazyModel - fields are validated on first access
+    """
+    return LazyModel(model, obj)
+
+
+@contextlib.contextmanager
+def lazy_validation(enabled: bool = True) -> Iterator[None]:
+    """
+    Return LazyModel instead of models for responses retrieved within this context (ApiModel.model_validate())
+
+    Usage:
+        with lazy_validation():
+            history = api.min.energy_history(device_sn="BZP0000000")
+        print(history.data.datas[0].ppv)
+    """
+    token = _lazy_validation.set(enabled)
+    try:
+        yield
+    finally:
+        _lazy_validation.reset(token)
+
+
+def lazy_validation_enabled() -> bool:
+    return _lazy_validation.get()
@@ -0,0 +1,59 @@
+import contextlib
+import contextvars
+from typing import Iterator, Type
+from pydantic import BaseModel
+from .api_model import NewApiResponse
+from .fast_parse import normalize
+from .lazy_model import lazy_validation
+
+# return raw JSON from ApiModel.model_validate() (see raw_responses())
+_raw_responses: contextvars.ContextVar[bool] = contextvars.ContextVar("raw_responses", default=False)
+
+
+def raw_response(model: Type[BaseModel], obj: dict) -> dict:
+    """
+    Normalized raw JSON of a response, without creating any models
+    * empty values ("", "null", "None") of `model`'s fields are replaced by None (same as validating `model`)
+    * "code"/"message" of v4 responses are renamed to "error_code"/"error_msg" (same as NewApiResponse)
+    * everything else is returned as received from the API (e.g. camelCase keys)
+    """
+    obj = normalize(model, obj)
+    if issubclass(model, NewApiResponse):
+        renamed = {"code": "error_code", "message": "error_msg"}
+        obj = {renamed.get(key, key): value for key, value in obj.items()}
+    return obj
+
+
+@contextlib.contextmanager
+def raw_responses(enabled: bool = True) -> Iterator[None]:
+    """
+    Return normalized raw JSON (dict) instead of models for responses retrieved within this context
+    (see raw_response()). Error codes are handled the same way as for models.
+
+    Helpers combining multiple responses (e.g. iter_...(), device.get_device_type()) still use models.
+
+    Usage:
+        with raw_responses():
+            history = api.min.energy_history(device_sn="BZP0000000")
+        if history["error_code"] == 0:
+            write_to_db(history["data"]["datas"])
+    """
+    token = _raw_responses.set(enabled)
+    try:
+        yield
+    finally:
+        _raw_responses.reset(token)
+
+
+def raw_responses_enabled() -> bool:
+    return _raw_responses.get()
+
+
+@contextlib.contextmanager
+def model_responses() -> Iterator[None]:
+    """
+    Return models for responses retrieved within this context, regardless of raw_responses() or lazy_validation()
+    (used by helpers relying on models)
+    """
+    with raw_responses(False), lazy_validation(False):
+        yield
@@ -1 +1,16 @@
-from .growatt_api_session import GrowattApiSession  # noqa: F401
+from ..lazy_imports import lazy_attributes
+
+# imported on first access (e.g. sync-only applications do not need aiohttp)
+_IMPORTS = {
+    ".growatt_api_session": ["GrowattApiSession"],
+    ".async_growatt_api_session": ["AsyncGrowattApiSession"],
+    ".rate_limiter": ["RateLimiter", "RateLimit"],
+    ".response_cache": ["ResponseCache"],
+    ".connection": ["ConnectionSettings"],
+    ".retry": ["RetryPolicy"],
+    ".fingerprint": ["request_fingerprint"],
+    ".single_flight": ["SingleFlight", "AsyncSingleFlight"],
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _IMPORTS)
+__all__ = [name for names in _IMPORTS.values() for name in names]
@@ -0,0 +1,346 @@
+import asyncio
+import contextvars
+import functools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Literal, List, Set, Tuple, Callable, Any
+from loguru import logger
+
+from .connection import ConnectionSettings
+from .fingerprint import encode_form
+from .growatt_api_session import BaseGrowattApiSession
+from .rate_limiter import RateLimiter
+from .response_cache import ResponseCache
+from .retry import RetryPolicy
+from .single_flight import AsyncSingleFlight
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency
+    aiohttp = None
+
+
+class AsyncGrowattApiSession(BaseGrowattApiSession):
+    """
+    asyncio session based on aiohttp
+
+    Same contract as GrowattApiSession, but get(), post() and request() are coroutines.
+    Cache I/O (files / sqlite) is done in worker threads, so it does not block the event loop.
+    Requires optional dependency "aiohttp" (pip install growatt-public-api[async])
+
+    Usage:
+        async with AsyncGrowattApiSession(token="your_token") as session:
+            response = await session.post(endpoint="new-api/queryDeviceList")
+    """
+
+    session: Optional["aiohttp.ClientSession"] = None
+    transport_errors = (aiohttp.ClientConnectionError, asyncio.TimeoutError) if aiohttp else ()
+
+    def __init__(
+        self,
+        token: str,
+        server_url: Optional[str] = None,
+        use_cache: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = True,
+        connection: Optional[ConnectionSettings] = None,
+        retry: Optional[RetryPolicy] = None,
+    ) -> None:
+        if aiohttp is None:
+            raise ImportError("AsyncGrowattApiSession requires 'aiohttp' (pip install growatt-public-api[async])")
+        super().__init__(
+            token=token,
+            server_url=server_url,
+            use_cache=use_cache,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            coalesce_requests=coalesce_requests,
+            connection=connection,
+            retry=retry,
+        )
+        self.single_flight = AsyncSingleFlight()
+        self._revalidations: Set[asyncio.Task] = set()
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        # aiohttp.ClientSession must be created inside a running event loop, so it is created on first request
+        self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _client_session(self) -> "aiohttp.ClientSession":
+        if self.session is None or self.session.closed:
+            settings = self.connection
+            connector = aiohttp.TCPConnector(
+                # pool_block=False: no limit (aiohttp always waits for a free connection if the limit is reached)
+                limit=settings.pool_maxsize if settings.pool_block else 0,
+                limit_per_host=settings.pool_maxsize if settings.pool_block else 0,
+                force_close=not settings.keep_alive,
+                keepalive_timeout=settings.keep_alive_timeout if settings.keep_alive else None,
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=None, sock_connect=settings.connect_timeout, sock_read=settings.read_timeout
+            )
+            self.session = aiohttp.ClientSession(headers={"token": self.token}, connector=connector, timeout=timeout)
+        return self.session
+
+    async def close(self) -> None:
+        """
+        Close the underlying aiohttp session (and its connection pool), cancelling pending background refreshes
+        """
+        for task in list(self._revalidations):
+            task.cancel()
+        if self._revalidations:
+            await asyncio.gather(*self._revalidations, return_exceptions=True)
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False)
+            self._thread_pool = None
+
+    async def run_sync(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run blocking code in a worker thread - escape hatch for sync code which can not be awaited
+        (e.g. AsyncDevice.get_device_type(), which walks the device lists page by page using a sync API)
+
+        Context variables (e.g. raw_responses()) are passed to the worker thread.
+        The worker threads are not shared with asyncio's default executor (used for cache I/O),
+        so waiting for requests of this session can not starve it.
+        """
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.connection.pool_maxsize, thread_name_prefix="growatt-async-api"
+            )
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._thread_pool, functools.partial(context.run, func, *args, **kwargs)
+        )
+
+    async def _cache_io(self, func: Callable[..., Any], **kwargs) -> Any:
+        """
+        Run func in a worker thread if it accesses the cache (files / sqlite must not block the event loop)
+        """
+        if self.cache and kwargs.get("use_cache", True):
+            return await asyncio.to_thread(func, **kwargs)
+        return func(**kwargs)
+
+    async def get(
+        self,
+        endpoint: Optional[str] = None,
+        params: Optional[dict] = None,
+    ):
+        return await self.request(
+            endpoint=endpoint,
+            method="GET",
+            params=params,
+        )
+
+    async def post(
+        self,
+        endpoint: Optional[str] = None,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ):
+        return await self.request(
+            endpoint=endpoint,
+            method="POST",
+            params=params,
+            data=data,
+        )
+
+    async def request(
+        self,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        use_cache: bool = True,
+    ):
+        """
+        Perform a request to the Growatt API
+        """
+        url = self._url(endpoint)
+        coalesce_key = self._coalesce_key(
+            url=url, endpoint=endpoint, method=method, params=params, data=data, use_cache=use_cache
+        )
+        if coalesce_key is None:
+            return await self._request(
+                url=url, endpoint=endpoint, method=method, params=params, data=data, use_cache=use_cache
+            )
+        return await self.single_flight.do(
+            coalesce_key,
+            lambda: self._request(
+                url=url, endpoint=endpoint, method=method, params=params, data=data, use_cache=use_cache
+            ),
+        )
+
+    async def request_many(self, requests_: List[dict], max_workers: int = 8) -> List[dict]:
+        """
+        Perform multiple requests concurrently
+
+        Args:
+            requests_ (List[dict]): keyword arguments for request() for each request
+            max_workers (int): max number of concurrent requests
+
+        Returns:
+            List[dict]: responses in same order as requests
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def request_(kwargs: dict) -> dict:
+            async with semaphore:
+                return await self.request(**kwargs)
+
+        return list(await asyncio.gather(*[request_(kwargs) for kwargs in requests_]))
+
+    async def _request(
+        self,
+        url: str,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        use_cache: bool = True,
+    ):
+        cached_data, stale = await self._cache_io(
+            self._cached_response,
+            url=url,
+            endpoint=endpoint,
+            method=method,
+            params=params,
+            data=data,
+            use_cache=use_cache,
+        )
+        if cached_data is not None:
+            if stale:
+                self._revalidate(url=url, endpoint=endpoint, method=method, params=params, data=data)
+            return cached_data
+        return await self._fetch(
+            url=url, endpoint=endpoint, method=method, params=params, data=data, use_cache=use_cache
+        )
+
+    def _revalidate(
+        self,
+        url: str,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ) -> None:
+        """
+        Refresh an outdated cached response by a background task (stale-while-revalidate)
+
+        The refresh is sent like a forced request (use_cache=False), so it is coalesced with identical foreground requests.
+        """
+        key = self._revalidate_key(url=url, method=method, params=params, data=data)
+        if not self._start_revalidation(key):
+            return
+
+        async def refresh() -> None:
+            try:
+                json_data = await self.request(
+                    endpoint=endpoint, method=method, params=params, data=data, use_cache=False
+                )
+                await asyncio.to_thread(
+                    self._store_revalidated,
+                    json_data=json_data,
+                    url=url,
+                    endpoint=endpoint,
+                    method=method,
+                    params=params,
+                    data=data,
+                )
+            except Exception as e:
+                logger.warning(f"Background refresh of request to {endpoint} failed: {e}")
+            finally:
+                self._end_revalidation(key)
+
+        # keep a reference - tasks are only weakly referenced by the event loop
+        task = asyncio.create_task(refresh())
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+
+    async def _fetch(
+        self,
+        url: str,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        use_cache: bool = True,
+    ):
+        """
+        Send a request (applying rate limiter and retry policy) and process its response
+        """
+        deadline_at = self._deadline_at()
+        attempt = 0
+        while True:
+            wait = self._reserve_rate_limit(endpoint=endpoint, params=params, data=data)
+            if wait is None:
+                return await self._cache_io(
+                    self._process_response,
+                    json_data=self._rate_limited_response(endpoint=endpoint),
+                    url=url,
+                    endpoint=endpoint,
+                    method=method,
+                    params=params,
+                    data=data,
+                    use_cache=use_cache,
+                )
+            if wait:
+                await asyncio.sleep(wait)
+
+            try:
+                async with self._client_session().request(
+                    method,
+                    url=url,
+                    params=encode_form(params),
+                    data=encode_form(data),
+                ) as response:
+                    status = response.status
+                    response_text = await response.text()
+            except self.transport_errors as e:
+                delay = self._retry_delay(attempt, deadline_at, endpoint=endpoint, params=params, data=data, error=e)
+                if delay is None:
+                    raise
+            else:
+                json_data, json_error = self._decode_json(response_text)
+                delay = self._retry_delay(
+                    attempt,
+                    deadline_at,
+                    endpoint=endpoint,
+                    params=params,
+                    data=data,
+                    status=status,
+                    json_data=json_data,
+                )
+                if delay is None:
+                    if json_error is not None:
+                        logger.error(f"JSON conversion failed: {json_error}\nResponse was:\n{response_text}")
+                        raise json_error
+                    return await self._cache_io(
+                        self._process_response,
+                        json_data=json_data,
+                        url=url,
+                        endpoint=endpoint,
+                        method=method,
+                        params=params,
+                        data=data,
+                        use_cache=use_cache,
+                    )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _decode_json(self, response_text: str) -> Tuple[Optional[dict], Optional[ValueError]]:
+        """
+        json-decoded response (checked for retry and processed), or the decoding error if it is not valid JSON
+        """
+        self._check_login_page(response_text)
+        try:
+            return json.loads(response_text), None
+        except ValueError as e:
+            return None, e
@@ -0,0 +1,50 @@
+from typing import Optional, NamedTuple, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ConnectionSettings(NamedTuple):
+    """
+    Connection pool, timeout and keep-alive settings of a session
+
+    pool_maxsize: max number of connections kept open to the server
+        (should be >= max number of concurrent requests, e.g. request_many(max_workers=...))
+    pool_block: if the pool is exhausted, wait for a free connection (True) or open an additional one (False)
+        additional connections are closed after the request instead of being returned to the pool
+    connect_timeout: seconds to wait for establishing a connection (None = wait forever)
+    read_timeout: seconds to wait for the server sending data (None = wait forever)
+    keep_alive: reuse connections for subsequent requests (False = new connection for each request)
+    keep_alive_timeout: seconds an idle connection is kept open (asyncio only - requests keeps them until closed)
+    """
+
+    pool_maxsize: int = 32
+    pool_block: bool = False
+    connect_timeout: Optional[float] = 10.0
+    read_timeout: Optional[float] = 60.0
+    keep_alive: bool = True
+    keep_alive_timeout: Optional[float] = 30.0
+
+    @property
+    def timeout(self) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """
+        timeout as used by requests
+        """
+        if self.connect_timeout is None and self.read_timeout is None:
+            return None
+        return self.connect_timeout, self.read_timeout
+
+
+def requests_session(token: str, settings: ConnectionSettings) -> requests.Session:
+    """
+    requests.Session using a connection pool as configured by settings
+    """
+    session = requests.Session()
+    # all requests go to a single host, so one pool is sufficient
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.pool_maxsize, pool_block=settings.pool_block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    headers = {"token": token}
+    if not settings.keep_alive:
+        headers["Connection"] = "close"
+    session.headers.update(headers)
+    return session
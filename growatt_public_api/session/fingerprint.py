@@ -0,0 +1,61 @@
+import hashlib
+import json
+from typing import Optional, List, Tuple, Any
+
+
+def _encode_value(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return str(value)
+
+
+def encode_form(values: Optional[dict]) -> Optional[List[Tuple[str, str]]]:
+    """
+    Encode params/data the same way requests does
+    * drop None values
+    * expand lists to multiple key/value pairs
+    * convert everything else to str
+    """
+    if values is None:
+        return None
+    encoded = []
+    for key, value in values.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            encoded.extend((str(key), _encode_value(v)) for v in value if v is not None)
+        else:
+            encoded.append((str(key), _encode_value(value)))
+    return encoded
+
+
+def canonical_form(values: Optional[dict]) -> List[Tuple[str, str]]:
+    """
+    Encoded params/data independent of dict order
+    e.g. {"b": 2, "a": None, "c": [1, 2]} and {"c": ["1", "2"], "b": "2"} -> [("b", "2"), ("c", "1"), ("c", "2")]
+    (order of list values is kept)
+    """
+    return sorted(encode_form(values) or [], key=lambda pair: pair[0])
+
+
+def request_fingerprint(
+    url: str,
+    method: str = "GET",
+    params: Optional[dict] = None,
+    data: Optional[dict] = None,
+    token: Optional[str] = None,
+) -> str:
+    """
+    Canonical key identifying a request - equal for all requests sending the same data to the server
+
+    Used as key for caching and coalescing of requests.
+    Token is included as hash only, so different accounts never share cached responses.
+    """
+    args_ = {
+        "url": url,
+        "method": method.upper(),
+        "params": canonical_form(params),
+        "data": canonical_form(data),
+        "token": hashlib.sha256(token.encode()).hexdigest() if token else None,
+    }
+    return hashlib.md5(json.dumps(args_, separators=(",", ":")).encode()).hexdigest()
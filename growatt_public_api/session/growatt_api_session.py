@@ -1,21 +1,38 @@
-import hashlib
-import json
-import pickle
-import tempfile
-from datetime import timedelta, datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from pathlib import Path
-from typing import Optional, Literal, Self
+from typing import Optional, Literal, Self, List, Tuple, Type, Set
 from loguru import logger
 import requests
 
+from .connection import ConnectionSettings, requests_session
+from .fingerprint import request_fingerprint
+from .rate_limiter import RateLimiter
+from .response_cache import ResponseCache, WRITE_ENDPOINTS
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
+
+
+class BaseGrowattApiSession:
+    """
+    Transport-independent part of a Growatt API session (URLs, token, cache, error code handling).
+    Use GrowattApiSession (blocking) or AsyncGrowattApiSession (asyncio) instead.
+    """
 
-class GrowattApiSession:
     server_url: str
     api_url: str
     token: str
-    session: requests.Session
     cache_folder: Path = None
     max_cache_age: timedelta = timedelta(days=1)
+    cache: Optional[ResponseCache] = None
+    coalesce_requests: bool = True
+    rate_limiter: Optional[RateLimiter] = None
+    connection: ConnectionSettings = ConnectionSettings()
+    retry: Optional[RetryPolicy] = None
+    # exceptions of the transport considered transient (retried by RetryPolicy)
+    transport_errors: Tuple[Type[Exception], ...] = ()
     """
     https://www.showdoc.com.cn/262556420217021/0
     """
@@ -25,6 +42,11 @@ class GrowattApiSession:
         token: str,
         server_url: Optional[str] = None,
         use_cache: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = True,
+        connection: Optional[ConnectionSettings] = None,
+        retry: Optional[RetryPolicy] = None,
     ) -> None:
         self.server_url = server_url or "https://openapi.growatt.com"
         # API docs specify /v1/ for some endpoints and /v4/ for other ("new-api") endpoints
@@ -35,25 +57,24 @@ class GrowattApiSession:
 
         assert self.token, "No token provided"
 
-        self.session = requests.Session()
-        headers = {"token": self.token}
-        self.session.headers.update(headers)
+        self.rate_limiter = rate_limiter
+        # identical concurrent requests share one request to the server
+        self.coalesce_requests = coalesce_requests
+        # connection pool, timeouts and keep-alive
+        self.connection = connection or ConnectionSettings()
+        # retry transport errors, server errors and rate limited requests
+        self.retry = retry
+        # background refreshes of outdated cached responses in flight (stale-while-revalidate)
+        self._revalidating: Set[str] = set()
+        self._revalidating_lock = threading.Lock()
 
         # setup cache
         if use_cache:
-            # set cache folder to TMP/growatt_public_api_cache
-            self.cache_folder = Path(tempfile.gettempdir()) / "growatt_public_api_cache"
-            self.cache_folder.mkdir(parents=True, exist_ok=True)
-            # clean outdated pickle files
-            cache_expires = datetime.now() - self.max_cache_age
-            for pickle_file in self.cache_folder.glob("*.pickle"):
-                mtime = datetime.fromtimestamp(pickle_file.stat().st_mtime)
-                if mtime < cache_expires:
-                    # Deleting outdated cache file
-                    try:
-                        pickle_file.unlink()
-                    except OSError:
-                        logger.debug(f"Failed to delete outdated cache file: {pickle_file}")
+            # defaults to TMP/growatt_public_api_cache
+            self.cache = cache or ResponseCache(max_age=self.max_cache_age)
+            self.cache_folder = self.cache.folder
+            self.max_cache_age = self.cache.max_age
+            # outdated responses are deleted incrementally by the cache (see ResponseCache.maybe_cleanup)
 
     @classmethod
     def using_test_server_v1(cls) -> Self:
@@ -116,6 +137,279 @@ class GrowattApiSession:
         error_message = error_codes.get(code, "")
         return error_message
 
+    def _url(self, endpoint: Optional[str] = None) -> str:
+        url = f"{self.api_url}"
+        if endpoint:
+            url = f"{url}/{endpoint}"
+        return url
+
+    def fingerprint(
+        self,
+        url: str,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ) -> str:
+        """
+        Canonical key of a request (independent of parameter order, None values and value types)
+        """
+        return request_fingerprint(url=url, method=method, params=params, data=data, token=self.token)
+
+    def _coalesce_key(
+        self,
+        url: str,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        use_cache: bool = True,
+    ) -> Optional[str]:
+        """
+        Key for coalescing identical concurrent requests, or None if the request must not be coalesced (settings)
+        """
+        if not self.coalesce_requests or endpoint in WRITE_ENDPOINTS:
+            return None
+        return f"{self.fingerprint(url=url, method=method, params=params, data=data)}:{use_cache}"
+
+    def _reserve_rate_limit(
+        self,
+        endpoint: Optional[str] = None,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ) -> Optional[float]:
+        """
+        Returns seconds to wait before sending the request, or None if the request must not be sent
+        """
+        if self.rate_limiter is None:
+            return 0.0
+        return self.rate_limiter.reserve(endpoint=endpoint, params=params, data=data)
+
+    def _rate_limited_response(self, endpoint: Optional[str] = None) -> dict:
+        """
+        Response for requests rejected by rate limiter - same as returned by the API
+        """
+        if endpoint and endpoint.startswith("new-api/"):
+            return {"code": 102, "message": self.generic_response_message(102), "data": None}
+        return {"error_code": 10012, "error_msg": self.generic_error_message(10012), "data": None}
+
+    def _cached_response(
+        self,
+        url: str,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        use_cache: bool = True,
+    ) -> Tuple[Optional[dict], bool]:
+        """
+        Cached response to return instead of sending the request ("read-through" cache mode only)
+        and whether it is outdated and has to be refreshed in background (stale-while-revalidate)
+        """
+        if not (self.cache and use_cache and self.cache.mode == "read-through"):
+            return None, False
+        ttl = self.cache.ttl(endpoint=endpoint, params=params, data=data)
+        if not ttl:
+            return None, False
+        cache_key = self.fingerprint(url=url, method=method, params=params, data=data)
+        entry = self.cache.load_with_age(cache_key, max_age=ttl + self.cache.stale_while_revalidate)
+        if entry is None or not self.cache.is_success(entry[0]):
+            return None, False
+        json_data, age = entry
+        json_data["cacheAge"] = age
+        stale = age > ttl.total_seconds()
+        logger.debug(f"Using {'outdated' if stale else 'cached'} version of request to {endpoint} ({age:.0f}s old)")
+        return json_data, stale
+
+    def _revalidate_key(
+        self,
+        url: str,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ) -> str:
+        """
+        Key for coalescing background refreshes of a cached response (one refresh in flight per request)
+        """
+        return f"{self.fingerprint(url=url, method=method, params=params, data=data)}:revalidate"
+
+    def _start_revalidation(self, key: str) -> bool:
+        """
+        Returns False if a background refresh for this key is already in flight
+        """
+        with self._revalidating_lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def _end_revalidation(self, key: str) -> None:
+        with self._revalidating_lock:
+            self._revalidating.discard(key)
+
+    def _store_revalidated(
+        self,
+        json_data: dict,
+        url: str,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ) -> None:
+        """
+        Cache the response of a background refresh
+
+        Errors do not replace the outdated response, which is still served until the grace window has passed.
+        """
+        if not self.cache.is_success(json_data):
+            logger.warning(f"Background refresh of request to {endpoint} failed - keeping outdated response")
+            return
+        self.cache.store(self.fingerprint(url=url, method=method, params=params, data=data), json_data)
+
+    def _deadline_at(self) -> Optional[float]:
+        """
+        time.monotonic() at which retries of a call started now are given up
+        """
+        return self.retry.deadline_at() if self.retry else None
+
+    def _retry_delay(
+        self,
+        attempt: int,
+        deadline_at: Optional[float],
+        endpoint: Optional[str] = None,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        status: Optional[int] = None,
+        json_data: Optional[dict] = None,
+        error: Optional[Exception] = None,
+    ) -> Optional[float]:
+        """
+        Seconds to wait before retrying a failed attempt, or None if the result is final (success or give up)
+        """
+        if self.retry is None:
+            return None
+        rate_limited = json_data is not None and (json_data.get("error_code") == 10012 or json_data.get("code") == 102)
+        if error is not None:
+            reason = f"{type(error).__name__}: {error}"
+        elif status in self.retry.retry_statuses:
+            reason = f"HTTP status {status}"
+        elif rate_limited and self.retry.retry_rate_limited:
+            reason = "API rate limit exceeded"
+        else:
+            return None
+        if endpoint in WRITE_ENDPOINTS and not rate_limited and not self.retry.retry_writes:
+            return None
+        delay = self.retry.delay(
+            attempt=attempt,
+            deadline_at=deadline_at,
+            endpoint=endpoint,
+            params=params,
+            data=data,
+            rate_limited=rate_limited,
+        )
+        if delay is None:
+            logger.warning(f"Request to {endpoint} failed ({reason}) - giving up after {attempt + 1} attempt(s)")
+        else:
+            logger.warning(f"Request to {endpoint} failed ({reason}) - retrying in {delay:.1f}s")
+        return delay
+
+    @staticmethod
+    def _check_login_page(response_text: str) -> None:
+        if '<html data-name="login">' in response_text:
+            logger.error("Login page shown")
+        elif ("Note: Dear user, you have not login to the system, skip login page login.." in response_text) or (
+            '<a href="/login" target="_top" id="login">' in response_text
+        ):
+            logger.error("Forwarded to login page")
+
+    def _process_response(
+        self,
+        json_data: dict,
+        url: str,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        use_cache: bool = True,
+    ) -> dict:
+        """
+        Handle caching and normalize error messages of a (json-decoded) API response
+        """
+        # check error code
+        error_code = json_data.get("error_code")
+        error_code_new = json_data.get("code")
+        if self.cache and use_cache:
+            cache_key = self.fingerprint(url=url, method=method, params=params, data=data)
+            if error_code == 10012 or error_code_new == 102:
+                # check if we have a cached version of this request and return it
+                cached_entry = self.cache.load_with_age(cache_key)
+                if cached_entry is not None:
+                    logger.warning(f"API limit exceeded. Using cached version of request to {endpoint}")
+                    json_data, age = cached_entry
+                    json_data["cacheAge"] = age
+            else:
+                # cache the response
+                self.cache.store(cache_key, json_data)
+
+            # recalculate as data might have been loaded from cache
+            error_code = json_data.get("error_code")
+            error_code_new = json_data.get("code")
+
+        if error_code:
+            error_msg = json_data.get("error_msg")
+            generic_error_msg = self.generic_error_message(error_code)
+            if not error_msg:
+                json_data["error_msg"] = generic_error_msg
+            error_log = f"request failed with error code {error_code}: {error_msg}"
+            if generic_error_msg:
+                error_log += f" ({generic_error_msg})"
+            logger.warning(error_log)
+
+        if error_code_new:
+            error_msg = json_data.get("message")
+            generic_error_msg = self.generic_response_message(error_code_new)
+            if not error_msg:
+                json_data["message"] = generic_error_msg
+            error_log = f"request failed with error code {error_code_new}: {error_msg}"
+            if generic_error_msg:
+                error_log += f" ({generic_error_msg})"
+            logger.warning(error_log)
+
+        return json_data
+
+
+class GrowattApiSession(BaseGrowattApiSession):
+    """
+    Blocking session based on requests
+    """
+
+    session: requests.Session
+    transport_errors = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(
+        self,
+        token: str,
+        server_url: Optional[str] = None,
+        use_cache: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = True,
+        connection: Optional[ConnectionSettings] = None,
+        retry: Optional[RetryPolicy] = None,
+    ) -> None:
+        super().__init__(
+            token=token,
+            server_url=server_url,
+            use_cache=use_cache,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            coalesce_requests=coalesce_requests,
+            connection=connection,
+            retry=retry,
+        )
+        self.single_flight = SingleFlight()
+
+        self.session = requests_session(token=self.token, settings=self.connection)
+
     def get(
         self,
         endpoint: Optional[str] = None,
@@ -140,7 +434,7 @@ class GrowattApiSession:
             data=data,
         )
 
-    def request(  # noqa: C901 'GrowattApiSession.request' is too complex (12)
+    def request(
         self,
         endpoint: Optional[str] = None,
         method: Literal["GET", "POST"] = "GET",
@@ -151,71 +445,159 @@ class GrowattApiSession:
         """
         Perform a request to the Growatt API
         """
-        url = f"{self.api_url}"
-        if endpoint:
-            url = f"{url}/{endpoint}"
-        response = self.session.request(
-            method,
-            url=url,
-            params=params,
-            data=data,
+        url = self._url(endpoint)
+        coalesce_key = self._coalesce_key(
+            url=url, endpoint=endpoint, method=method, params=params, data=data, use_cache=use_cache
+        )
+        if coalesce_key is None:
+            return self._request(
+                url=url, endpoint=endpoint, method=method, params=params, data=data, use_cache=use_cache
+            )
+        return self.single_flight.do(
+            coalesce_key,
+            lambda: self._request(
+                url=url, endpoint=endpoint, method=method, params=params, data=data, use_cache=use_cache
+            ),
         )
 
-        if '<html data-name="login">' in response.text:
-            logger.error("Login page shown")
-        elif ("Note: Dear user, you have not login to the system, skip login page login.." in response.text) or (
-            '<a href="/login" target="_top" id="login">' in response.text
-        ):
-            logger.error("Forwarded to login page")
+    def request_many(self, requests_: List[dict], max_workers: int = 8) -> List[dict]:
+        """
+        Perform multiple requests concurrently
+
+        Args:
+            requests_ (List[dict]): keyword arguments for request() for each request
+            max_workers (int): max number of concurrent requests
+
+        Returns:
+            List[dict]: responses in same order as requests
+        """
+        if len(requests_) <= 1:
+            return [self.request(**request_) for request_ in requests_]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(requests_))) as executor:
+            return list(executor.map(lambda request_: self.request(**request_), requests_))
+
+    def _request(
+        self,
+        url: str,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        use_cache: bool = True,
+    ):
+        cached_data, stale = self._cached_response(
+            url=url, endpoint=endpoint, method=method, params=params, data=data, use_cache=use_cache
+        )
+        if cached_data is not None:
+            if stale:
+                self._revalidate(url=url, endpoint=endpoint, method=method, params=params, data=data)
+            return cached_data
+        return self._fetch(url=url, endpoint=endpoint, method=method, params=params, data=data, use_cache=use_cache)
+
+    def _revalidate(
+        self,
+        url: str,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ) -> None:
+        """
+        Refresh an outdated cached response by a background request (stale-while-revalidate)
+
+        The refresh is sent like a forced request (use_cache=False), so it is coalesced with identical foreground requests.
+        """
+        key = self._revalidate_key(url=url, method=method, params=params, data=data)
+        if not self._start_revalidation(key):
+            return
+
+        def refresh() -> None:
+            try:
+                json_data = self.request(endpoint=endpoint, method=method, params=params, data=data, use_cache=False)
+                self._store_revalidated(
+                    json_data=json_data, url=url, endpoint=endpoint, method=method, params=params, data=data
+                )
+            except Exception as e:
+                logger.warning(f"Background refresh of request to {endpoint} failed: {e}")
+            finally:
+                self._end_revalidation(key)
+
+        threading.Thread(target=refresh, name="growatt-cache-revalidate", daemon=True).start()
+
+    def _fetch(
+        self,
+        url: str,
+        endpoint: Optional[str] = None,
+        method: Literal["GET", "POST"] = "GET",
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        use_cache: bool = True,
+    ):
+        """
+        Send a request (applying rate limiter and retry policy) and process its response
+        """
+        deadline_at = self._deadline_at()
+        attempt = 0
+        while True:
+            wait = self._reserve_rate_limit(endpoint=endpoint, params=params, data=data)
+            if wait is None:
+                return self._process_response(
+                    json_data=self._rate_limited_response(endpoint=endpoint),
+                    url=url,
+                    endpoint=endpoint,
+                    method=method,
+                    params=params,
+                    data=data,
+                    use_cache=use_cache,
+                )
+            if wait:
+                time.sleep(wait)
 
+            try:
+                response = self.session.request(
+                    method,
+                    url=url,
+                    params=params,
+                    data=data,
+                    timeout=self.connection.timeout,
+                )
+            except self.transport_errors as e:
+                delay = self._retry_delay(attempt, deadline_at, endpoint=endpoint, params=params, data=data, error=e)
+                if delay is None:
+                    raise
+            else:
+                json_data, json_error = self._decode_json(response)
+                delay = self._retry_delay(
+                    attempt,
+                    deadline_at,
+                    endpoint=endpoint,
+                    params=params,
+                    data=data,
+                    status=response.status_code,
+                    json_data=json_data,
+                )
+                if delay is None:
+                    if json_error is not None:
+                        logger.error(f"JSON conversion failed: {json_error}\nResponse was:\n{response.text}")
+                        raise json_error
+                    return self._process_response(
+                        json_data=json_data,
+                        url=url,
+                        endpoint=endpoint,
+                        method=method,
+                        params=params,
+                        data=data,
+                        use_cache=use_cache,
+                    )
+            time.sleep(delay)
+            attempt += 1
+
+    def _decode_json(self, response: requests.Response) -> Tuple[Optional[dict], Optional[ValueError]]:
+        """
+        json-decoded response (checked for retry and processed), or the decoding error if it is not valid JSON
+        """
+        self._check_login_page(response.text)
         try:
-            json_data = response.json()
-            # check error code
-            error_code = json_data.get("error_code")
-            error_code_new = json_data.get("code")
-            if self.cache_folder and use_cache:
-                # create hash from request params
-                args_ = {"base_url": url, "endpoint": endpoint, "method": method, "params": params, "data": data}
-                hash_ = hashlib.md5(json.dumps(args_).encode()).hexdigest()
-                pickle_file = self.cache_folder / f"{hash_}.pickle"
-                pickle_file.parent.mkdir(parents=True, exist_ok=True)
-
-                if error_code == 10012 or error_code_new == 102:
-                    # check if we have a cached version of this request and return it
-                    if pickle_file.exists():
-                        logger.warning(f"API limit exceeded. Using cached version of request to {endpoint}")
-                        with pickle_file.open("rb") as f:
-                            json_data = pickle.load(f)
-                else:
-                    # cache the response
-                    with pickle_file.open("wb") as f:
-                        pickle.dump(json_data, f)
-
-                # recalculate as data might have been loaded from cache
-                error_code = json_data.get("error_code")
-                error_code_new = json_data.get("code")
-
-            if error_code:
-                error_msg = json_data.get("error_msg")
-                generic_error_msg = self.generic_error_message(error_code)
-                if not error_msg:
-                    json_data["error_msg"] = generic_error_msg
-                error_log = f"request failed with error code {error_code}: {error_msg}"
-                if generic_error_msg:
-                    error_log += f" ({generic_error_msg})"
-                logger.warning(error_log)
-
-            if error_code_new:
-                error_msg = json_data.get("message")
-                generic_error_msg = self.generic_response_message(error_code_new)
-                if not error_msg:
-                    json_data["message"] = generic_error_msg
-                error_log = f"request failed with error code {error_code_new}: {error_msg}"
-                if generic_error_msg:
-                    error_log += f" ({generic_error_msg})"
-                logger.warning(error_log)
-
-            return json_data
-        except Exception as e:
-            logger.error(f"JSON conversion failed: {e}\nResponse was:\n{response.text}")
-            raise
+            return response.json(), None
+        except ValueError as e:
+            return None, e
@@ -0,0 +1,333 @@
+import threading
+import time
+from datetime import timedelta
+from typing import Optional, Literal, Dict, List, Tuple, NamedTuple, Iterator
+from loguru import logger
+
+from .fingerprint import canonical_form
+
+
+class RateLimit(NamedTuple):
+    """
+    Rate limit for an endpoint, e.g. "once every 5 minutes" = RateLimit(calls=1, period=timedelta(minutes=5))
+
+    calls: number of calls allowed per period
+    period: period for calls
+    per_device: limit applies per device (or plant) instead of the whole endpoint (see DEVICE_KEYS)
+    device_types: limit applies only to these (v4) device types (as passed in parameter "deviceType")
+    """
+
+    calls: int
+    period: timedelta
+    per_device: bool = False
+    device_types: Optional[Tuple[str, ...]] = None
+
+
+# request parameters identifying a device (or plant) for rate limits having per_device=True
+DEVICE_KEYS = (
+    "device_sn",
+    "deviceSn",
+    "datalogger_sn",
+    "dataloggerSn",
+    "datalog_sn",
+    "datalogSn",
+    "sn",
+    "tlx_sn",
+    "tlxs",
+    "storage_sn",
+    "spa_sn",
+    "spas",
+    "mix_sn",
+    "mixs",
+    "max_sn",
+    "maxs",
+    "inverters",
+    "pcs_sn",
+    "pbd_sn",
+    "hps_sn",
+    "boost_sn",
+    "boosts",
+    "vppSn",
+    "devices",
+    "plant_id",
+)
+
+# request parameters selecting a page - each page is a separate request for "once every N seconds" limits
+# ("same request only once every 5 minutes"), so pages of paginated endpoints (e.g. plant/list) can be fetched
+# one after the other - quotas like "10 per day" count all pages
+PAGE_KEYS = ("page", "pageNum", "perpage")
+
+_5_SECONDS = RateLimit(calls=1, period=timedelta(seconds=5))
+_5_SECONDS_PER_DEVICE = RateLimit(calls=1, period=timedelta(seconds=5), per_device=True)
+_10_SECONDS_PER_DEVICE = RateLimit(calls=1, period=timedelta(seconds=10), per_device=True)
+_5_MINUTES = RateLimit(calls=1, period=timedelta(minutes=5))
+_5_MINUTES_PER_DEVICE = RateLimit(calls=1, period=timedelta(minutes=5), per_device=True)
+_10_PER_DAY = RateLimit(calls=10, period=timedelta(days=1))
+
+# rate limits as documented in API docs (see "Rate limit(s)" in docstrings of the endpoint methods)
+ENDPOINT_RATE_LIMITS: Dict[str, List[RateLimit]] = {
+    # v4 new-api
+    "new-api/queryDeviceList": [_5_SECONDS],
+    "new-api/queryDeviceInfo": [_5_MINUTES_PER_DEVICE],
+    "new-api/queryLastData": [
+        RateLimit(calls=1, period=timedelta(minutes=1), per_device=True, device_types=("noah",)),
+        RateLimit(
+            calls=1,
+            period=timedelta(minutes=5),
+            per_device=True,
+            device_types=("inv", "storage", "max", "sph", "spa", "min", "wit", "sph-s"),
+        ),
+    ],
+    "new-api/readPower": [_5_SECONDS_PER_DEVICE],
+    "new-api/queryHistoricalData": [_5_MINUTES_PER_DEVICE],
+    "new-api/queryDevicesHistoricalData": [_5_MINUTES_PER_DEVICE],
+    "new-api/getWiFiSignalByDevice": [_5_SECONDS_PER_DEVICE],
+    "new-api/setOnOrOff": [_5_SECONDS_PER_DEVICE],
+    "new-api/setPower": [_5_SECONDS_PER_DEVICE],
+    "new-api/setHighLimitSoc": [_5_SECONDS_PER_DEVICE],
+    "new-api/setLowLimitSoc": [_5_SECONDS_PER_DEVICE],
+    "new-api/setTimeSegment": [_5_SECONDS_PER_DEVICE],
+    "new-api/readVppParameter": [_5_SECONDS_PER_DEVICE],
+    "new-api/setVppParameter": [_5_SECONDS_PER_DEVICE],
+    "new-api/setNewVppParameter": [_5_SECONDS_PER_DEVICE],
+    "new-api/removeVppTimePeriod": [_5_SECONDS_PER_DEVICE],
+    "new-api/setDevice": [_5_SECONDS_PER_DEVICE],
+    "new-api/setGridCharge": [_5_SECONDS_PER_DEVICE],
+    "new-api/setOffGrid": [_5_SECONDS_PER_DEVICE],
+    # user
+    "user/c_user_list": [_5_MINUTES, _10_PER_DAY],
+    # plant
+    "plant/add": [_5_MINUTES],
+    "plant/modify": [_10_PER_DAY],
+    "plant/list": [_5_MINUTES, _10_PER_DAY],
+    "plant/user_plant_list": [_5_MINUTES, _10_PER_DAY],
+    "plant/details": [_5_MINUTES_PER_DEVICE],
+    "plant/data": [_5_MINUTES_PER_DEVICE],
+    "plant/energy": [_5_MINUTES_PER_DEVICE, _10_PER_DAY],
+    "plant/power": [_5_MINUTES_PER_DEVICE],
+    "plant/sn_plant": [_5_MINUTES_PER_DEVICE],
+    # device / datalogger
+    "device/list": [_5_MINUTES_PER_DEVICE],
+    "device/datalogger/list": [_5_MINUTES_PER_DEVICE],
+    "device/datalogger/add": [_5_MINUTES],
+    "device/datalogger/delete": [_5_MINUTES],
+    "device/sn/add": [_5_MINUTES],
+    "device/check/sn": [_5_MINUTES_PER_DEVICE],
+    "device/inverter/day_energy": [_5_MINUTES_PER_DEVICE],
+    "device/all/create_date": [_5_MINUTES_PER_DEVICE],
+    "device/env/env_list": [_5_MINUTES_PER_DEVICE],
+    "device/ammeter/meter_list": [_5_MINUTES_PER_DEVICE],
+    # env sensor / smart meter
+    "device/env/env_last_data": [_5_MINUTES_PER_DEVICE],
+    "device/env/env_data": [_5_MINUTES_PER_DEVICE],
+    "device/ammeter/meter_last_data": [_5_MINUTES_PER_DEVICE],
+    "device/ammeter/meter_data": [_5_MINUTES_PER_DEVICE],
+    # inverter
+    "device/inverter/inv_data_info": [_5_MINUTES_PER_DEVICE],
+    "device/inverter/last_new_data": [_5_MINUTES_PER_DEVICE],
+    "device/inverter/invs_data": [_5_MINUTES_PER_DEVICE],
+    "device/inverter/data": [_5_MINUTES_PER_DEVICE],
+    "device/inverter/alarm": [_5_MINUTES_PER_DEVICE],
+    # max
+    "device/max/max_last_data": [_5_MINUTES_PER_DEVICE],
+    "device/max/maxs_data": [_5_MINUTES_PER_DEVICE],
+    "device/max/max_data": [_5_MINUTES_PER_DEVICE],
+    # min
+    "device/tlx/tlx_data_info": [_5_MINUTES_PER_DEVICE],
+    "device/tlx/tlx_last_data": [_5_MINUTES_PER_DEVICE],
+    "device/tlx/tlxs_data": [_5_MINUTES_PER_DEVICE],
+    "device/tlx/tlx_data": [_10_SECONDS_PER_DEVICE],
+    "device/tlx/alarm_data": [_5_MINUTES_PER_DEVICE],
+    # spa
+    "device/spa/spa_last_data": [_10_SECONDS_PER_DEVICE],
+    "device/spa/spas_data": [_10_SECONDS_PER_DEVICE],
+    "device/spa/spa_data": [_10_SECONDS_PER_DEVICE],
+    "device/spa/alarm_data": [_10_SECONDS_PER_DEVICE],
+    # sph
+    "device/mix/mix_last_data": [_10_SECONDS_PER_DEVICE],
+    "device/mix/mixs_data": [_10_SECONDS_PER_DEVICE],
+    "device/mix/mix_data": [_5_MINUTES_PER_DEVICE],
+    "device/mix/alarm_data": [_10_SECONDS_PER_DEVICE],
+    # storage
+    "device/storage/storage_data_info": [_10_SECONDS_PER_DEVICE],
+    "device/storage/storage_last_data": [_10_SECONDS_PER_DEVICE],
+    "device/storage/storage_data": [_10_SECONDS_PER_DEVICE],
+    "device/storage/alarm_data": [_10_SECONDS_PER_DEVICE],
+    # pcs
+    "device/pcs/pcs_last_data": [_5_MINUTES_PER_DEVICE],
+    "device/pcs/pcs_data": [_5_MINUTES_PER_DEVICE],
+    "device/pcs/alarm_data": [_5_MINUTES_PER_DEVICE],
+    # hps
+    "device/hps/hps_data_info": [_10_SECONDS_PER_DEVICE],
+    "device/hps/hps_last_data": [_10_SECONDS_PER_DEVICE],
+    "device/hps/hps_data": [_10_SECONDS_PER_DEVICE],
+    "device/hps/alarm_data": [_10_SECONDS_PER_DEVICE],
+    # pbd
+    "device/pbd/pbd_data_info": [_10_SECONDS_PER_DEVICE],
+    "device/pbd/pbd_last_data": [_5_MINUTES_PER_DEVICE],
+    "device/pbd/pbd_data": [_5_MINUTES_PER_DEVICE],
+    "device/pbd/alarm_data": [_5_MINUTES_PER_DEVICE],
+    # groboost
+    "device/boost/boost_data_info": [_10_SECONDS_PER_DEVICE],
+    "device/boost/boost_last_data": [_10_SECONDS_PER_DEVICE],
+    "device/boost/boosts_data": [_10_SECONDS_PER_DEVICE],
+    "device/boost/boost_data": [_10_SECONDS_PER_DEVICE],
+    # vpp
+    "device/vpp/getSocData": [_10_SECONDS_PER_DEVICE],
+    "vppRemoteSetNew": [_10_SECONDS_PER_DEVICE],
+    "vppSetNew": [_10_SECONDS_PER_DEVICE],
+}
+
+
+def applicable_limits(
+    limits: Dict[str, List[RateLimit]],
+    endpoint: Optional[str],
+    params: Optional[dict] = None,
+    data: Optional[dict] = None,
+) -> Iterator[Tuple[int, RateLimit]]:
+    """
+    (index, rate limit) of the limits of an endpoint applying to a request (considering device_types)
+    """
+    device_type = (params or {}).get("deviceType") or (data or {}).get("deviceType")
+    for idx, rate_limit in enumerate(limits.get(endpoint) or []):
+        if rate_limit.device_types is not None and device_type not in rate_limit.device_types:
+            continue
+        yield idx, rate_limit
+
+
+class _TokenBucket:
+    """
+    Token bucket holding up to `calls` tokens, refilled continuously over `period`.
+    Tokens may become negative to reserve a slot for waiting callers.
+    """
+
+    def __init__(self, rate_limit: RateLimit, now: float) -> None:
+        self.capacity = float(rate_limit.calls)
+        self.refill_per_second = rate_limit.calls / rate_limit.period.total_seconds()
+        self.tokens = self.capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated = max(now, self.updated)
+
+    def wait_time(self, now: float) -> float:
+        """seconds until the next token is available"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.refill_per_second
+
+    def consume(self) -> None:
+        self.tokens -= 1
+
+
+class RateLimiter:
+    """
+    Per-endpoint token bucket rate limiter applied before requests are sent.
+
+    Limits are registered by endpoint (see ENDPOINT_RATE_LIMITS for documented defaults).
+    Limits marked per_device are tracked separately for each device (or plant).
+    "Once every N seconds" limits are tracked separately for each page of paginated endpoints (see PAGE_KEYS).
+
+    mode:
+        "wait": delay requests until allowed, but at most `max_wait` - requests needing longer are rejected
+        "reject": reject requests immediately if not allowed
+    Rejected requests are not sent. Instead, the session returns the same error the API would have returned
+    ("API rate limit exceeded") - including fallback to cached data if available.
+
+    A single RateLimiter can be shared by multiple sessions (and threads) using the same token.
+
+    Usage:
+        api = GrowattApi(token="your_token", rate_limiter=RateLimiter(mode="wait"))
+    """
+
+    mode: Literal["wait", "reject"]
+    max_wait: timedelta
+    limits: Dict[str, List[RateLimit]]
+
+    def __init__(
+        self,
+        mode: Literal["wait", "reject"] = "wait",
+        max_wait: timedelta = timedelta(minutes=1),
+        limits: Optional[Dict[str, List[RateLimit]]] = None,
+    ) -> None:
+        self.mode = mode
+        self.max_wait = max_wait
+        self.limits = dict(ENDPOINT_RATE_LIMITS if limits is None else limits)
+        self._buckets: Dict[Tuple[str, int, Optional[str], Optional[str]], _TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def register(self, endpoint: str, *limits: RateLimit) -> None:
+        """
+        Set the rate limit(s) for an endpoint (replacing any existing limits)
+        """
+        with self._lock:
+            self.limits[endpoint] = list(limits)
+            for key in [key for key in self._buckets if key[0] == endpoint]:
+                del self._buckets[key]
+
+    @staticmethod
+    def device_key(params: Optional[dict] = None, data: Optional[dict] = None) -> Optional[str]:
+        """
+        Identify the device(s) a request is for
+        """
+        device_values = [
+            f"{key}={value}" for key, value in canonical_form(data) + canonical_form(params) if key in DEVICE_KEYS
+        ]
+        return "&".join(sorted(device_values)) or None
+
+    @staticmethod
+    def page_key(params: Optional[dict] = None, data: Optional[dict] = None) -> Optional[str]:
+        """
+        Identify the page a request is for (see PAGE_KEYS)
+        """
+        page_values = [
+            f"{key}={value}" for key, value in canonical_form(data) + canonical_form(params) if key in PAGE_KEYS
+        ]
+        return "&".join(sorted(page_values)) or None
+
+    def reserve(
+        self,
+        endpoint: Optional[str],
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ) -> Optional[float]:
+        """
+        Reserve a slot for a request
+
+        Returns:
+            seconds to wait before sending the request (0.0 = send immediately)
+            or None if the request must be rejected
+        """
+        if not endpoint or endpoint not in self.limits:
+            return 0.0
+
+        device_key = self.device_key(params=params, data=data)
+        page_key = self.page_key(params=params, data=data)
+        max_wait = 0.0 if self.mode == "reject" else self.max_wait.total_seconds()
+        with self._lock:
+            now = time.monotonic()
+            buckets = []
+            for idx, rate_limit in applicable_limits(self.limits, endpoint=endpoint, params=params, data=data):
+                bucket_key = (
+                    endpoint,
+                    idx,
+                    device_key if rate_limit.per_device else None,
+                    page_key if rate_limit.calls == 1 else None,
+                )
+                bucket = self._buckets.get(bucket_key)
+                if bucket is None:
+                    bucket = self._buckets[bucket_key] = _TokenBucket(rate_limit, now=now)
+                buckets.append(bucket)
+
+            wait = max([bucket.wait_time(now) for bucket in buckets], default=0.0)
+            if wait > max_wait:
+                logger.warning(
+                    f"Rate limit for {endpoint} ({device_key}) reached - next request possible in {wait:.1f}s"
+                )
+                return None
+            for bucket in buckets:
+                bucket.consume()
+        return wait
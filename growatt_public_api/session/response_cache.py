@@ -0,0 +1,492 @@
+import atexit
+import pickle
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional, Literal, Dict, List, Tuple, Iterator
+from loguru import logger
+
+from .rate_limiter import ENDPOINT_RATE_LIMITS, RateLimit
+
+# endpoints changing data on the server - never served from cache
+WRITE_ENDPOINTS = frozenset(
+    {
+        "new-api/setOnOrOff",
+        "new-api/setPower",
+        "new-api/setHighLimitSoc",
+        "new-api/setLowLimitSoc",
+        "new-api/setTimeSegment",
+        "new-api/setVppParameter",
+        "new-api/setNewVppParameter",
+        "new-api/removeVppTimePeriod",
+        "new-api/setDevice",
+        "new-api/setGridCharge",
+        "new-api/setOffGrid",
+        "plant/add",
+        "plant/modify",
+        "device/datalogger/add",
+        "device/datalogger/delete",
+        "device/sn/add",
+        "vppRemoteSetNew",
+        "vppSetNew",
+    }
+)
+
+# TTLs differing from the documented refresh interval (rate limit) of the endpoint
+CACHE_TTL_OVERRIDES: Dict[str, timedelta] = {
+    # static data
+    "device/check/sn": timedelta(days=1),
+    "device/all/create_date": timedelta(days=1),
+    # device list changes rarely but may be requested every 5 seconds
+    "new-api/queryDeviceList": timedelta(minutes=5),
+}
+
+
+def _refresh_interval(rate_limits: List[RateLimit], device_type: Optional[str] = None) -> Optional[timedelta]:
+    """
+    Documented refresh interval = longest "once every ..." rate limit applicable to the device type
+    """
+    periods = [
+        rate_limit.period
+        for rate_limit in rate_limits
+        if rate_limit.calls == 1 and (rate_limit.device_types is None or device_type in rate_limit.device_types)
+    ]
+    return max(periods, default=None)
+
+
+class _MemoryTier:
+    """
+    Thread-safe LRU of pickled responses bounded by number of entries and total size in bytes
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[float, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, stored_at: float, pickled: bytes) -> None:
+        if len(pickled) > self.max_bytes:
+            self.discard(key)
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self._entries[key] = (stored_at, pickled)
+            self.size += len(pickled)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _PickleFileStore:
+    """
+    One pickle file per response, file modification time = time stored
+    """
+
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+        self._scan: Optional[Iterator[os.DirEntry]] = None
+
+    def _path(self, key: str) -> Path:
+        return self.folder / f"{key}.pickle"
+
+    def read(self, key: str) -> Optional[Tuple[float, bytes]]:
+        pickle_file = self._path(key)
+        try:
+            return pickle_file.stat().st_mtime, pickle_file.read_bytes()
+        except OSError:
+            return None
+
+    def write(self, key: str, pickled: bytes, stored_at: float) -> None:
+        pickle_file = self._path(key)
+        pickle_file.parent.mkdir(parents=True, exist_ok=True)
+        # write to temporary file first, so concurrent readers never see partial files
+        tmp_file = pickle_file.with_name(f"{pickle_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_file.write_bytes(pickled)
+        os.utime(tmp_file, (stored_at, stored_at))
+        tmp_file.replace(pickle_file)
+
+    def evict(self, stored_before: float, limit: Optional[int] = None) -> bool:
+        """
+        Delete files stored before `stored_before`, checking at most `limit` files per call.
+        Limited calls resume where the previous call stopped. Returns True if all files have been checked.
+        """
+        if limit is None:
+            scan = os.scandir(self.folder)
+        else:
+            if self._scan is None:
+                self._scan = os.scandir(self.folder)
+            scan = self._scan
+        checked = 0
+        for entry in scan:
+            # also remove temporary files left by interrupted writes
+            if not entry.name.endswith((".pickle", ".tmp")):
+                continue
+            try:
+                if entry.stat().st_mtime < stored_before:
+                    # Deleting outdated cache file
+                    os.unlink(entry.path)
+            except OSError:
+                logger.debug(f"Failed to delete outdated cache file: {entry.path}")
+            checked += 1
+            if limit is not None and checked >= limit:
+                return False
+        scan.close()
+        if limit is not None:
+            self._scan = None
+        return True
+
+
+class _SqliteStore:
+    """
+    Single SQLite database for all responses
+
+    * WAL journal and busy timeout allow concurrent access from multiple threads and processes
+    * index on "stored_at" makes eviction independent of the number of cached responses
+    * eviction deletes in small batches to keep write locks short
+    """
+
+    EVICT_BATCH_SIZE = 500
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, response BLOB NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def read(self, key: str) -> Optional[Tuple[float, bytes]]:
+        row = self._connection().execute("SELECT stored_at, response FROM responses WHERE key = ?", (key,)).fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def write(self, key: str, pickled: bytes, stored_at: float) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses (key, stored_at, response) VALUES (?, ?, ?)",
+            (key, stored_at, pickled),
+        )
+
+    def evict(self, stored_before: float, limit: Optional[int] = None) -> bool:
+        """
+        Delete responses stored before `stored_before`, at most `limit` per call.
+        Returns True if no outdated responses are left.
+        """
+        connection = self._connection()
+        deleted = 0
+        while limit is None or deleted < limit:
+            batch_size = self.EVICT_BATCH_SIZE if limit is None else min(self.EVICT_BATCH_SIZE, limit - deleted)
+            cursor = connection.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses WHERE stored_at < ? LIMIT ?)",
+                (stored_before, batch_size),
+            )
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                return True
+        return False
+
+
+# caches having pending write-behind writes are flushed on interpreter exit
+_WRITE_BEHIND_CACHES: "weakref.WeakSet[ResponseCache]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_write_behind_caches() -> None:
+    for cache in list(_WRITE_BEHIND_CACHES):
+        cache.flush()
+
+
+class ResponseCache:
+    """
+    On-disk cache for API responses in TMP/growatt_public_api_cache
+
+    backend:
+        "pickle": one pickle file per request
+        "sqlite": single SQLite database (responses.sqlite3) - recommended for large caches and multiple processes
+
+    mode:
+        "fallback": always send requests, but return cached data if the API reports "API rate limit exceeded"
+        "read-through": additionally return cached data without sending a request
+                        as long as it is younger than the TTL of the endpoint
+    TTLs default to the documented refresh interval (rate limit) of each endpoint (see ENDPOINT_RATE_LIMITS),
+    e.g. 5 minutes for "new-api/queryLastData", or CACHE_TTL_OVERRIDES, e.g. 1 day for "device/check/sn".
+    Endpoints without TTL (e.g. settings) are never served from cache in "read-through" mode.
+
+    stale-while-revalidate ("read-through" mode only): responses older than the TTL, but within the
+    `stale_while_revalidate` grace window, are still returned immediately. The session then refreshes them by a
+    single background request (respecting rate limiter and request coalescing).
+    If the refresh fails (error response or exception), the outdated response is kept and served until the grace
+    window has passed. Responses served from cache report their age in seconds: the session adds key "cacheAge" to
+    the JSON response, which response models provide as attribute `cache_age` (None for responses from the server).
+
+    An optional in-memory LRU tier (memory_max_entries > 0) serves repeated requests without file access.
+    Responses are then written to disk by a background thread (write-behind); use flush() to wait for pending writes.
+
+    Outdated responses are deleted incrementally while storing responses: at most one cleanup pass
+    every `cleanup_interval` (shared by all processes using the same folder), checking `cleanup_batch_size`
+    responses per step, in a background thread unless `cleanup_in_background=False`.
+    Call cleanup() to delete all outdated responses at once.
+
+    Usage:
+        api = GrowattApi(token="your_token", cache=ResponseCache(mode="read-through"))
+    """
+
+    mode: Literal["fallback", "read-through"]
+    folder: Path
+    max_age: timedelta
+    ttls: Dict[str, timedelta]
+    stale_while_revalidate: timedelta
+
+    def __init__(
+        self,
+        mode: Literal["fallback", "read-through"] = "fallback",
+        ttls: Optional[Dict[str, timedelta]] = None,
+        max_age: timedelta = timedelta(days=1),
+        folder: Optional[Path] = None,
+        memory_max_entries: int = 0,
+        memory_max_bytes: int = 16 * 1024 * 1024,
+        backend: Literal["pickle", "sqlite"] = "pickle",
+        cleanup_interval: timedelta = timedelta(hours=1),
+        cleanup_batch_size: int = 1000,
+        cleanup_in_background: bool = True,
+        stale_while_revalidate: timedelta = timedelta(0),
+    ) -> None:
+        """
+        :param mode: "fallback" or "read-through" (see class docstring)
+        :param ttls: TTLs per endpoint overriding the defaults (timedelta(0) disables read-through for an endpoint)
+        :param max_age: cached responses older than this are deleted
+        :param folder: cache folder - defaults to TMP/growatt_public_api_cache
+        :param memory_max_entries: number of responses kept in memory (0 = no memory tier, write to disk immediately)
+        :param memory_max_bytes: total size of (pickled) responses kept in memory
+        :param backend: "pickle" or "sqlite" (see class docstring)
+        :param cleanup_interval: minimum time between cleanup passes (timedelta(0) = cleanup on every store)
+        :param cleanup_batch_size: number of responses checked per cleanup step
+        :param cleanup_in_background: run cleanup steps in a background thread
+        :param stale_while_revalidate: grace window after the TTL in which outdated responses are returned
+                                       while being refreshed in background (see class docstring)
+        """
+        self.mode = mode
+        self.ttls = {**CACHE_TTL_OVERRIDES, **(ttls or {})}
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.folder = folder or Path(tempfile.gettempdir()) / "growatt_public_api_cache"
+        self.folder.mkdir(parents=True, exist_ok=True)
+        if backend == "sqlite":
+            self._store = _SqliteStore(self.folder / "responses.sqlite3")
+        elif backend == "pickle":
+            self._store = _PickleFileStore(self.folder)
+        else:
+            raise ValueError(f"Unknown cache backend: {backend}")
+        self._memory = _MemoryTier(max_entries=memory_max_entries, max_bytes=memory_max_bytes)
+        self._write_queue: "queue.Queue[Tuple[str, bytes, float]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self.cleanup_interval = cleanup_interval
+        self.cleanup_batch_size = cleanup_batch_size
+        self.cleanup_in_background = cleanup_in_background
+        self._cleanup_lock = threading.Lock()
+        self._cleanup_due = 0.0
+        self._cleanup_running = False
+        self._cleanup_pass = False
+
+    def ttl(
+        self,
+        endpoint: Optional[str] = None,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ) -> Optional[timedelta]:
+        """
+        Time a cached response of this request may be returned without sending a request (None = never)
+        """
+        if not endpoint or endpoint in WRITE_ENDPOINTS:
+            return None
+        if endpoint in self.ttls:
+            return self.ttls[endpoint] or None
+        device_type = (params or {}).get("deviceType") or (data or {}).get("deviceType")
+        return _refresh_interval(ENDPOINT_RATE_LIMITS.get(endpoint) or [], device_type=device_type)
+
+    def load(self, key: str, max_age: Optional[timedelta] = None) -> Optional[dict]:
+        """
+        Load a cached response, or None if not cached (or older than max_age)
+        """
+        entry = self.load_with_age(key, max_age=max_age)
+        return None if entry is None else entry[0]
+
+    def load_with_age(self, key: str, max_age: Optional[timedelta] = None) -> Optional[Tuple[dict, float]]:
+        """
+        Load a cached response and its age in seconds, or None if not cached (or older than max_age)
+        """
+        max_age_seconds = min(self.max_age, max_age or self.max_age).total_seconds()
+        entry = self._memory.get(key)
+        if entry is not None:
+            stored_at, pickled = entry
+            age = time.time() - stored_at
+            if age > max_age_seconds:
+                return None
+            return pickle.loads(pickled), max(0.0, age)
+
+        entry = self._read(key)
+        if entry is None:
+            return None
+        stored_at, pickled = entry
+        age = time.time() - stored_at
+        if age > max_age_seconds:
+            return None
+        try:
+            json_data = pickle.loads(pickled)
+        except (pickle.UnpicklingError, EOFError):
+            return None
+        if self._memory.max_entries:
+            self._memory.put(key, stored_at=stored_at, pickled=pickled)
+        return json_data, max(0.0, age)
+
+    def store(self, key: str, json_data: dict) -> None:
+        """
+        Cache a response
+        """
+        pickled = pickle.dumps(json_data)
+        stored_at = time.time()
+        if self._memory.max_entries:
+            self._memory.put(key, stored_at=stored_at, pickled=pickled)
+            self._write_queue.put((key, pickled, stored_at))
+            self._ensure_writer()
+        else:
+            self._store.write(key, pickled, stored_at=stored_at)
+        self.maybe_cleanup()
+
+    def _read(self, key: str) -> Optional[Tuple[float, bytes]]:
+        try:
+            return self._store.read(key)
+        except sqlite3.Error as e:
+            logger.debug(f"Failed to read cached response for {key}: {e}")
+            return None
+
+    def _ensure_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                _WRITE_BEHIND_CACHES.add(self)
+                self._writer = threading.Thread(target=self._write_behind, name="growatt-cache-writer", daemon=True)
+                self._writer.start()
+
+    def _write_behind(self) -> None:
+        while True:
+            key, pickled, stored_at = self._write_queue.get()
+            try:
+                self._store.write(key, pickled, stored_at=stored_at)
+            except Exception as e:  # keep writer alive - flush() waits for all queued writes
+                logger.debug(f"Failed to write cached response for {key}: {e}")
+            finally:
+                self._write_queue.task_done()
+
+    def flush(self) -> None:
+        """
+        Wait until all responses held in memory are written to disk
+        """
+        if self._writer is not None:
+            self._write_queue.join()
+
+    def cleanup(self) -> None:
+        """
+        Delete all cached responses older than max_age
+        """
+        try:
+            self._store.evict(stored_before=time.time() - self.max_age.total_seconds())
+        except (OSError, sqlite3.Error) as e:
+            logger.debug(f"Failed to delete outdated cached responses: {e}")
+
+    def maybe_cleanup(self) -> None:
+        """
+        Run the next cleanup step if due (see class docstring)
+        """
+        now = time.monotonic()
+        if now < self._cleanup_due:
+            return
+        with self._cleanup_lock:
+            if now < self._cleanup_due or self._cleanup_running:
+                return
+            self._cleanup_due = now + self.cleanup_interval.total_seconds()
+            if not self._cleanup_pass and not self._start_cleanup_pass():
+                return
+            self._cleanup_pass = True
+            self._cleanup_running = True
+        if self.cleanup_in_background:
+            threading.Thread(target=self._cleanup_step, name="growatt-cache-cleanup", daemon=True).start()
+        else:
+            self._cleanup_step()
+
+    def _start_cleanup_pass(self) -> bool:
+        """
+        Limit cleanup passes across processes using the modification time of a marker file
+        """
+        marker = self.folder / ".last_cleanup"
+        try:
+            if time.time() - marker.stat().st_mtime < self.cleanup_interval.total_seconds():
+                return False
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return False
+        try:
+            marker.touch()
+        except OSError:
+            return False
+        return True
+
+    def _cleanup_step(self) -> None:
+        try:
+            complete = self._store.evict(
+                stored_before=time.time() - self.max_age.total_seconds(), limit=self.cleanup_batch_size
+            )
+        except Exception as e:
+            logger.debug(f"Failed to delete outdated cached responses: {e}")
+            complete = True
+        with self._cleanup_lock:
+            self._cleanup_running = False
+            self._cleanup_pass = not complete
+            if not complete:
+                # continue pass on next store
+                self._cleanup_due = 0.0
+
+    @staticmethod
+    def is_success(json_data: dict) -> bool:
+        """
+        Only successful responses are served in "read-through" mode
+        """
+        return not json_data.get("error_code") and not json_data.get("code")
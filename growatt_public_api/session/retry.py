@@ -0,0 +1,103 @@
+import random
+import time
+from datetime import timedelta
+from typing import Optional, Dict, List, Tuple
+
+from .rate_limiter import ENDPOINT_RATE_LIMITS, RateLimit, applicable_limits
+
+
+class RetryPolicy:
+    """
+    Retry failed requests using jittered exponential backoff
+
+    Retried are
+        * transport errors (connection failed, timeouts)
+        * server errors (HTTP status in `retry_statuses`)
+        * "API rate limit exceeded" (error code 10012 / v4 code 102) if `retry_rate_limited`
+          waiting at least the documented interval of the endpoint (see ENDPOINT_RATE_LIMITS) before retrying
+    The n-th retry waits a random time between 0 and min(`backoff` * 2^n, `max_backoff`) (+ the minimum wait).
+    A request is given up if `max_attempts` is reached or the next attempt would exceed `deadline` (per call).
+    Given up rate limited requests return the error (or cached data if available), other errors are raised.
+
+    Settings (WRITE_ENDPOINTS) are only retried if they were rejected by rate limit (i.e. certainly not applied),
+    unless `retry_writes` is set.
+
+    Usage:
+        api = GrowattApi(token="your_token", retry=RetryPolicy(deadline=timedelta(minutes=6)))
+    """
+
+    max_attempts: int
+    backoff: timedelta
+    max_backoff: timedelta
+    deadline: timedelta
+    retry_rate_limited: bool
+    retry_statuses: Tuple[int, ...]
+    retry_writes: bool
+    limits: Dict[str, List[RateLimit]]
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff: timedelta = timedelta(seconds=1),
+        max_backoff: timedelta = timedelta(minutes=1),
+        deadline: timedelta = timedelta(minutes=6),
+        retry_rate_limited: bool = True,
+        retry_statuses: Tuple[int, ...] = (500, 502, 503, 504),
+        retry_writes: bool = False,
+        limits: Optional[Dict[str, List[RateLimit]]] = None,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.retry_rate_limited = retry_rate_limited
+        self.retry_statuses = retry_statuses
+        self.retry_writes = retry_writes
+        self.limits = dict(ENDPOINT_RATE_LIMITS if limits is None else limits)
+
+    def deadline_at(self) -> float:
+        """
+        time.monotonic() at which a call started now has to be finished
+        """
+        return time.monotonic() + self.deadline.total_seconds()
+
+    def backoff_time(self, attempt: int) -> float:
+        """
+        seconds to wait before retrying after the given (zero-based) attempt ("full jitter")
+        """
+        cap = min(self.backoff.total_seconds() * 2**attempt, self.max_backoff.total_seconds())
+        return random.uniform(0, cap)
+
+    def min_wait(self, endpoint: Optional[str], params: Optional[dict] = None, data: Optional[dict] = None) -> float:
+        """
+        seconds to wait at least after "API rate limit exceeded"
+
+        documented interval of the endpoint - the longest one if several limits apply (e.g. 5 minutes and 10 per day),
+        as it is unknown which limit has been exceeded
+        """
+        intervals = [
+            rate_limit.period.total_seconds() / rate_limit.calls
+            for _, rate_limit in applicable_limits(self.limits, endpoint=endpoint, params=params, data=data)
+        ]
+        return max(intervals, default=0.0)
+
+    def delay(
+        self,
+        attempt: int,
+        deadline_at: float,
+        endpoint: Optional[str] = None,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        rate_limited: bool = False,
+    ) -> Optional[float]:
+        """
+        Seconds to wait before retrying after the given (zero-based) attempt, or None to give up
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        delay = self.backoff_time(attempt)
+        if rate_limited:
+            delay += self.min_wait(endpoint=endpoint, params=params, data=data)
+        if time.monotonic() + delay > deadline_at:
+            return None
+        return delay
@@ -0,0 +1,94 @@
+import asyncio
+import copy
+import threading
+from typing import Dict, Callable, TypeVar, Awaitable, Optional
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.followers = 0
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls (threads): while a call for a key is in flight,
+    further calls for the same key wait for it and get a copy of its result (or its exception)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                call.followers += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            # followers get copies of an unmodified result
+            with self._lock:
+                call.result = copy.deepcopy(result) if call.followers else result
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Coalesce identical concurrent calls (asyncio tasks) - see SingleFlight
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+        if future is not None:
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # call was cancelled by its caller - run again instead of failing this call
+                return await self.do(key, fn)
+            return copy.deepcopy(result)
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # exception is re-raised by followers - avoid "exception was never retrieved" warnings
+            future.exception()
+            raise
+        else:
+            future.set_result(copy.deepcopy(result))
+            return result
+        finally:
+            del self._calls[key]
@@ -3,8 +3,10 @@ from typing import Optional
 from ..pydantic_models.smart_meter import (
     SmartMeterEnergyOverview,
     SmartMeterEnergyHistory,
+    SmartMeterEnergyOverviewData,
 )
 from ..session import GrowattApiSession
+from ..pagination import PageIterator
 
 
 class SmartMeter:
@@ -457,3 +459,39 @@ class SmartMeter:
         )
 
         return SmartMeterEnergyHistory.model_validate(response)
+
+    def iter_energy_history(
+        self,
+        datalogger_sn: str,
+        meter_address: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[SmartMeterEnergyOverviewData]:
+        """
+        Iterate over all history records of energy_history() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            datalogger_sn (str): Serial number of the datalogger the meter is attached to
+            meter_address (int): Address of the meter (see SmartMeter.list() output)
+            start_date (Optional[date]): Start Date - defaults to today
+            end_date (Optional[date]): End Date (date interval cannot exceed 7 days) - defaults to today
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[SmartMeterEnergyOverviewData]
+        """
+
+        return PageIterator(
+            self,
+            "energy_history",
+            items="meter_data",
+            prefetch=prefetch,
+            datalogger_sn=datalogger_sn,
+            meter_address=meter_address,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+        )
@@ -21,8 +21,12 @@ from ..pydantic_models.spa import (
     SpaAlarms,
     SpaEnergyOverviewMultiple,
     SpaEnergyOverviewMultipleItem,
+    SpaAlarm,
+    SpaEnergyOverviewData,
 )
 from ..session import GrowattApiSession
+from ..columnar import HistoryColumns
+from ..pagination import PageIterator
 from ..api_v4.api_v4 import ApiV4
 from ..vpp.vpp import Vpp
 
@@ -850,7 +854,7 @@ class Spa:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
 
         Returns:
             SpaDetailsV4
@@ -1085,7 +1089,7 @@ class Spa:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
 
         Returns:
             SpaEnergyV4
@@ -1702,6 +1706,42 @@ class Spa:
 
         return SpaEnergyHistory.model_validate(response)
 
+    def iter_energy_history(
+        self,
+        device_sn: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        timezone: Optional[str] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[SpaEnergyOverviewData]:
+        """
+        Iterate over all history records of energy_history() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            device_sn (str): SPA serial number
+            start_date (Optional[date]): Start Date - defaults to today
+            end_date (Optional[date]): End Date (date interval cannot exceed 7 days) - defaults to today
+            timezone (Optional[str]): The time zone code of the data display, the default is UTC
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[SpaEnergyOverviewData]
+        """
+
+        return PageIterator(
+            self,
+            "energy_history",
+            items="datas",
+            prefetch=prefetch,
+            device_sn=device_sn,
+            start_date=start_date,
+            end_date=end_date,
+            timezone=timezone,
+            limit=limit,
+        )
+
     def energy_history_v4(
         self,
         device_sn: Optional[str] = None,
@@ -1735,6 +1775,33 @@ class Spa:
             device_sn=self._device_sn(device_sn), device_type=DeviceType.SPA, date_=date_
         )
 
+    def energy_history_columns_v4(
+        self,
+        device_sn: Optional[str] = None,
+        date_: Optional[date] = None,
+        fields: Optional[List[str]] = None,
+    ) -> HistoryColumns:
+        """
+        One day data using "new-api" endpoint as columns (field name -> NumPy array)
+        Same request as energy_history_v4(), but records are converted to columns directly from the JSON response
+        (without creating a pydantic model per record). Requires optional dependency "numpy".
+
+        Rate limit(s):
+        * The retrieval frequency is once every 5 minutes.
+
+        Args:
+            device_sn (str): Device unique serial number (SN)
+            date_ (Optional[date]): Start Date - defaults to today
+            fields (Optional[List[str]]): fields to return, e.g. ["time", "ppv"] - defaults to all fields
+
+        Returns:
+            HistoryColumns (see ApiV4.energy_history_columns())
+        """
+
+        return self._api_v4.energy_history_columns(
+            device_sn=self._device_sn(device_sn), device_type=DeviceType.SPA, date_=date_, fields=fields
+        )
+
     def energy_history_multiple_v4(
         self,
         device_sn: Optional[Union[str, List[str]]] = None,
@@ -1749,7 +1816,7 @@ class Spa:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
             date_ (Optional[date]): Start Date - defaults to today
 
         Returns:
@@ -1834,6 +1901,30 @@ class Spa:
 
         return SpaAlarms.model_validate(response)
 
+    def iter_alarms(
+        self,
+        device_sn: Optional[str] = None,
+        date_: Optional[date] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[SpaAlarm]:
+        """
+        Iterate over all alarms of alarms() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            device_sn (str): SPA device serial number
+            date_ (Optional[date]): Date - defaults to today
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[SpaAlarm]
+        """
+
+        return PageIterator(
+            self, "alarms", items="alarms", prefetch=prefetch, device_sn=device_sn, date_=date_, limit=limit
+        )
+
     def soc(
         self,
         device_sn: Optional[str] = None,
@@ -16,8 +16,11 @@ from ..pydantic_models.storage import (
     StorageEnergyOverview,
     StorageEnergyHistory,
     StorageAlarms,
+    StorageEnergyOverviewData,
 )
 from ..session import GrowattApiSession
+from ..columnar import HistoryColumns
+from ..pagination import PageIterator
 
 
 class Storage:
@@ -117,9 +120,12 @@ class Storage:
             },
         )
 
+        if response.get("error_code") == 10002:
+            response = {
+                **response,
+                "error_msg": f"{response.get('error_msg') or ''} (or type != 2 - check with plant.list_devices())",
+            }
         inv_setting_response = StorageSettingRead.model_validate(response)
-        if inv_setting_response.error_code == 10002:
-            inv_setting_response.error_msg += " (or type != 2 - check with plant.list_devices())"
 
         return inv_setting_response
 
@@ -248,9 +254,12 @@ class Storage:
             },
         )
 
+        if response.get("error_code") == 10012:
+            response = {
+                **response,
+                "error_msg": f"{response.get('error_msg') or ''} (or type != 2 - check with plant.list_devices())",
+            }
         inv_setting_response = StorageSettingWrite.model_validate(response)
-        if inv_setting_response.error_code == 10012:
-            inv_setting_response.error_msg += " (or type != 2 - check with plant.list_devices())"
 
         return inv_setting_response
 
@@ -442,7 +451,7 @@ class Storage:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
 
         Returns:
             StorageDetailsV4
@@ -775,9 +784,12 @@ class Storage:
             },
         )
 
+        if response.get("error_code") == 10002:
+            response = {
+                **response,
+                "error_msg": f"{response.get('error_msg') or ''} (or type != 2 - check with plant.list_devices())",
+            }
         response_parsed = StorageEnergyOverview.model_validate(response)
-        if response_parsed.error_code == 10002:
-            response_parsed.error_msg += " (or type != 2 - check with plant.list_devices())"
 
         return response_parsed
 
@@ -794,7 +806,7 @@ class Storage:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
 
         Returns:
             StorageEnergyV4
@@ -1191,12 +1203,51 @@ class Storage:
             },
         )
 
+        if response.get("error_code") == 10005:
+            response = {
+                **response,
+                "error_msg": f"{response.get('error_msg') or ''} (or type != 2 - check with plant.list_devices())",
+            }
         response_parsed = StorageEnergyHistory.model_validate(response)
-        if response_parsed.error_code == 10005:
-            response_parsed.error_msg += " (or type != 2 - check with plant.list_devices())"
 
         return response_parsed
 
+    def iter_energy_history(
+        self,
+        device_sn: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        timezone: Optional[str] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[StorageEnergyOverviewData]:
+        """
+        Iterate over all history records of energy_history() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            device_sn (str): Inverter serial number
+            start_date (Optional[date]): Start Date - defaults to today
+            end_date (Optional[date]): End Date (date interval cannot exceed 7 days) - defaults to today
+            timezone (Optional[str]): The time zone code of the data display, the default is UTC
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[StorageEnergyOverviewData]
+        """
+
+        return PageIterator(
+            self,
+            "energy_history",
+            items="datas",
+            prefetch=prefetch,
+            device_sn=device_sn,
+            start_date=start_date,
+            end_date=end_date,
+            timezone=timezone,
+            limit=limit,
+        )
+
     def energy_history_v4(
         self,
         device_sn: Optional[str] = None,
@@ -1230,6 +1281,33 @@ class Storage:
             device_sn=self._device_sn(device_sn), device_type=DeviceType.STORAGE, date_=date_
         )
 
+    def energy_history_columns_v4(
+        self,
+        device_sn: Optional[str] = None,
+        date_: Optional[date] = None,
+        fields: Optional[List[str]] = None,
+    ) -> HistoryColumns:
+        """
+        One day data using "new-api" endpoint as columns (field name -> NumPy array)
+        Same request as energy_history_v4(), but records are converted to columns directly from the JSON response
+        (without creating a pydantic model per record). Requires optional dependency "numpy".
+
+        Rate limit(s):
+        * The retrieval frequency is once every 5 minutes.
+
+        Args:
+            device_sn (str): Device unique serial number (SN)
+            date_ (Optional[date]): Start Date - defaults to today
+            fields (Optional[List[str]]): fields to return, e.g. ["time", "ppv"] - defaults to all fields
+
+        Returns:
+            HistoryColumns (see ApiV4.energy_history_columns())
+        """
+
+        return self._api_v4.energy_history_columns(
+            device_sn=self._device_sn(device_sn), device_type=DeviceType.STORAGE, date_=date_, fields=fields
+        )
+
     def energy_history_multiple_v4(  # noqa: C901 'ApiV4.energy' is too complex (11)
         self,
         device_sn: Optional[Union[str, List[str]]] = None,
@@ -1244,7 +1322,7 @@ class Storage:
         * The retrieval frequency is once every 5 minutes.
 
         Args:
-            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (max 100)
+            device_sn (Union[str, List[str]]): Inverter serial number or list of (multiple) inverter serial numbers (requests are split into chunks of max 100 devices)
             date_ (Optional[date]): Start Date - defaults to today
 
         Returns:
@@ -1321,8 +1399,11 @@ class Storage:
             },
         )
 
+        if response.get("error_code") == 10005:
+            response = {
+                **response,
+                "error_msg": f"{response.get('error_msg') or ''} (or type != 2 - check with plant.list_devices())",
+            }
         response_parsed = StorageAlarms.model_validate(response)
-        if response_parsed.error_code == 10005:
-            response_parsed.error_msg += " (or type != 2 - check with plant.list_devices())"
 
         return response_parsed
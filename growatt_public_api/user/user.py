@@ -4,9 +4,11 @@ from ..pydantic_models.user import (
     UserModification,
     UsernameAvailabilityCheck,
     UserList,
+    UserInfo,
 )
 from ..growatt_types import GrowattCountry
 from ..session import GrowattApiSession
+from ..pagination import PageIterator
 
 
 class User:
@@ -200,3 +202,21 @@ class User:
         )
 
         return UserList.model_validate(response)
+
+    def iter_list(
+        self,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> PageIterator[UserInfo]:
+        """
+        Iterate over all users of list() - pages are fetched lazily (see PageIterator)
+
+        Args:
+            limit (Optional[int]): Number of items per page, default 20, max 100
+            prefetch (bool): request next page while the current page is consumed
+
+        Returns:
+            PageIterator[UserInfo]
+        """
+
+        return PageIterator(self, "list", items="users", prefetch=prefetch, limit=limit)
@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import MagicMock, AsyncMock
+
+from growatt_public_api import GrowattApiSession, AsyncGrowattApiSession, DeviceType
+from growatt_public_api.api_v4.api_v4 import ApiV4, _merge_responses
+from growatt_public_api.async_growatt_api import AsyncApiV4
+from growatt_public_api.pydantic_models.api_v4 import MinEnergyV4, MinEnergyHistoryMultipleV4
+
+
+def _energy_response(params: dict) -> dict:
+    return {
+        "code": 0,
+        "message": "SUCCESSFUL_OPERATION",
+        "data": {"min": [{"serialNum": sn} for sn in params["deviceSn"].split(",")]},
+    }
+
+
+class TestApiV4Chunks(unittest.TestCase):
+    """
+    batch requests for more than 100 devices are split into multiple requests
+    """
+
+    def setUp(self):
+        self.session = GrowattApiSession(token="test_token", use_cache=False)
+        self.session.request = MagicMock(side_effect=lambda **kwargs: _energy_response(kwargs["params"]))
+        self.api = ApiV4(session=self.session)
+        self.device_sn = [f"BZP{idx:07d}" for idx in range(250)]
+
+    def test_single_request(self):
+        energy = self.api.energy(device_sn=self.device_sn[:100], device_type=DeviceType.MIN)
+        self.assertIsInstance(energy, MinEnergyV4)
+        self.assertEqual(100, len(energy.data.devices))
+        self.assertEqual(1, self.session.request.call_count)
+
+    def test_chunks(self):
+        energy = self.api.energy(device_sn=self.device_sn, device_type=DeviceType.MIN)
+        self.assertIsInstance(energy, MinEnergyV4)
+        self.assertEqual(self.device_sn, [device.device_sn for device in energy.data.devices])
+        self.assertEqual(3, self.session.request.call_count)
+        sent = sorted(len(call.kwargs["params"]["deviceSn"].split(",")) for call in self.session.request.call_args_list)
+        self.assertEqual([50, 100, 100], sent)
+        self.assertTrue(
+            all(call.kwargs["params"]["deviceType"] == "min" for call in self.session.request.call_args_list)
+        )
+
+    def test_comma_separated(self):
+        energy = self.api.energy(device_sn=",".join(self.device_sn), device_type="min")
+        self.assertEqual(250, len(energy.data.devices))
+        self.assertEqual(3, self.session.request.call_count)
+
+    def test_merge_responses(self):
+        merged = _merge_responses(
+            [
+                {"code": 0, "message": "OK", "data": {"A": [{"serialNum": "A"}]}},
+                {"code": 102, "message": "Access Frequency Limit", "data": None},
+                {"code": 0, "message": "OK", "data": {"B": [{"serialNum": "B"}]}},
+            ]
+        )
+        self.assertEqual(102, merged["code"])
+        self.assertEqual({"A", "B"}, set(merged["data"]))
+        history = MinEnergyHistoryMultipleV4.model_validate(merged)
+        self.assertEqual("B", history.data["B"][0].device_sn)
+
+
+class TestAsyncApiV4Chunks(unittest.IsolatedAsyncioTestCase):
+    async def test_chunks(self):
+        session = AsyncGrowattApiSession(token="test_token", use_cache=False)
+        session.request_many = AsyncMock(
+            side_effect=lambda requests_, max_workers=8: [
+                _energy_response(request_["params"]) for request_ in requests_
+            ]
+        )
+        session.request = AsyncMock()
+        api = AsyncApiV4(session=session)
+        device_sn = [f"BZP{idx:07d}" for idx in range(250)]
+
+        energy = await api.energy(device_sn=device_sn, device_type=DeviceType.MIN)
+
+        self.assertEqual(device_sn, [device.device_sn for device in energy.data.devices])
+        # all chunks are requested together
+        session.request_many.assert_awaited_once()
+        self.assertEqual(3, len(session.request_many.call_args.args[0]))
+        session.request.assert_not_awaited()
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from growatt_public_api import AsyncGrowattApi, AsyncGrowattApiSession, DeviceType, ConnectionSettings
+from growatt_public_api.async_growatt_api import AsyncMin, AsyncDevice
+from growatt_public_api.device import Device, DeviceTypeIndex
+from growatt_public_api.pydantic_models import MinDetails
+
+
+class TestAsyncGrowattApiSession(unittest.IsolatedAsyncioTestCase):
+    """
+    run AsyncGrowattApiSession against a local server
+    """
+
+    async def asyncSetUp(self):
+        self.received = []
+
+        async def handler(request: web.Request):
+            self.received.append(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "query": dict(request.query),
+                    "data": dict(await request.post()),
+                    "token": request.headers.get("token"),
+                }
+            )
+            if request.path.endswith("rate_limited"):
+                return web.json_response({"error_code": 10012, "error_msg": None, "data": None})
+            return web.json_response({"error_code": 0, "error_msg": None, "data": {"foo": "bar"}})
+
+        app = web.Application()
+        app.router.add_route("*", "/v4/{tail:.*}", handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.session = AsyncGrowattApiSession(
+            token="test_token", server_url=str(self.server.make_url("")).rstrip("/"), use_cache=False
+        )
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.server.close()
+
+    async def test_get(self):
+        response = await self.session.get(endpoint="some/endpoint", params={"a": 1, "b": None, "c": True})
+        self.assertEqual({"foo": "bar"}, response["data"])
+        self.assertEqual("GET", self.received[0]["method"])
+        self.assertEqual("/v4/some/endpoint", self.received[0]["path"])
+        self.assertEqual({"a": "1", "c": "True"}, self.received[0]["query"])
+        self.assertEqual("test_token", self.received[0]["token"])
+
+    async def test_post(self):
+        await self.session.post(endpoint="some/endpoint", data={"device_sn": "ABC", "page": None})
+        self.assertEqual("POST", self.received[0]["method"])
+        self.assertEqual({"device_sn": "ABC"}, self.received[0]["data"])
+
+    async def test_error_message(self):
+        response = await self.session.get(endpoint="rate_limited")
+        self.assertEqual(10012, response["error_code"])
+        self.assertEqual(AsyncGrowattApiSession.generic_error_message(10012), response["error_msg"])
+
+
+class TestAsyncApi(unittest.IsolatedAsyncioTestCase):
+    """
+    async device APIs re-use the sync implementation (executed on the event loop, awaiting its requests)
+    """
+
+    async def test_single_request(self):
+        session = AsyncGrowattApiSession(token="test_token", use_cache=False)
+        session.request = AsyncMock(
+            return_value={"error_code": 0, "error_msg": None, "data": {"alias": "BZP0000000", "children": []}}
+        )
+        api = AsyncMin(session=session, device_sn="BZP0000000")
+
+        details = await api.details()
+
+        self.assertIsInstance(details, MinDetails)
+        self.assertEqual("BZP0000000", details.data.alias)
+        session.request.assert_awaited_once()
+        self.assertEqual("device/tlx/tlx_data_info", session.request.call_args.kwargs["endpoint"])
+        self.assertEqual({"device_sn": "BZP0000000"}, session.request.call_args.kwargs["params"])
+
+    async def test_no_worker_threads(self):
+        session = AsyncGrowattApiSession(
+            token="test_token", use_cache=False, connection=ConnectionSettings(pool_maxsize=2)
+        )
+        calls = 10
+        all_sent = asyncio.Event()
+        threads = set()
+
+        async def request(**kwargs):
+            threads.add(threading.current_thread())
+            if session.request.await_count == calls:
+                all_sent.set()
+            await asyncio.wait_for(all_sent.wait(), timeout=5)
+            return {
+                "error_code": 0,
+                "error_msg": None,
+                "data": {"alias": kwargs["params"]["device_sn"], "children": []},
+            }
+
+        session.request = AsyncMock(side_effect=request)
+        device_sns = [f"BZP{idx:07d}" for idx in range(calls)]
+        details = await asyncio.gather(*[AsyncMin(session=session, device_sn=sn).details() for sn in device_sns])
+
+        # concurrent calls are not limited by the number of worker threads
+        self.assertEqual(device_sns, [d.data.alias for d in details])
+        self.assertEqual(calls, session.request.await_count)
+        self.assertEqual({threading.current_thread()}, threads)
+        self.assertIsNone(session._thread_pool)
+
+    async def test_cancel(self):
+        session = AsyncGrowattApiSession(token="test_token", use_cache=False)
+        sent = asyncio.Event()
+
+        async def request(**kwargs):
+            sent.set()
+            await asyncio.sleep(60)
+
+        session.request = AsyncMock(side_effect=request)
+        task = asyncio.create_task(AsyncMin(session=session, device_sn="BZP0000000").details())
+        await sent.wait()
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        session.request.assert_awaited_once()
+
+    async def test_multiple_requests(self):
+        session = AsyncGrowattApiSession(token="test_token", use_cache=False)
+        session.request = AsyncMock(
+            side_effect=[
+                # device.type_info() -> unknown type
+                {"result": 1, "deviceType": 0},
+                # device.list()
+                {
+                    "code": 0,
+                    "message": None,
+                    "data": {"data": [{"deviceSn": "BZP0000000", "deviceType": "min"}], "lastPager": True},
+                },
+            ]
+        )
+        # empty (but up-to-date) device type index - search device
+        device_type_index = DeviceTypeIndex()
+        device_type_index.update({}, complete=True)
+        api = AsyncDevice(session=session, device_type_index=device_type_index)
+
+        with patch.object(
+            Device, "_search_device_type", autospec=True, side_effect=Device._search_device_type
+        ) as search:
+            device_type = await api.get_device_type(device_sn="BZP0000000")
+
+        self.assertEqual(DeviceType.MIN, device_type)
+        self.assertEqual(2, session.request.await_count)
+        # executed in a worker thread (escape hatch for dependent requests), not once for each request
+        search.assert_called_once()
+        self.assertEqual("new-api/queryDeviceList", session.request.call_args.kwargs["endpoint"])
+
+    async def test_api_for_device(self):
+        api = AsyncGrowattApi(token="test_token", use_cache=False)
+        device_api = await api.api_for_device(device_sn="BZP0000000", device_type=DeviceType.MIN)
+        self.assertIsInstance(device_api, AsyncMin)
+        self.assertEqual("BZP0000000", device_api.device_sn)
+        await api.close()
@@ -0,0 +1,164 @@
+import json
+import tempfile
+import time
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from growatt_public_api import GrowattApi, DeviceType, HistoryBackfill, RateLimit, BackfillError
+from growatt_public_api.backfill import history_windows
+
+RECORDS_PER_DAY = 3
+
+
+def _history_response(data: dict) -> dict:
+    start_date = date.fromisoformat(data["start_date"])
+    end_date = date.fromisoformat(data["end_date"])
+    records = [
+        {"time": (datetime(d.year, d.month, d.day) + timedelta(hours=hour)).isoformat(sep=" ")}
+        for d in (start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1))
+        for hour in range(RECORDS_PER_DAY)
+    ]
+    page, limit = data["page"], data["perpage"]
+    return {
+        "error_code": 0,
+        "error_msg": None,
+        "data": {"count": len(records), "tlx_sn": data["tlx_sn"], "datas": records[(page - 1) * limit : page * limit]},
+    }
+
+
+class TestHistoryBackfill(unittest.TestCase):
+    """
+    history of multiple devices for arbitrary date ranges
+    """
+
+    DEVICES = {"BZP0000000": DeviceType.MIN, "BZP0000001": DeviceType.MIN}
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_file = Path(self.tmp_dir.name) / "checkpoint.json"
+        self.api = GrowattApi(token="test_token", use_cache=False)
+        self.api.session.request = MagicMock(side_effect=lambda **kwargs: _history_response(kwargs["data"]))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _backfill(self, **kwargs) -> HistoryBackfill:
+        kwargs = {
+            "api": self.api,
+            "devices": self.DEVICES,
+            "start_date": date(2025, 1, 1),
+            "end_date": date(2025, 1, 10),
+            "checkpoint_file": self.checkpoint_file,
+            "limit": 4,
+            "limits": {},
+            **kwargs,
+        }
+        return HistoryBackfill(**kwargs)
+
+    def test_windows(self):
+        self.assertEqual(
+            [(date(2025, 1, 1), date(2025, 1, 7)), (date(2025, 1, 8), date(2025, 1, 10))],
+            history_windows(date(2025, 1, 1), date(2025, 1, 10)),
+        )
+        self.assertEqual([(date(2025, 1, 1), date(2025, 1, 1))], history_windows(date(2025, 1, 1), date(2025, 1, 1)))
+
+    def test_backfill(self):
+        backfill = self._backfill()
+        records = list(backfill)
+        self.assertTrue(backfill.done)
+        self.assertEqual(2 * 10 * RECORDS_PER_DAY, len(records))
+        for device_sn in self.DEVICES:
+            times = [r.data.time for r in records if r.device_sn == device_sn]
+            # ordered by time, without duplicates
+            self.assertEqual(sorted(set(times)), times)
+            self.assertEqual(datetime(2025, 1, 10, 2), times[-1])
+        # 7 days = 21 records = 6 pages, 3 days = 9 records = 3 pages
+        self.assertEqual(2 * (6 + 3), self.api.session.request.call_count)
+        windows = {
+            (c.kwargs["data"]["start_date"], c.kwargs["data"]["end_date"])
+            for c in self.api.session.request.call_args_list
+        }
+        self.assertEqual({("2025-01-01", "2025-01-07"), ("2025-01-08", "2025-01-10")}, windows)
+
+    def test_resume(self):
+        records = []
+        for record in self._backfill():
+            records.append(record)
+            if len(records) == 30:
+                break
+        # resumed from checkpoint
+        resumed = self._backfill()
+        records.extend(resumed)
+        self.assertTrue(resumed.done)
+        unique = {(r.device_sn, r.data.time) for r in records}
+        self.assertEqual(2 * 10 * RECORDS_PER_DAY, len(unique))
+        # only records of the interrupted page are returned again
+        self.assertLessEqual(len(records) - len(unique), 4)
+        # nothing left
+        self.assertEqual([], list(self._backfill()))
+
+    def test_checkpoint_other_range(self):
+        list(self._backfill())
+        with self.assertRaises(ValueError):
+            self._backfill(end_date=date(2025, 1, 11))
+
+    def test_rate_limits(self):
+        limits = {"device/tlx/tlx_data": [RateLimit(calls=1, period=timedelta(seconds=0.05), per_device=True)]}
+        request_times = {}
+        responses = {"BZP0000000": [{"error_code": 10012, "error_msg": None, "data": None}]}
+
+        def request(**kwargs):
+            device_sn = kwargs["data"]["tlx_sn"]
+            request_times.setdefault(device_sn, []).append(time.monotonic())
+            if responses.get(device_sn):
+                return responses[device_sn].pop(0)
+            return _history_response(kwargs["data"])
+
+        self.api.session.request = MagicMock(side_effect=request)
+        records = list(self._backfill(end_date=date(2025, 1, 2), limits=limits))
+        self.assertEqual(2 * 2 * RECORDS_PER_DAY, len(records))
+        # rate limited request is retried
+        self.assertEqual(3, len(request_times["BZP0000000"]))
+        self.assertEqual(2, len(request_times["BZP0000001"]))
+        for times in request_times.values():
+            self.assertTrue(all(t2 - t1 >= 0.04 for t1, t2 in zip(times, times[1:])))
+
+    def test_error(self):
+        error = {"error_code": 10001, "error_msg": "system error", "data": None}
+        responses = {"BZP0000000": [error, error]}
+
+        def request(**kwargs):
+            device_sn = kwargs["data"]["tlx_sn"]
+            if responses.get(device_sn):
+                return responses[device_sn].pop(0)
+            return _history_response(kwargs["data"])
+
+        self.api.session.request = MagicMock(side_effect=request)
+        records = list(self._backfill(end_date=date(2025, 1, 2)))
+        # failed page is retried (instead of skipping the window)
+        self.assertEqual(2 * 2 * RECORDS_PER_DAY, len(records))
+        self.assertEqual(2 * 2 + 2, self.api.session.request.call_count)
+
+    def test_give_up(self):
+        def request(**kwargs):
+            if kwargs["data"]["tlx_sn"] == "BZP0000000" and kwargs["data"]["start_date"] == "2025-01-08":
+                return {"error_code": 10001, "error_msg": "system error", "data": None}
+            return _history_response(kwargs["data"])
+
+        self.api.session.request = MagicMock(side_effect=request)
+        with self.assertRaises(BackfillError):
+            list(self._backfill(max_retries=2))
+        # checkpoint still points to the failed window
+        checkpoint = json.loads(self.checkpoint_file.read_text())
+        self.assertEqual({"window_start": "2025-01-08", "page": 1}, checkpoint["devices"]["BZP0000000"])
+        # resumed from failed window
+        self.api.session.request = MagicMock(side_effect=lambda **kwargs: _history_response(kwargs["data"]))
+        records = list(self._backfill())
+        self.assertEqual(3 * RECORDS_PER_DAY, len([r for r in records if r.device_sn == "BZP0000000"]))
+
+    def test_unsupported_device_type(self):
+        backfill = self._backfill(devices={"0PVP000000": DeviceType.NOAH})
+        self.assertEqual([], list(backfill))
+        self.api.session.request.assert_not_called()
@@ -0,0 +1,93 @@
+import unittest
+from typing import Union
+from unittest.mock import MagicMock
+
+from growatt_public_api import GrowattApi, DeviceType
+from growatt_public_api.columnar import HistoryColumns
+from growatt_public_api.pydantic_models.api_model import ApiModel, EmptyStrToNone
+from growatt_public_api.pydantic_models.min import MinEnergyOverviewData
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+MIN_RECORDS = [
+    {"time": "2025-01-01 10:00:00", "ppv": 1200.5, "eacToday": "3.2", "bdc1Mode": 1, "again": True, "tlxBean": None},
+    {"time": "2025-01-01 10:05:00", "ppv": "", "eacToday": 3.4, "bdc1Mode": None, "again": False, "alias": "min 1"},
+    {"time": None, "ppv": 1300.0, "eacToday": 3.6, "bdc1Mode": 2, "again": "null"},
+]
+NOAH_RECORDS = [
+    {"time": 1735725600000, "ppv": 250.0, "totalBatteryPackSoc": 55},
+    {"time": 1735725900000, "ppv": 251.0, "totalBatteryPackSoc": 56},
+]
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestColumnar(unittest.TestCase):
+    """
+    history records are converted to columns without creating a model per record
+    """
+
+    def setUp(self):
+        self.api = GrowattApi(token="test_token", use_cache=False)
+
+    def test_v1(self):
+        self.api.session.request = MagicMock(
+            return_value={"error_code": 0, "error_msg": None, "data": {"count": 3, "datas": MIN_RECORDS}}
+        )
+        result = self.api.min.energy_history_columns(device_sn="BZP0000000")
+        self.assertEqual(0, result.error_code)
+        columns = result.columns
+        self.assertEqual(set(MinEnergyOverviewData.model_fields), set(columns))
+        np.testing.assert_array_equal(
+            np.array(["2025-01-01T10:00:00", "2025-01-01T10:05:00", "NaT"], dtype="datetime64[ms]"), columns["time"]
+        )
+        np.testing.assert_array_equal(np.array([1200.5, np.nan, 1300.0]), columns["ppv"])
+        np.testing.assert_array_equal(np.array([3.2, 3.4, 3.6]), columns["eac_today"])
+        # missing int/bool values are masked
+        self.assertEqual(np.int64, columns["bdc1_mode"].dtype)
+        self.assertEqual([1, None, 2], columns["bdc1_mode"].tolist())
+        self.assertEqual([True, False, None], columns["again"].tolist())
+        self.assertEqual([None, "min 1", None], columns["alias"].tolist())
+        # field not in any record
+        self.assertTrue(np.isnan(columns["pac"]).all())
+
+    def test_same_values_as_model(self):
+        self.api.session.request = MagicMock(
+            return_value={"error_code": 0, "error_msg": None, "data": {"count": 3, "datas": MIN_RECORDS}}
+        )
+        columns = self.api.min.energy_history_columns(device_sn="BZP0000000").columns
+        models = self.api.min.energy_history(device_sn="BZP0000000").data.datas
+        for field in ("ppv", "eac_today", "bdc1_mode", "again", "alias"):
+            values = [None if v is np.ma.masked or v != v else v for v in columns[field].tolist()]
+            self.assertEqual([getattr(model, field) for model in models], values, field)
+
+    def test_model_not_built(self):
+        class DeferredData(ApiModel):
+            eac_today: Union[EmptyStrToNone, float] = None
+
+        # validators (and aliases) are built on first use
+        self.assertFalse(DeferredData.__pydantic_complete__)
+        history = HistoryColumns.from_response(
+            {"error_code": 0, "error_msg": "", "data": {"datas": [{"eacToday": "1.5"}]}}, model=DeferredData
+        )
+        self.assertEqual([1.5], history.columns["eac_today"].tolist())
+
+    def test_v4(self):
+        self.api.session.request = MagicMock(
+            return_value={"code": 0, "message": "", "data": {"datas": NOAH_RECORDS, "haveNext": False}}
+        )
+        result = self.api.noah.energy_history_columns_v4(device_sn="0PVP000000", fields=["time", "ppv"])
+        self.assertEqual({"time", "ppv"}, set(result.columns))
+        np.testing.assert_array_equal(
+            np.array(["2025-01-01T10:00:00", "2025-01-01T10:05:00"], dtype="datetime64[ms]"), result.columns["time"]
+        )
+        np.testing.assert_array_equal(np.array([250.0, 251.0]), result.columns["ppv"])
+        self.assertEqual("queryHistoricalData", self.api.session.request.call_args.kwargs["endpoint"].split("/")[-1])
+        self.assertEqual(DeviceType.NOAH.value, self.api.session.request.call_args.kwargs["params"]["deviceType"])
+
+    def test_error(self):
+        self.api.session.request = MagicMock(return_value={"code": 102, "message": "rate limit", "data": None})
+        result = self.api.api_v4.energy_history_columns(device_sn="0PVP000000", device_type=DeviceType.NOAH)
+        self.assertEqual((102, "rate limit", {}), tuple(result))
@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from growatt_public_api import GrowattApi, AsyncGrowattApi, ConnectionSettings
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if "slow" in self.path:
+            time.sleep(0.5)
+        self.server.client_ports.add(self.client_address[1])
+        body = json.dumps({"code": 0, "message": "", "data": None}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestConnection(unittest.TestCase):
+    """
+    connection pool, timeouts and keep-alive (against a local server)
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.server.daemon_threads = True
+        cls.server.client_ports = set()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.server_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.client_ports.clear()
+
+    def _requests(self, api: GrowattApi, count: int = 5):
+        session = api.session
+        return session.request_many(
+            [{"endpoint": "new-api/queryDeviceList", "method": "POST", "data": {"page": i}} for i in range(count)],
+            max_workers=1,
+        )
+
+    def test_defaults(self):
+        api = GrowattApi(token="test_token", server_url=self.server_url, use_cache=False)
+        adapter = api.session.session.get_adapter(self.server_url)
+        self.assertEqual(ConnectionSettings().pool_maxsize, adapter._pool_maxsize)
+        self.assertEqual((10.0, 60.0), api.session.connection.timeout)
+
+    def test_keep_alive(self):
+        api = GrowattApi(token="test_token", server_url=self.server_url, use_cache=False)
+        self.assertEqual(5, len(self._requests(api)))
+        # connection is reused
+        self.assertEqual(1, len(self.server.client_ports))
+
+    def test_no_keep_alive(self):
+        api = GrowattApi(
+            token="test_token",
+            server_url=self.server_url,
+            use_cache=False,
+            connection=ConnectionSettings(keep_alive=False),
+        )
+        self._requests(api)
+        self.assertEqual(5, len(self.server.client_ports))
+
+    def test_read_timeout(self):
+        api = GrowattApi(
+            token="test_token",
+            server_url=self.server_url,
+            use_cache=False,
+            connection=ConnectionSettings(read_timeout=0.1),
+        )
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            api.session.post(endpoint="slow")
+
+
+class TestAsyncConnection(unittest.IsolatedAsyncioTestCase):
+    async def test_settings(self):
+        api = AsyncGrowattApi(
+            token="test_token",
+            use_cache=False,
+            connection=ConnectionSettings(pool_maxsize=4, pool_block=True, connect_timeout=1, read_timeout=2),
+        )
+        try:
+            client_session = api.session._client_session()
+            self.assertEqual(4, client_session.connector.limit)
+            self.assertEqual(1, client_session.timeout.sock_connect)
+            self.assertEqual(2, client_session.timeout.sock_read)
+        finally:
+            await api.close()
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import growatt_public_api
+from growatt_public_api import GrowattApi, warm_up
+from growatt_public_api.pydantic_models.api_model import DEFER_BUILD
+from growatt_public_api.pydantic_models.pcs import PcsDetails, PcsDetailData
+
+
+def _run(code: str, **env) -> str:
+    cwd = os.path.dirname(os.path.dirname(growatt_public_api.__file__))
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=cwd, env={**os.environ, **env}, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@unittest.skipUnless(DEFER_BUILD, "GROWATT_DEFER_BUILD=0")
+class TestDeferredBuild(unittest.TestCase):
+    """
+    validators are built on first use (or by warm_up())
+    """
+
+    def test_deferred(self):
+        code = (
+            "from growatt_public_api.pydantic_models.pcs import PcsDetails; "
+            "print(PcsDetails.__pydantic_complete__); "
+            "PcsDetails.model_validate({'error_code': 0, 'error_msg': '', 'data': None}); "
+            "print(PcsDetails.__pydantic_complete__)"
+        )
+        self.assertEqual("False\nTrue", _run(code))
+        self.assertEqual("True\nTrue", _run(code, GROWATT_DEFER_BUILD="0"))
+
+    def test_parsing_modes_in_fresh_process(self):
+        # aliases are only known once a model is built - each mode must work before any model was validated
+        code = "; ".join(
+            [
+                "from growatt_public_api.pydantic_models import lazy_validate, raw_response, fast_validate",
+                "from growatt_public_api.pydantic_models.min import MinEnergyHistory, MinEnergyOverviewData",
+                "from growatt_public_api.pydantic_models.api_v4 import MinEnergyV4, MinEnergyHistoryV4",
+                "from growatt_public_api.columnar import to_columns",
+                "raw = {'error_code': 0, 'error_msg': '', 'data': {'count': 1, 'datas': [{'eacToday': '1.5'}]}}",
+                "print(lazy_validate(MinEnergyHistory, raw).data.datas[0].eac_today)",
+                "print(lazy_validate(MinEnergyV4, {'code': 0, 'message': '', 'data': None}).error_code)",
+                "print(to_columns([{'eacToday': '1.5'}], MinEnergyOverviewData, ['eac_today'])['eac_today'][0])",
+                "print(fast_validate(MinEnergyHistory, raw).data.datas[0].eac_today)",
+                "print(raw_response(MinEnergyHistoryV4, {'code': 0, 'message': '', 'data': None})['error_code'])",
+            ]
+        )
+        self.assertEqual(["1.5", "0", "1.5", "1.5", "0"], _run(code).splitlines())
+
+    def test_warm_up_api(self):
+        models = warm_up(GrowattApi(token="test_token", use_cache=False).pcs)
+        self.assertIn(PcsDetails, models)
+        self.assertNotIn(PcsDetailData, models)  # nested models are part of PcsDetails' validator
+        self.assertTrue(all(model.__pydantic_complete__ for model in models))
+
+    def test_warm_up_models(self):
+        self.assertEqual([PcsDetailData], warm_up(PcsDetailData))
+        self.assertTrue(PcsDetailData.__pydantic_complete__)
@@ -0,0 +1,126 @@
+import os
+import subprocess
+import sys
+import unittest
+from typing import Optional, List, Union
+from unittest.mock import MagicMock
+
+import growatt_public_api
+from growatt_public_api import GrowattApi, AsyncGrowattApi, DeviceType
+from growatt_public_api.async_growatt_api import AsyncApi, AsyncMin
+from growatt_public_api.device_registry import (
+    DEVICE_FAMILIES,
+    DeviceFamily,
+    register_device_family,
+    device_api_class,
+    v4_model,
+)
+from growatt_public_api.groboost import Groboost
+from growatt_public_api.min import Min
+from growatt_public_api.pydantic_models.api_model import NewApiResponse, ApiModel
+from growatt_public_api.pydantic_models.api_v4 import MinDetailsV4, NoahEnergyHistoryV4
+
+
+class GroboostDetailDataV4(ApiModel):
+    device_sn: Optional[str] = None
+
+
+class GroboostDetailsV4(NewApiResponse):
+    data: Union[None, dict[str, List[GroboostDetailDataV4]]] = None
+
+
+class MyGroboost(Groboost):
+    pass
+
+
+class TestDeviceRegistry(unittest.TestCase):
+    """
+    device specific API and v4 response models by device type
+    """
+
+    def setUp(self):
+        self.api = GrowattApi(token="test_token", use_cache=False)
+        self._families = dict(DEVICE_FAMILIES)
+
+    def tearDown(self):
+        for device_type, family in self._families.items():
+            register_device_family(device_type, family)
+        DEVICE_FAMILIES.pop("new-type", None)
+
+    def test_builtin(self):
+        self.assertIs(MinDetailsV4, v4_model(DeviceType.MIN, "details_v4"))
+        self.assertIs(NoahEnergyHistoryV4, v4_model(DeviceType.NOAH, "energy_history_v4"))
+        self.assertIs(Min, device_api_class(DeviceType.MIN))
+        # not supported by v4 API
+        with self.assertRaises(ValueError):
+            v4_model(DeviceType.HPS, "details_v4")
+        self.assertIsNone(device_api_class(DeviceType.OTHER))
+
+    def test_api_v4(self):
+        self.api.session.request = MagicMock(return_value={"code": 0, "message": "", "data": {"min": []}})
+        self.assertIsInstance(self.api.api_v4.details(device_sn="BZP0000000", device_type="min"), MinDetailsV4)
+        # unsupported device types are rejected before sending any request
+        self.api.session.request.reset_mock()
+        with self.assertRaises(ValueError):
+            self.api.api_v4.details(device_sn="BZP0000000", device_type=DeviceType.PCS)
+        with self.assertRaises(ValueError):
+            self.api.api_v4.energy_history(device_sn="BZP0000000", device_type=DeviceType.PCS)
+        with self.assertRaises(ValueError):
+            self.api.api_v4.energy_history_multiple(device_sn="BZP0000000", device_type=DeviceType.HPS)
+        with self.assertRaises(ValueError):
+            self.api.api_v4.power(device_sn="BZP0000000", device_type="unknown-type")
+        self.api.session.request.assert_not_called()
+
+    def test_register(self):
+        register_device_family(DeviceType.GROBOOST, DeviceFamily(api_class=MyGroboost, details_v4=GroboostDetailsV4))
+        self.api.session.request = MagicMock(
+            return_value={"code": 0, "message": "", "data": {"groboost": [{"deviceSn": "GRO0000000"}]}}
+        )
+        details = self.api.api_v4.details(device_sn="GRO0000000", device_type=DeviceType.GROBOOST)
+        self.assertEqual("GRO0000000", details.data["groboost"][0].device_sn)
+        device_api = self.api.api_for_device(device_sn="GRO0000000", device_type=DeviceType.GROBOOST)
+        self.assertIsInstance(device_api, MyGroboost)
+        self.assertEqual("GRO0000000", device_api.device_sn)
+
+    def test_register_new_type(self):
+        # device types not known by DeviceType, classes imported on first use
+        register_device_family(
+            "new-type", DeviceFamily(api_class=f"{__name__}:MyGroboost", details_v4=f"{__name__}:GroboostDetailsV4")
+        )
+        self.api.session.request = MagicMock(
+            return_value={"code": 0, "message": "", "data": {"new-type": [{"deviceSn": "NEW0000000"}]}}
+        )
+        details = self.api.api_v4.details(device_sn="NEW0000000", device_type="new-type")
+        self.assertIsInstance(details, GroboostDetailsV4)
+        self.assertEqual("new-type", self.api.session.request.call_args.kwargs["params"]["deviceType"])
+        self.assertIsInstance(self.api.api_for_device(device_sn="NEW0000000", device_type="new-type"), MyGroboost)
+        with self.assertRaises(ValueError):
+            self.api.api_v4.energy(device_sn="NEW0000000", device_type="new-type")
+
+    def test_models_imported_on_first_use(self):
+        code = (
+            "import sys; from growatt_public_api.device_registry import v4_model; "
+            "print('growatt_public_api.pydantic_models.api_v4' in sys.modules); "
+            "print(v4_model('min', 'details_v4').__name__)"
+        )
+        cwd = os.path.dirname(os.path.dirname(growatt_public_api.__file__))
+        output = subprocess.run([sys.executable, "-c", code], cwd=cwd, check=True, capture_output=True, text=True)
+        self.assertEqual(["False", "MinDetailsV4"], output.stdout.split())
+
+
+class TestAsyncDeviceRegistry(unittest.IsolatedAsyncioTestCase):
+    async def test_api_for_device(self):
+        families = dict(DEVICE_FAMILIES)
+        api = AsyncGrowattApi(token="test_token", use_cache=False)
+        try:
+            self.assertIsInstance(
+                await api.api_for_device(device_sn="BZP0000000", device_type=DeviceType.MIN), AsyncMin
+            )
+            register_device_family(DeviceType.GROBOOST, DeviceFamily(api_class=MyGroboost))
+            device_api = await api.api_for_device(device_sn="GRO0000000", device_type=DeviceType.GROBOOST)
+            self.assertIsInstance(device_api, AsyncApi)
+            self.assertIs(MyGroboost, device_api._api_class)
+            self.assertEqual("GRO0000000", device_api.device_sn)
+        finally:
+            register_device_family(DeviceType.GROBOOST, families[DeviceType.GROBOOST.value])
+            await api.close()
@@ -0,0 +1,277 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, AsyncMock
+
+from growatt_public_api import GrowattApi, AsyncGrowattApi, DeviceType, ResponseCache
+from growatt_public_api.device import DeviceTypeIndex
+
+V4_DEVICES = [{"deviceSn": f"BZP{idx:07d}", "deviceType": "min"} for idx in range(150)] + [
+    {"deviceSn": "0PVP000000", "deviceType": "noah"}
+]
+PLANTS = [{"plant_id": 1}, {"plant_id": 2}]
+PLANT_DEVICES = {
+    1: [{"device_sn": "BZP0000000", "type": 7}, {"device_sn": "PCS0000000", "type": 8}],
+    2: [{"device_sn": "QMN0000000", "type": 3}],
+}
+
+
+def _plant(plant_id: int) -> dict:
+    return {
+        "plant_id": plant_id,
+        "city": "",
+        "country": "",
+        "create_date": None,
+        "installer": None,
+        "latitude_d": None,
+        "latitude_f": None,
+        "name": "test plant",
+        "operator": None,
+        "peak_power": 1.0,
+        "status": 1,
+        "user_id": 1,
+    }
+
+
+def _response(endpoint: str, params: dict) -> dict:
+    if endpoint == "new-api/queryDeviceList":
+        page = params["page"]
+        devices = V4_DEVICES[(page - 1) * 100 : page * 100]
+        return {"code": 0, "message": "", "data": {"data": devices, "lastPager": page * 100 >= len(V4_DEVICES)}}
+    if endpoint == "plant/list":
+        plants = [_plant(plant["plant_id"]) for plant in PLANTS]
+        return {"error_code": 0, "error_msg": "", "data": {"count": len(plants), "plants": plants}}
+    if endpoint == "device/list":
+        devices = PLANT_DEVICES[params["plant_id"]]
+        return {"error_code": 0, "error_msg": "", "data": {"count": len(devices), "devices": devices}}
+    if endpoint == "device/check/sn":
+        device_type = 16 if params["dataloggerSn"] == "INV0000000" else 0
+        return {"result": 1, "deviceType": device_type}
+    if endpoint == "device/sn_plant":
+        return {"error_code": 10005, "error_msg": "", "data": None}
+    raise AssertionError(f"unexpected request to {endpoint}")
+
+
+class _DeviceTypeIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        DeviceTypeIndex._instances.clear()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(folder=Path(self.tmp_dir.name))
+
+    def tearDown(self):
+        DeviceTypeIndex._instances.clear()
+        self.tmp_dir.cleanup()
+
+    def _api(self) -> GrowattApi:
+        api = GrowattApi(token="test_token", cache=self.cache)
+        api.session.request = MagicMock(side_effect=lambda **kwargs: _response(kwargs["endpoint"], kwargs["params"]))
+        return api
+
+    @staticmethod
+    def _endpoints(api) -> list:
+        return [c.kwargs["endpoint"] for c in api.session.request.call_args_list]
+
+
+class TestDeviceTypeIndex(_DeviceTypeIndexTestCase):
+    """
+    device types are resolved from an index filled by a single walk of all device lists (or the device list of a plant)
+    """
+
+    def test_single_walk(self):
+        api = self._api()
+        self.assertEqual(DeviceType.MIN, api.device.get_device_type("BZP0000042"))
+        self.assertEqual(
+            ["new-api/queryDeviceList", "new-api/queryDeviceList", "plant/list", "device/list", "device/list"],
+            self._endpoints(api),
+        )
+        # further lookups without any request
+        api.session.request.reset_mock()
+        self.assertEqual(DeviceType.MIN, api.device.get_device_type("BZP0000149"))
+        self.assertEqual(DeviceType.NOAH, api.device.get_device_type("0PVP000000"))
+        self.assertEqual(DeviceType.PCS, api.device.get_device_type("PCS0000000"))
+        self.assertEqual([], self._endpoints(api))
+
+    def test_plant_id(self):
+        api = self._api()
+        # only the device list of the given plant is read
+        self.assertEqual(DeviceType.PCS, api.device.get_device_type("PCS0000000", plant_id=1))
+        self.assertEqual(["device/list"], self._endpoints(api))
+        # other devices of the plant are indexed, index hits do not trigger a walk of all device lists
+        api.session.request.reset_mock()
+        self.assertEqual(DeviceType.MIN, api.device.get_device_type("BZP0000000"))
+        self.assertEqual([], self._endpoints(api))
+        self.assertTrue(api.device.device_type_index.is_stale)
+        # device not in given plant - all device lists are walked
+        self.assertEqual(DeviceType.NOAH, api.device.get_device_type("0PVP000000", plant_id=2))
+        self.assertEqual(
+            [
+                "device/list",
+                "new-api/queryDeviceList",
+                "new-api/queryDeviceList",
+                "plant/list",
+                "device/list",
+                "device/list",
+            ],
+            self._endpoints(api),
+        )
+        self.assertFalse(api.device.device_type_index.is_stale)
+
+    def test_fallback(self):
+        api = self._api()
+        api.device.get_device_type("BZP0000000")
+        api.session.request.reset_mock()
+        # not in device lists
+        self.assertEqual(DeviceType.INVERTER, api.device.get_device_type("INV0000000"))
+        self.assertEqual(["device/check/sn"], self._endpoints(api))
+        # but added to index
+        api.session.request.reset_mock()
+        self.assertEqual(DeviceType.INVERTER, api.device.get_device_type("INV0000000"))
+        self.assertEqual([], self._endpoints(api))
+
+    def test_persisted(self):
+        self._api().device.get_device_type("BZP0000000")
+        # new process
+        DeviceTypeIndex._instances.clear()
+        api = self._api()
+        self.assertEqual(DeviceType.NOAH, api.device.get_device_type("0PVP000000"))
+        self.assertEqual([], self._endpoints(api))
+
+    def test_background_refresh(self):
+        api = self._api()
+        api.device.get_device_type("BZP0000000")
+        index = api.device.device_type_index
+        index.updated = time.time() - 2 * index.max_age.total_seconds()
+        V4_DEVICES.append({"deviceSn": "WIT0000000", "deviceType": "wit"})
+        try:
+            # stale index is still used
+            self.assertEqual(DeviceType.MIN, api.device.get_device_type("BZP0000000"))
+            index._refresh_thread.join(timeout=5)
+            self.assertFalse(index.is_stale)
+            self.assertEqual(DeviceType.WIT, index.get("WIT0000000"))
+        finally:
+            V4_DEVICES.pop()
+
+    def test_incomplete(self):
+        api = self._api()
+
+        def request(**kwargs):
+            if kwargs["endpoint"] == "device/list" and kwargs["params"]["plant_id"] == 1:
+                return {"error_code": 10012, "error_msg": "error_frequently_access", "data": None}
+            return _response(kwargs["endpoint"], kwargs["params"])
+
+        api.session.request.side_effect = request
+        self.assertEqual(DeviceType.MIN, api.device.get_device_type("BZP0000042"))
+        index = api.device.device_type_index
+        # remaining plants are still read, found devices are indexed, but the index is not marked as complete
+        self.assertEqual(["device/list", "device/list"], self._endpoints(api)[-2:])
+        self.assertIn("BZP0000149", index)
+        self.assertTrue(index.is_stale)
+        self.assertFalse(index.refresh_due)
+        # missing devices are still searched in the device lists (without another full refresh)
+        api.session.request.reset_mock(side_effect=True)
+        api.session.request.side_effect = lambda **kwargs: _response(kwargs["endpoint"], kwargs["params"])
+        self.assertEqual({"PCS0000000": DeviceType.PCS}, api.device.get_device_types(["PCS0000000"]))
+        self.assertEqual(
+            ["device/check/sn"] + ["new-api/queryDeviceList"] * 2 + ["plant/list", "device/list"],
+            self._endpoints(api),
+        )
+        self.assertTrue(index.is_stale)
+        # refreshed after retry interval
+        index.failed -= index.retry_interval.total_seconds()
+        api.device.get_device_types(["BZP0000042"])
+        self.assertFalse(index.is_stale)
+
+
+class TestGetDeviceTypes(_DeviceTypeIndexTestCase):
+    """
+    device types of multiple devices are resolved using each source at most once
+    """
+
+    def test_index_built(self):
+        api = self._api()
+        device_types = api.device.get_device_types(["BZP0000000", "0PVP000000", "INV0000000", "XXX0000000"])
+        self.assertEqual(
+            {
+                "BZP0000000": DeviceType.MIN,
+                "0PVP000000": DeviceType.NOAH,
+                "INV0000000": DeviceType.INVERTER,
+                "XXX0000000": None,
+            },
+            device_types,
+        )
+        # device lists are not walked again after building the index
+        self.assertEqual(
+            ["new-api/queryDeviceList"] * 2 + ["plant/list"] + ["device/list"] * 2 + ["device/check/sn"] * 2,
+            self._endpoints(api),
+        )
+
+    def test_devices_added(self):
+        api = self._api()
+        api.device.get_device_type("BZP0000000")
+        api.session.request.reset_mock()
+        V4_DEVICES.extend({"deviceSn": f"WIT{idx:07d}", "deviceType": "wit"} for idx in range(3))
+        PLANT_DEVICES[2].append({"device_sn": "HPS0000000", "type": 9})
+        try:
+            device_types = api.device.get_device_types(["WIT0000000", "WIT0000001", "WIT0000002", "HPS0000000"])
+        finally:
+            del V4_DEVICES[-3:]
+            PLANT_DEVICES[2].pop()
+        self.assertEqual([DeviceType.WIT] * 3 + [DeviceType.HPS], list(device_types.values()))
+        # each source is used once for all devices
+        self.assertEqual(
+            ["device/check/sn"] * 4 + ["new-api/queryDeviceList"] * 2 + ["plant/list"] + ["device/list"] * 2,
+            self._endpoints(api),
+        )
+        # found devices are added to index
+        self.assertEqual(DeviceType.HPS, api.device.device_type_index.get("HPS0000000"))
+
+    def test_stop_when_all_found(self):
+        api = self._api()
+        api.device.get_device_type("BZP0000000")
+        api.session.request.reset_mock()
+        V4_DEVICES.insert(0, {"deviceSn": "WIT0000000", "deviceType": "wit"})
+        try:
+            self.assertEqual({"WIT0000000": DeviceType.WIT}, api.device.get_device_types(["WIT0000000"]))
+        finally:
+            V4_DEVICES.pop(0)
+        self.assertEqual(["device/check/sn", "new-api/queryDeviceList"], self._endpoints(api))
+
+
+class TestAsyncDeviceTypeIndex(unittest.IsolatedAsyncioTestCase):
+    """
+    async API shares the index of its session
+    """
+
+    def setUp(self):
+        DeviceTypeIndex._instances.clear()
+
+    def tearDown(self):
+        DeviceTypeIndex._instances.clear()
+
+    async def test_async(self):
+        api = AsyncGrowattApi(token="test_token", use_cache=False)
+
+        async def request(**kwargs):
+            return _response(kwargs["endpoint"], kwargs["params"])
+
+        api.session.request = MagicMock(side_effect=request)
+        self.assertEqual(DeviceType.MIN, await api.device.get_device_type("BZP0000042"))
+        calls = api.session.request.call_count
+        self.assertEqual(DeviceType.NOAH, await api.device.get_device_type("0PVP000000"))
+        self.assertEqual(calls, api.session.request.call_count)
+
+    async def test_async_get_device_types(self):
+        api = AsyncGrowattApi(token="test_token", use_cache=False)
+
+        async def request_many(requests_, max_workers=8):
+            return [_response(r["endpoint"], r["params"]) for r in requests_]
+
+        api.session.request = AsyncMock(side_effect=lambda **kwargs: _response(kwargs["endpoint"], kwargs["params"]))
+        api.session.request_many = AsyncMock(side_effect=request_many)
+        device_types = await api.device.get_device_types(["BZP0000042", "INV0000000", "XXX0000000"])
+        self.assertEqual(
+            {"BZP0000042": DeviceType.MIN, "INV0000000": DeviceType.INVERTER, "XXX0000000": None}, device_types
+        )
+        # type_info requested concurrently
+        self.assertEqual(1, api.session.request_many.call_count)
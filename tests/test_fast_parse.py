@@ -0,0 +1,100 @@
+import datetime
+import importlib
+import inspect
+import pkgutil
+import random
+import typing
+import unittest
+from unittest.mock import MagicMock
+
+from pydantic import BaseModel
+
+import growatt_public_api.pydantic_models
+from growatt_public_api import GrowattApi, enable_fast_parse
+from growatt_public_api.pydantic_models import fast_validate
+from growatt_public_api.pydantic_models.api_model import ApiModel
+from growatt_public_api.pydantic_models.min import MinEnergyHistory
+
+
+def _all_models() -> list:
+    models = []
+    for module_info in pkgutil.iter_modules(growatt_public_api.pydantic_models.__path__):
+        module = importlib.import_module(f"growatt_public_api.pydantic_models.{module_info.name}")
+        models.extend(
+            obj
+            for obj in vars(module).values()
+            if inspect.isclass(obj) and issubclass(obj, ApiModel) and obj.__module__ == module.__name__
+        )
+    return models
+
+
+def _raw_value(annotation: typing.Any, depth: int = 0) -> typing.Any:  # noqa: C901 '_raw_value' is too complex (15)
+    """random raw JSON value for a field, including empty values"""
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+    if origin is typing.Union:
+        return _raw_value(random.choice(args), depth)
+    if origin is typing.Annotated:
+        if args[0] is type(None):  # EmptyStrToNone
+            return random.choice(["", "null", "None", None])
+        return _raw_value(args[0], depth)
+    if origin in (list, dict) and depth < 3:
+        values = [_raw_value(args[-1], depth + 1) for _ in range(2)]
+        return values if origin is list else dict(zip(["a", "b"], values))
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel) and depth < 3:
+        return {(f.alias or n): _raw_value(f.annotation, depth + 1) for n, f in annotation.model_fields.items()}
+    if annotation is float:
+        return random.choice([1.5, "2.5", 0])
+    if annotation is int:
+        return random.choice([1, "3", 0])
+    if annotation is bool:
+        return random.choice([True, "false", 0])
+    if annotation is str:
+        return random.choice(["abc", "", "None"])
+    if annotation is datetime.datetime:
+        return random.choice(["2025-01-01 10:00:00", 1735725600000])
+    return None
+
+
+class TestFastParse(unittest.TestCase):
+    """
+    fast_validate() returns the same models as model_validate()
+    """
+
+    def tearDown(self):
+        enable_fast_parse(False)
+
+    def test_all_models(self):
+        random.seed(0)
+        for model in _all_models():
+            for _ in range(3):
+                raw = _raw_value(model)
+                try:
+                    expected = model.model_validate(raw)
+                except Exception as e:  # e.g. ValidationError (random values are not always valid)
+                    with self.assertRaises(type(e), msg=model.__name__):
+                        fast_validate(model, raw)
+                    continue
+                result = fast_validate(model, raw)
+                self.assertIs(model, type(result))
+                self.assertEqual(expected, result, model.__name__)
+
+    def test_empty_values(self):
+        raw = {
+            "error_code": 0,
+            "error_msg": "",
+            "data": {"count": 1, "tlx_sn": "None", "datas": [{"ppv": "", "pac": "null", "eacToday": "1.5"}]},
+        }
+        result = fast_validate(MinEnergyHistory, raw)
+        self.assertEqual(MinEnergyHistory.model_validate(raw), result)
+        self.assertIsNone(result.error_msg)
+        self.assertIsNone(result.data.datas[0].ppv)
+        self.assertEqual(1.5, result.data.datas[0].eac_today)
+
+    def test_enable(self):
+        api = GrowattApi(token="test_token", use_cache=False)
+        api.session.request = MagicMock(
+            return_value={"error_code": 0, "error_msg": None, "data": {"count": 1, "datas": [{"ppv": ""}]}}
+        )
+        expected = api.min.energy_history(device_sn="BZP0000000")
+        enable_fast_parse()
+        self.assertEqual(expected, api.min.energy_history(device_sn="BZP0000000"))
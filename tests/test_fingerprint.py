@@ -0,0 +1,62 @@
+import datetime
+import unittest
+
+from growatt_public_api.session.fingerprint import request_fingerprint, canonical_form, encode_form
+
+
+class TestFingerprint(unittest.TestCase):
+    """
+    equivalent requests have the same fingerprint
+    """
+
+    URL = "https://openapi.growatt.com/v4/new-api/queryLastData"
+
+    def test_encode_form(self):
+        self.assertEqual(
+            [("a", "1"), ("c", "x"), ("c", "y"), ("d", "True"), ("e", "2024-01-01")],
+            encode_form({"a": 1, "b": None, "c": ["x", None, "y"], "d": True, "e": datetime.date(2024, 1, 1)}),
+        )
+        self.assertIsNone(encode_form(None))
+
+    def test_canonical_form(self):
+        self.assertEqual(
+            canonical_form({"deviceSn": "BZP0000000", "deviceType": "min", "page": None}),
+            canonical_form({"deviceType": "min", "deviceSn": "BZP0000000"}),
+        )
+        # order of list values is significant
+        self.assertNotEqual(canonical_form({"sn": ["a", "b"]}), canonical_form({"sn": ["b", "a"]}))
+
+    def test_fingerprint(self):
+        fingerprint = request_fingerprint(
+            url=self.URL, method="POST", data={"deviceSn": "BZP0000000", "deviceType": "min"}, token="token"
+        )
+        # dict order, None values and value types do not matter
+        self.assertEqual(
+            fingerprint,
+            request_fingerprint(
+                url=self.URL,
+                method="post",
+                params={},
+                data={"deviceType": "min", "start": None, "deviceSn": "BZP0000000"},
+                token="token",
+            ),
+        )
+        self.assertEqual(
+            request_fingerprint(url=self.URL, params={"plant_id": 1, "date": datetime.date(2024, 1, 1)}),
+            request_fingerprint(url=self.URL, params={"date": "2024-01-01", "plant_id": "1"}),
+        )
+        # different data, method or account
+        self.assertNotEqual(
+            fingerprint,
+            request_fingerprint(url=self.URL, method="POST", data={"deviceSn": "BZP0000000"}, token="token"),
+        )
+        self.assertNotEqual(
+            fingerprint,
+            request_fingerprint(url=self.URL, data={"deviceSn": "BZP0000000", "deviceType": "min"}, token="token"),
+        )
+        self.assertNotEqual(
+            fingerprint,
+            request_fingerprint(
+                url=self.URL, method="POST", data={"deviceSn": "BZP0000000", "deviceType": "min"}, token="other"
+            ),
+        )
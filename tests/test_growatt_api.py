@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import MagicMock, AsyncMock
+
+from growatt_public_api import GrowattApi, AsyncGrowattApi, DeviceType
+from growatt_public_api.pydantic_models.api_v4 import MinEnergyDataV4, NoahEnergyDataV4
+
+DEVICES = (
+    [{"deviceSn": f"BZP{idx:07d}", "deviceType": "min"} for idx in range(150)]
+    + [{"deviceSn": f"0PVP{idx:010d}", "deviceType": "noah"} for idx in range(3)]
+    + [{"deviceSn": "PCS0000000", "deviceType": "pcs"}]
+)
+
+
+def _response(endpoint: str, params: dict) -> dict:
+    if endpoint == "new-api/queryDeviceList":
+        page = params["page"]
+        devices = DEVICES[(page - 1) * 100 : page * 100]
+        return {"code": 0, "message": "", "data": {"data": devices, "lastPager": page * 100 >= len(DEVICES)}}
+    if endpoint == "new-api/queryLastData":
+        device_type = params["deviceType"]
+        sn_key = "serialNum" if device_type == "min" else "deviceSn"
+        devices = [{sn_key: sn} for sn in params["deviceSn"].split(",")]
+        return {"code": 0, "message": "", "data": {device_type: devices}}
+    raise AssertionError(f"unexpected request to {endpoint}")
+
+
+class TestFleetSnapshot(unittest.TestCase):
+    """
+    latest data of all devices grouped by device type
+    """
+
+    def setUp(self):
+        self.api = GrowattApi(token="test_token", use_cache=False)
+        self.api.session.request = MagicMock(
+            side_effect=lambda **kwargs: _response(kwargs["endpoint"], kwargs["params"])
+        )
+
+    def _requests(self, endpoint: str):
+        return [c.kwargs for c in self.api.session.request.call_args_list if c.kwargs["endpoint"] == endpoint]
+
+    def test_fleet_snapshot(self):
+        snapshot = self.api.fleet_snapshot()
+
+        self.assertEqual(153, len(snapshot))
+        self.assertIsInstance(snapshot["BZP0000149"], MinEnergyDataV4)
+        self.assertIsInstance(snapshot["0PVP0000000002"], NoahEnergyDataV4)
+        # device types not supported by v4 API are skipped
+        self.assertNotIn("PCS0000000", snapshot)
+        self.assertEqual(2, len(self._requests("new-api/queryDeviceList")))
+        # 2 requests for 150 MIN devices, 1 request for NOAH devices
+        self.assertEqual(
+            ["min", "min", "noah"], sorted(r["params"]["deviceType"] for r in self._requests("new-api/queryLastData"))
+        )
+
+    def test_device_types(self):
+        snapshot = self.api.fleet_snapshot(device_types=[DeviceType.NOAH])
+        self.assertEqual({"0PVP0000000000", "0PVP0000000001", "0PVP0000000002"}, set(snapshot))
+
+
+class TestAsyncFleetSnapshot(unittest.IsolatedAsyncioTestCase):
+    async def test_fleet_snapshot(self):
+        api = AsyncGrowattApi(token="test_token", use_cache=False)
+        api.session.request = AsyncMock(side_effect=lambda **kwargs: _response(kwargs["endpoint"], kwargs["params"]))
+        api.session.request_many = AsyncMock(
+            side_effect=lambda requests_, max_workers=8: [_response(r["endpoint"], r["params"]) for r in requests_]
+        )
+
+        snapshot = await api.fleet_snapshot()
+
+        self.assertEqual(153, len(snapshot))
+        # all pages of device list
+        device_lists = [
+            c for c in api.session.request.call_args_list if c.kwargs["endpoint"] == "new-api/queryDeviceList"
+        ]
+        self.assertEqual(2, len(device_lists))
+        # all energy requests are sent concurrently
+        api.session.request_many.assert_awaited_once()
+        self.assertEqual(3, len(api.session.request_many.call_args.args[0]))
+        await api.close()
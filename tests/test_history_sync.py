@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from growatt_public_api import GrowattApi, DeviceType, HistorySync
+
+DEVICE_SN = "0PVP000000"
+
+
+class TestHistorySync(unittest.TestCase):
+    """
+    only records newer than the high-water mark are returned
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.state_file = Path(self.tmp_dir.name) / "history_sync.json"
+        # records available per day
+        self.records = {}
+        self.today = date(2025, 1, 1)
+        self.api = GrowattApi(token="test_token", use_cache=False)
+        self.api.session.request = MagicMock(side_effect=self._response)
+        patcher = patch.object(HistorySync, "_today", side_effect=lambda: self.today)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _response(self, **kwargs) -> dict:
+        day = date.fromisoformat(kwargs["params"]["date"])
+        datas = [{"time": t.isoformat(sep=" ")} for t in self.records.get(day, [])]
+        return {"code": 0, "message": "", "data": {"datas": datas, "haveNext": False, "start": 0}}
+
+    def _add_records(self, *times: datetime):
+        for t in times:
+            self.records.setdefault(t.date(), []).append(t)
+
+    def _sync(self, history_sync: HistorySync) -> list:
+        return [record.data.time for record in history_sync.sync(device_sn=DEVICE_SN, device_type=DeviceType.NOAH)]
+
+    def _requested_days(self) -> list:
+        return [c.kwargs["params"]["date"] for c in self.api.session.request.call_args_list]
+
+    def test_incremental(self):
+        history_sync = HistorySync(api=self.api, state_file=self.state_file)
+        t = [datetime(2025, 1, 1, 10, 0) + timedelta(minutes=5 * i) for i in range(4)]
+        self._add_records(t[0], t[1])
+        self.assertEqual([t[0], t[1]], self._sync(history_sync))
+        self._add_records(t[2], t[3])
+        self.assertEqual([t[2], t[3]], self._sync(history_sync))
+        self.assertEqual([], self._sync(history_sync))
+        self.assertEqual(t[3], history_sync.high_water_mark(DEVICE_SN))
+        # continued from saved state
+        self._add_records(t[3] + timedelta(minutes=5))
+        self.assertEqual(
+            [t[3] + timedelta(minutes=5)], self._sync(HistorySync(api=self.api, state_file=self.state_file))
+        )
+
+    def test_late_records(self):
+        history_sync = HistorySync(api=self.api, lookback=timedelta(minutes=30))
+        self._add_records(datetime(2025, 1, 1, 10, 0), datetime(2025, 1, 1, 10, 10))
+        self._sync(history_sync)
+        # record for 10:05 arrives after 10:10 has been returned, record for 9:00 is older than lookback
+        self._add_records(datetime(2025, 1, 1, 10, 5), datetime(2025, 1, 1, 9, 0))
+        self.assertEqual([datetime(2025, 1, 1, 10, 5)], self._sync(history_sync))
+        self.assertEqual([], self._sync(history_sync))
+        self.assertEqual(datetime(2025, 1, 1, 10, 10), history_sync.high_water_mark(DEVICE_SN))
+
+    def test_day_rollover(self):
+        history_sync = HistorySync(api=self.api)
+        self._add_records(datetime(2025, 1, 1, 23, 50))
+        self._sync(history_sync)
+        self._add_records(datetime(2025, 1, 1, 23, 55), datetime(2025, 1, 2, 0, 0), datetime(2025, 1, 2, 0, 5))
+        self.today = date(2025, 1, 2)
+        # remaining records of previous day first
+        self.assertEqual([datetime(2025, 1, 1, 23, 55)], self._sync(history_sync))
+        self.assertEqual([datetime(2025, 1, 2, 0, 0), datetime(2025, 1, 2, 0, 5)], self._sync(history_sync))
+        self.assertEqual(["2025-01-01", "2025-01-01", "2025-01-02"], self._requested_days())
+
+    def test_error(self):
+        history_sync = HistorySync(api=self.api)
+        self._add_records(datetime(2025, 1, 1, 10, 0))
+        self.api.session.request = MagicMock(return_value={"code": 102, "message": "rate limit", "data": None})
+        self.assertEqual([], self._sync(history_sync))
+        self.assertIsNone(history_sync.high_water_mark(DEVICE_SN))
+        self.api.session.request = MagicMock(side_effect=self._response)
+        self.assertEqual([datetime(2025, 1, 1, 10, 0)], self._sync(history_sync))
@@ -0,0 +1,44 @@
+import importlib
+import os
+import subprocess
+import sys
+import unittest
+
+import growatt_public_api
+
+LAZY_PACKAGES = [
+    "growatt_public_api",
+    "growatt_public_api.pydantic_models",
+    "growatt_public_api.session",
+    "growatt_public_api.device",
+]
+
+
+class TestLazyImports(unittest.TestCase):
+    """
+    modules are imported on first access of their names
+    """
+
+    def test_import_is_cheap(self):
+        code = (
+            "import sys, growatt_public_api; "
+            "print(sorted(m for m in sys.modules if m.startswith('growatt_public_api.') or m in ('pydantic', 'aiohttp')))"
+        )
+        cwd = os.path.dirname(os.path.dirname(growatt_public_api.__file__))
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=cwd, check=True, capture_output=True, text=True
+        ).stdout
+        self.assertEqual("['growatt_public_api.growatt_types', 'growatt_public_api.lazy_imports']", output.strip())
+
+    def test_all_names(self):
+        for package_name in LAZY_PACKAGES:
+            package = importlib.import_module(package_name)
+            for name in package.__all__:
+                self.assertIsNotNone(getattr(package, name), f"{package_name}.{name}")
+                self.assertIn(name, dir(package))
+
+    def test_unknown_name(self):
+        with self.assertRaises(AttributeError):
+            _ = growatt_public_api.UnknownApi
+        with self.assertRaises(ImportError):
+            from growatt_public_api import UnknownApi  # noqa: F401
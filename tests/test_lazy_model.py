@@ -0,0 +1,93 @@
+import unittest
+from datetime import datetime
+from typing import Union
+from unittest.mock import MagicMock
+
+from pydantic import ValidationError
+
+from growatt_public_api import GrowattApi, lazy_validation
+from growatt_public_api.pydantic_models import LazyModel, lazy_validate
+from growatt_public_api.pydantic_models.api_model import ApiModel, EmptyStrToNone
+from growatt_public_api.pydantic_models.api_v4 import MinEnergyHistoryMultipleV4
+from growatt_public_api.pydantic_models.min import MinEnergyHistory, MinEnergyOverviewData
+
+MIN_HISTORY = {
+    "error_code": 0,
+    "error_msg": "",
+    "data": {
+        "count": 2,
+        "tlx_sn": "BZP0000000",
+        "datas": [
+            {"time": "2025-01-01 10:00:00", "ppv": "1200.5", "eacToday": 3.2, "status": ""},
+            {"time": "2025-01-01 10:05:00", "ppv": 1300, "eacToday": "null", "status": 1},
+        ],
+    },
+}
+
+
+class TestLazyModel(unittest.TestCase):
+    """
+    fields are validated on first access
+    """
+
+    def test_fields(self):
+        history = lazy_validate(MinEnergyHistory, MIN_HISTORY)
+        self.assertIsInstance(history, LazyModel)
+        self.assertEqual(0, history.error_code)
+        self.assertIsNone(history.error_msg)
+        self.assertEqual("BZP0000000", history.data.device_sn)  # alias "tlx_sn"
+        records = history.data.datas
+        self.assertIsInstance(records[0], LazyModel)
+        self.assertEqual(datetime(2025, 1, 1, 10, 0), records[0].time)
+        self.assertEqual([1200.5, 1300.0], [r.ppv for r in records])
+        self.assertEqual([3.2, None], [r.eac_today for r in records])
+        self.assertEqual([None, 1], [r.status for r in records])
+        # field not in raw data
+        self.assertIsNone(records[0].pac)
+        with self.assertRaises(AttributeError):
+            _ = records[0].unknown_field
+
+    def test_same_values_as_model(self):
+        history = lazy_validate(MinEnergyHistory, MIN_HISTORY)
+        model = MinEnergyHistory.model_validate(MIN_HISTORY)
+        for lazy_record, record in zip(history.data.datas, model.data.datas):
+            for field in MinEnergyOverviewData.model_fields:
+                self.assertEqual(getattr(record, field), getattr(lazy_record, field), field)
+        self.assertEqual(model, history.to_model())
+        self.assertEqual(model.data.datas[1], history.data.datas[1].to_model())
+
+    def test_model_not_built(self):
+        class DeferredModel(ApiModel):
+            eac_today: Union[EmptyStrToNone, float] = None
+
+        # validators (and aliases) are built on first use
+        self.assertFalse(DeferredModel.__pydantic_complete__)
+        self.assertEqual(1.5, lazy_validate(DeferredModel, {"eacToday": "1.5"}).eac_today)
+
+    def test_cached(self):
+        record = lazy_validate(MinEnergyOverviewData, {"calendar": {"time": 1735725600000}})
+        self.assertIs(record.calendar, record.calendar)
+
+    def test_invalid(self):
+        record = lazy_validate(MinEnergyOverviewData, {"ppv": "not a number", "pac": 1.0})
+        # other fields are still available
+        self.assertEqual(1.0, record.pac)
+        with self.assertRaises(ValidationError):
+            _ = record.ppv
+
+    def test_dict_of_lists(self):
+        response = lazy_validate(
+            MinEnergyHistoryMultipleV4, {"code": 0, "message": "", "data": {"BZP0000000": [{"ppv": "12.5"}]}}
+        )
+        self.assertEqual(12.5, response.data["BZP0000000"][0].ppv)
+
+    def test_lazy_validation(self):
+        api = GrowattApi(token="test_token", use_cache=False)
+        api.session.request = MagicMock(return_value=MIN_HISTORY)
+        with lazy_validation():
+            history = api.min.energy_history(device_sn="BZP0000000")
+        self.assertIsInstance(history, LazyModel)
+        self.assertEqual(1200.5, history.data.datas[0].ppv)
+        # not lazy outside context
+        self.assertIsInstance(api.min.energy_history(device_sn="BZP0000000"), MinEnergyHistory)
+        self.assertIsInstance(history.to_model(), MinEnergyHistory)
@@ -0,0 +1,109 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, AsyncMock
+
+from growatt_public_api import GrowattApi, AsyncGrowattApi
+from growatt_public_api.pagination import PageIterator, AsyncPageIterator
+from growatt_public_api.pydantic_models.min import MinAlarm
+
+ALARM_COUNT = 45
+
+
+def _alarms_response(page: int, limit: int) -> dict:
+    alarms = [{"alarmCode": idx} for idx in range((page - 1) * limit, min(page * limit, ALARM_COUNT))]
+    return {"error_code": 0, "error_msg": None, "data": {"count": ALARM_COUNT, "alarms": alarms}}
+
+
+def _device_list_response(page: int) -> dict:
+    devices = [{"deviceSn": f"BZP{page}{idx:06d}", "deviceType": "min"} for idx in range(3)]
+    return {"code": 0, "message": None, "data": {"data": devices, "lastPager": page == 2}}
+
+
+class TestPageIterator(unittest.TestCase):
+    """
+    iter_...() methods fetch pages lazily and yield single items
+    """
+
+    def setUp(self):
+        self.api = GrowattApi(token="test_token", use_cache=False)
+        self.api.session.request = MagicMock(
+            side_effect=lambda **kwargs: _alarms_response(kwargs["data"]["page"], kwargs["data"]["perpage"])
+        )
+
+    def _pages_requested(self):
+        return [c.kwargs["data"]["page"] for c in self.api.session.request.call_args_list]
+
+    def test_iterate(self):
+        alarms = self.api.min.iter_alarms(device_sn="BZP0000000", limit=20)
+        self.assertIsInstance(alarms, PageIterator)
+        # pages are not fetched before iterating
+        self.assertEqual([], self._pages_requested())
+        alarms = list(alarms)
+        self.assertEqual(ALARM_COUNT, len(alarms))
+        self.assertIsInstance(alarms[0], MinAlarm)
+        self.assertEqual(list(range(ALARM_COUNT)), [alarm.alarm_code for alarm in alarms])
+        # stopped by "count"
+        self.assertEqual([1, 2, 3], self._pages_requested())
+
+    def test_lazy(self):
+        alarms = iter(self.api.min.iter_alarms(device_sn="BZP0000000", limit=20))
+        for _ in range(21):
+            next(alarms)
+        self.assertEqual([1, 2], self._pages_requested())
+
+    def test_last_pager(self):
+        self.api.session.request = MagicMock(
+            side_effect=lambda **kwargs: _device_list_response(kwargs["params"]["page"])
+        )
+        device_sns = [device.device_sn for device in self.api.device.iter_list()]
+        self.assertEqual(6, len(device_sns))
+        self.assertEqual(2, self.api.session.request.call_count)
+
+    def test_error(self):
+        self.api.session.request = MagicMock(
+            side_effect=[_alarms_response(1, 20), {"error_code": 10012, "error_msg": "rate limit", "data": None}]
+        )
+        pages = list(self.api.min.iter_alarms(device_sn="BZP0000000", limit=20).pages())
+        # iteration stops at error response
+        self.assertEqual([0, 10012], [page.error_code for page in pages])
+
+    def test_prefetch(self):
+        next_page_requested = threading.Event()
+
+        def request(**kwargs):
+            if kwargs["data"]["page"] == 2:
+                next_page_requested.set()
+            return _alarms_response(kwargs["data"]["page"], kwargs["data"]["perpage"])
+
+        self.api.session.request = MagicMock(side_effect=request)
+        alarms = iter(self.api.min.iter_alarms(device_sn="BZP0000000", limit=20, prefetch=True))
+        next(alarms)
+        # page 2 is requested while page 1 is consumed
+        self.assertTrue(next_page_requested.wait(timeout=5))
+        self.assertEqual(ALARM_COUNT - 1, len(list(alarms)))
+        self.assertEqual([1, 2, 3], sorted(self._pages_requested()))
+
+
+class TestAsyncPageIterator(unittest.IsolatedAsyncioTestCase):
+    """
+    iter_...() methods of the async API return async iterators
+    """
+
+    async def test_iterate(self):
+        api = AsyncGrowattApi(token="test_token", use_cache=False)
+        api.session.request = AsyncMock(
+            side_effect=lambda **kwargs: _alarms_response(kwargs["data"]["page"], kwargs["data"]["perpage"])
+        )
+        alarms = api.min.iter_alarms(device_sn="BZP0000000", limit=20, prefetch=True)
+        self.assertIsInstance(alarms, AsyncPageIterator)
+        alarm_codes = [alarm.alarm_code async for alarm in alarms]
+        self.assertEqual(list(range(ALARM_COUNT)), alarm_codes)
+        self.assertEqual(3, api.session.request.await_count)
+
+    async def test_break(self):
+        api = AsyncGrowattApi(token="test_token", use_cache=False)
+        api.session.request = AsyncMock(side_effect=lambda **kwargs: _device_list_response(kwargs["params"]["page"]))
+        async for device in api.device.iter_list():
+            self.assertEqual("BZP1000000", device.device_sn)
+            break
+        self.assertEqual(1, api.session.request.await_count)
@@ -0,0 +1,99 @@
+import unittest
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+
+from growatt_public_api import GrowattApi, GrowattApiSession, RateLimiter, RateLimit
+
+TEST_FILE = "growatt_public_api.session.rate_limiter"
+
+
+class TestRateLimiter(unittest.TestCase):
+    """
+    rate limits are applied before requests are sent
+    """
+
+    def test_reject(self):
+        limiter = RateLimiter(mode="reject", limits={"plant/list": [RateLimit(calls=1, period=timedelta(minutes=5))]})
+        self.assertEqual(0.0, limiter.reserve(endpoint="plant/list"))
+        self.assertIsNone(limiter.reserve(endpoint="plant/list"))
+        # endpoints without limit are not affected
+        self.assertEqual(0.0, limiter.reserve(endpoint="plant/details"))
+
+    def test_wait(self):
+        limiter = RateLimiter(
+            mode="wait",
+            max_wait=timedelta(seconds=10),
+            limits={"new-api/readPower": [RateLimit(calls=1, period=timedelta(seconds=5))]},
+        )
+        with patch(f"{TEST_FILE}.time.monotonic", return_value=1000.0):
+            self.assertEqual(0.0, limiter.reserve(endpoint="new-api/readPower"))
+            self.assertAlmostEqual(5.0, limiter.reserve(endpoint="new-api/readPower"))
+            # slots are reserved for waiting requests
+            self.assertAlmostEqual(10.0, limiter.reserve(endpoint="new-api/readPower"))
+            # exceeding max_wait
+            self.assertIsNone(limiter.reserve(endpoint="new-api/readPower"))
+        with patch(f"{TEST_FILE}.time.monotonic", return_value=1015.0):
+            self.assertEqual(0.0, limiter.reserve(endpoint="new-api/readPower"))
+
+    def test_per_device(self):
+        limiter = RateLimiter(mode="reject")
+        params_1 = {"deviceSn": "BZP0000000", "deviceType": "min"}
+        params_2 = {"deviceSn": "BZP0000001", "deviceType": "min"}
+        self.assertEqual(0.0, limiter.reserve(endpoint="new-api/queryDeviceInfo", params=params_1))
+        self.assertEqual(0.0, limiter.reserve(endpoint="new-api/queryDeviceInfo", params=params_2))
+        self.assertIsNone(limiter.reserve(endpoint="new-api/queryDeviceInfo", params=params_1))
+
+    def test_pages(self):
+        limiter = RateLimiter(mode="reject")
+        for page in range(1, 4):
+            self.assertEqual(0.0, limiter.reserve(endpoint="plant/list", params={"page": page, "perpage": 100}))
+        self.assertIsNone(limiter.reserve(endpoint="plant/list", params={"page": 1, "perpage": 100}))
+        # daily quota (10 per day) is shared by all pages
+        limiter = RateLimiter(mode="reject")
+        for page in range(1, 11):
+            self.assertEqual(0.0, limiter.reserve(endpoint="plant/list", params={"page": page, "perpage": 100}))
+        self.assertIsNone(limiter.reserve(endpoint="plant/list", params={"page": 11, "perpage": 100}))
+        # v4 device list
+        self.assertEqual(0.0, limiter.reserve(endpoint="new-api/queryDeviceList", data={"page": 1}))
+        self.assertEqual(0.0, limiter.reserve(endpoint="new-api/queryDeviceList", data={"page": 2}))
+
+    def test_iterate_pages(self):
+        api = GrowattApi(token="test_token", use_cache=False, rate_limiter=RateLimiter(mode="reject"))
+        api.session.session.request = MagicMock()
+        api.session.session.request.return_value.text = ""
+        # v4 device list (once every 5 seconds)
+        api.session.session.request.return_value.json.side_effect = [
+            {"code": 0, "message": None, "data": {"data": [{"deviceSn": f"BZP000000{page}"}], "lastPager": page == 3}}
+            for page in range(1, 4)
+        ]
+        self.assertEqual(3, len(list(api.device.iter_list())))
+        # alarms (once every 5 minutes per device)
+        api.session.session.request.return_value.json.side_effect = [
+            {"error_code": 0, "error_msg": None, "data": {"count": 5, "alarms": [{"alarmCode": i} for i in ids]}}
+            for ids in ([1, 2], [3, 4], [5])
+        ]
+        alarms = list(api.min.iter_alarms(device_sn="BZP0000000", limit=2))
+        self.assertEqual([1, 2, 3, 4, 5], [alarm.alarm_code for alarm in alarms])
+        self.assertEqual(6, api.session.session.request.call_count)
+
+    def test_calls_per_day(self):
+        limiter = RateLimiter(mode="reject", limits={"plant/energy": [RateLimit(calls=10, period=timedelta(days=1))]})
+        for _ in range(10):
+            self.assertEqual(0.0, limiter.reserve(endpoint="plant/energy", data={"plant_id": 1}))
+        self.assertIsNone(limiter.reserve(endpoint="plant/energy", data={"plant_id": 1}))
+
+    def test_session_rejects_without_request(self):
+        session = GrowattApiSession(
+            token="test_token",
+            use_cache=False,
+            rate_limiter=RateLimiter(mode="reject", limits={"new-api/queryDeviceList": [RateLimit(1, timedelta(5))]}),
+        )
+        session.session.request = MagicMock()
+        session.session.request.return_value.text = ""
+        session.session.request.return_value.json.return_value = {"code": 0, "message": None, "data": None}
+
+        response = session.post(endpoint="new-api/queryDeviceList")
+        self.assertEqual(0, response["code"])
+        response = session.post(endpoint="new-api/queryDeviceList")
+        self.assertEqual(102, response["code"])
+        self.assertEqual(1, session.session.request.call_count)
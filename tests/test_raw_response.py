@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import MagicMock
+
+from growatt_public_api import GrowattApi, lazy_validation, raw_responses
+from growatt_public_api.pydantic_models import raw_response, model_responses
+from growatt_public_api.pydantic_models.api_v4 import MinEnergyHistoryV4
+from growatt_public_api.pydantic_models.inverter import InverterSettingRead
+from growatt_public_api.pydantic_models.min import MinEnergyHistory
+
+MIN_HISTORY = {
+    "error_code": 0,
+    "error_msg": "",
+    "data": {
+        "count": 1,
+        "tlx_sn": "BZP0000000",
+        "datas": [{"time": "2025-01-01 10:00:00", "ppv": "1200.5", "eacToday": "null", "status": ""}],
+    },
+}
+
+
+class TestRawResponse(unittest.TestCase):
+    """
+    raw JSON is returned instead of models within raw_responses()
+    """
+
+    def setUp(self):
+        self.api = GrowattApi(token="test_token", use_cache=False)
+
+    def test_raw_response(self):
+        raw = raw_response(MinEnergyHistory, MIN_HISTORY)
+        self.assertIsNone(raw["error_msg"])
+        self.assertEqual("BZP0000000", raw["data"]["tlx_sn"])  # keys are not renamed
+        self.assertEqual(
+            {"time": "2025-01-01 10:00:00", "ppv": "1200.5", "eacToday": None, "status": None}, raw["data"]["datas"][0]
+        )
+        # raw JSON is not modified
+        self.assertEqual("null", MIN_HISTORY["data"]["datas"][0]["eacToday"])
+
+    def test_v4(self):
+        raw = raw_response(MinEnergyHistoryV4, {"code": 0, "message": "SUCCESSFUL_OPERATION", "data": None})
+        self.assertEqual({"error_code": 0, "error_msg": "SUCCESSFUL_OPERATION", "data": None}, raw)
+
+    def test_raw_responses(self):
+        self.api.session.request = MagicMock(return_value=MIN_HISTORY)
+        with raw_responses():
+            history = self.api.min.energy_history(device_sn="BZP0000000")
+            # raw_responses() has priority over lazy_validation()
+            with lazy_validation():
+                self.assertIsInstance(self.api.min.energy_history(device_sn="BZP0000000"), dict)
+            with model_responses():
+                self.assertIsInstance(self.api.min.energy_history(device_sn="BZP0000000"), MinEnergyHistory)
+        self.assertEqual(raw_response(MinEnergyHistory, MIN_HISTORY), history)
+        # models outside context
+        self.assertIsInstance(self.api.min.energy_history(device_sn="BZP0000000"), MinEnergyHistory)
+
+    def test_error_message(self):
+        self.api.session.request = MagicMock(return_value={"error_code": 10002, "error_msg": "error_permission_denied"})
+        expected = "error_permission_denied (or type != 1 - check with plant.list_devices())"
+        with raw_responses():
+            self.assertEqual(expected, self.api.inverter.setting_read(device_sn="X", parameter_id="pv_pf")["error_msg"])
+        setting = self.api.inverter.setting_read(device_sn="X", parameter_id="pv_pf")
+        self.assertIsInstance(setting, InverterSettingRead)
+        self.assertEqual(expected, setting.error_msg)
+
+    def test_iterator(self):
+        self.api.session.request = MagicMock(return_value=MIN_HISTORY)
+        with raw_responses():
+            records = list(self.api.min.iter_energy_history(device_sn="BZP0000000"))
+        self.assertEqual(1200.5, records[0].ppv)
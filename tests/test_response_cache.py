@@ -0,0 +1,475 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import requests
+
+from growatt_public_api import GrowattApi, GrowattApiSession, AsyncGrowattApiSession, ResponseCache, enable_fast_parse
+
+TEST_FILE = "growatt_public_api.session.response_cache"
+
+
+class TestResponseCache(unittest.TestCase):
+    """
+    cached responses are returned without sending requests in "read-through" mode
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _session(self, cache: ResponseCache, json_data: dict) -> GrowattApiSession:
+        session = GrowattApiSession(token="test_token", cache=cache)
+        session.session.request = MagicMock()
+        session.session.request.return_value.text = ""
+        session.session.request.return_value.json.side_effect = lambda: dict(json_data)
+        return session
+
+    def test_ttl(self):
+        cache = ResponseCache(folder=self.folder, ttls={"plant/list": timedelta(0)})
+        self.assertEqual(
+            timedelta(minutes=5),
+            cache.ttl(endpoint="new-api/queryLastData", data={"deviceType": "min", "deviceSn": "BZP0000000"}),
+        )
+        self.assertEqual(
+            timedelta(minutes=1),
+            cache.ttl(endpoint="new-api/queryLastData", data={"deviceType": "noah", "deviceSn": "0PVP000000"}),
+        )
+        self.assertEqual(timedelta(days=1), cache.ttl(endpoint="device/check/sn"))
+        # settings are never served from cache
+        self.assertIsNone(cache.ttl(endpoint="new-api/setOnOrOff"))
+        # unknown endpoint
+        self.assertIsNone(cache.ttl(endpoint="device/tlx/tlx_set_info"))
+        # disabled
+        self.assertIsNone(cache.ttl(endpoint="plant/list"))
+
+    def test_read_through(self):
+        session = self._session(
+            cache=ResponseCache(mode="read-through", folder=self.folder),
+            json_data={"error_code": 0, "error_msg": None, "data": {"foo": "bar"}},
+        )
+        params = {"device_sn": "BZP0000000"}
+        response_1 = session.get(endpoint="device/tlx/tlx_last_data", params=params)
+        response_2 = session.get(endpoint="device/tlx/tlx_last_data", params=params)
+        # cached responses report their age
+        self.assertNotIn("cacheAge", response_1)
+        self.assertLess(response_2.pop("cacheAge"), 60)
+        self.assertEqual(response_1, response_2)
+        self.assertEqual(1, session.session.request.call_count)
+        # other device
+        session.get(endpoint="device/tlx/tlx_last_data", params={"device_sn": "BZP0000001"})
+        self.assertEqual(2, session.session.request.call_count)
+
+    def test_read_through_expired(self):
+        session = self._session(
+            cache=ResponseCache(mode="read-through", folder=self.folder),
+            json_data={"error_code": 0, "error_msg": None, "data": {"foo": "bar"}},
+        )
+        params = {"device_sn": "BZP0000000"}
+        session.get(endpoint="device/tlx/tlx_last_data", params=params)
+        # make cached response 10 minutes old
+        old = time.time() - 600
+        for pickle_file in self.folder.glob("*.pickle"):
+            os.utime(pickle_file, (old, old))
+        session.get(endpoint="device/tlx/tlx_last_data", params=params)
+        self.assertEqual(2, session.session.request.call_count)
+
+    def test_stale_while_revalidate(self):
+        session = self._session(
+            cache=ResponseCache(mode="read-through", folder=self.folder, stale_while_revalidate=timedelta(minutes=10)),
+            json_data={"error_code": 0, "error_msg": None, "data": {"foo": "bar"}},
+        )
+        params = {"device_sn": "BZP0000000"}
+        session.get(endpoint="device/tlx/tlx_last_data", params=params)
+        # make cached response 10 minutes old (TTL = 5 minutes)
+        old = time.time() - 600
+        for pickle_file in self.folder.glob("*.pickle"):
+            os.utime(pickle_file, (old, old))
+        refreshing = threading.Event()
+        release = threading.Event()
+
+        def slow_request(*args, **kwargs):
+            refreshing.set()
+            release.wait(5)
+            response = MagicMock()
+            response.text = ""
+            response.json.return_value = {"error_code": 0, "error_msg": None, "data": {"foo": "new"}}
+            return response
+
+        session.session.request.side_effect = slow_request
+        # outdated response returned immediately, refreshed in background
+        response = session.get(endpoint="device/tlx/tlx_last_data", params=params)
+        self.assertEqual({"foo": "bar"}, response["data"])
+        self.assertAlmostEqual(600, response["cacheAge"], delta=60)
+        self.assertTrue(refreshing.wait(5))
+        # single refresh while in flight
+        self.assertEqual({"foo": "bar"}, session.get(endpoint="device/tlx/tlx_last_data", params=params)["data"])
+        release.set()
+        for _ in range(100):
+            if not session._revalidating:
+                break
+            time.sleep(0.05)
+        self.assertEqual(2, session.session.request.call_count)
+        response = session.get(endpoint="device/tlx/tlx_last_data", params=params)
+        self.assertEqual({"foo": "new"}, response["data"])
+        self.assertLess(response["cacheAge"], 60)
+        self.assertEqual(2, session.session.request.call_count)
+
+    def test_stale_while_revalidate_coalesced(self):
+        session = self._session(
+            cache=ResponseCache(mode="read-through", folder=self.folder, stale_while_revalidate=timedelta(minutes=10)),
+            json_data={"error_code": 0, "error_msg": None, "data": {"foo": "bar"}},
+        )
+        params = {"device_sn": "BZP0000000"}
+        session.get(endpoint="device/tlx/tlx_last_data", params=params)
+        old = time.time() - 600
+        for pickle_file in self.folder.glob("*.pickle"):
+            os.utime(pickle_file, (old, old))
+        refreshing = threading.Event()
+        release = threading.Event()
+
+        def slow_request(*args, **kwargs):
+            refreshing.set()
+            release.wait(5)
+            response = MagicMock(text="")
+            response.json.return_value = {"error_code": 0, "error_msg": None, "data": {"foo": "new"}}
+            return response
+
+        session.session.request.reset_mock()
+        session.session.request.side_effect = slow_request
+        self.assertEqual({"foo": "bar"}, session.get(endpoint="device/tlx/tlx_last_data", params=params)["data"])
+        self.assertTrue(refreshing.wait(5))
+        # forced request while refresh is in flight
+        forced = []
+        thread = threading.Thread(
+            target=lambda: forced.append(
+                session.request(endpoint="device/tlx/tlx_last_data", params=params, use_cache=False)
+            )
+        )
+        thread.start()
+        for _ in range(100):
+            if any(call.followers for call in session.single_flight._calls.values()):
+                break
+            time.sleep(0.01)
+        release.set()
+        thread.join(5)
+        # refresh and forced request share a single upstream request
+        self.assertEqual({"foo": "new"}, forced[0]["data"])
+        self.assertEqual(1, session.session.request.call_count)
+
+    def test_stale_while_revalidate_failed(self):
+        session = self._session(
+            cache=ResponseCache(mode="read-through", folder=self.folder, stale_while_revalidate=timedelta(minutes=10)),
+            json_data={"error_code": 0, "error_msg": None, "data": {"foo": "bar"}},
+        )
+        params = {"device_sn": "BZP0000000"}
+        session.get(endpoint="device/tlx/tlx_last_data", params=params)
+        old = time.time() - 600
+        for pickle_file in self.folder.glob("*.pickle"):
+            os.utime(pickle_file, (old, old))
+        error_response = MagicMock(text="")
+        error_response.json.return_value = {"error_code": 10001, "error_msg": "system error", "data": None}
+
+        for failure in [requests.ConnectionError("connection reset"), error_response]:
+            session.session.request.side_effect = [failure]
+            session.session.request.reset_mock()
+            self.assertEqual({"foo": "bar"}, session.get(endpoint="device/tlx/tlx_last_data", params=params)["data"])
+            for _ in range(100):
+                if not session._revalidating:
+                    break
+                time.sleep(0.05)
+            self.assertEqual(1, session.session.request.call_count)
+            # outdated response is kept
+            session.session.request.side_effect = [failure]
+            response = session.get(endpoint="device/tlx/tlx_last_data", params=params)
+            self.assertEqual({"foo": "bar"}, response["data"])
+            self.assertAlmostEqual(600, response["cacheAge"], delta=60)
+            for _ in range(100):
+                if not session._revalidating:
+                    break
+                time.sleep(0.05)
+
+    def test_stale_while_revalidate_expired(self):
+        session = self._session(
+            cache=ResponseCache(mode="read-through", folder=self.folder, stale_while_revalidate=timedelta(minutes=1)),
+            json_data={"error_code": 0, "error_msg": None, "data": {"foo": "bar"}},
+        )
+        params = {"device_sn": "BZP0000000"}
+        session.get(endpoint="device/tlx/tlx_last_data", params=params)
+        # older than TTL + grace window
+        old = time.time() - 600
+        for pickle_file in self.folder.glob("*.pickle"):
+            os.utime(pickle_file, (old, old))
+        response = session.get(endpoint="device/tlx/tlx_last_data", params=params)
+        self.assertNotIn("cacheAge", response)
+        self.assertEqual(2, session.session.request.call_count)
+
+    def test_cache_age_model(self):
+        api = GrowattApi(token="test_token", cache=ResponseCache(mode="read-through", folder=self.folder))
+        api.session.session.request = MagicMock()
+        api.session.session.request.return_value.text = ""
+        api.session.session.request.return_value.json.side_effect = lambda: {"code": 0, "message": "", "data": None}
+        self.assertIsNone(api.api_v4.details(device_sn="BZP0000000", device_type="min").cache_age)
+        self.assertIsNotNone(api.api_v4.details(device_sn="BZP0000000", device_type="min").cache_age)
+        enable_fast_parse()
+        try:
+            self.assertIsNotNone(api.api_v4.details(device_sn="BZP0000000", device_type="min").cache_age)
+        finally:
+            enable_fast_parse(False)
+
+    def test_errors_not_served(self):
+        session = self._session(
+            cache=ResponseCache(mode="read-through", folder=self.folder),
+            json_data={"error_code": 10011, "error_msg": None, "data": None},
+        )
+        session.get(endpoint="device/tlx/tlx_last_data", params={"device_sn": "BZP0000000"})
+        session.get(endpoint="device/tlx/tlx_last_data", params={"device_sn": "BZP0000000"})
+        self.assertEqual(2, session.session.request.call_count)
+
+    def test_fallback(self):
+        session = self._session(
+            cache=ResponseCache(mode="fallback", folder=self.folder),
+            json_data={"error_code": 0, "error_msg": None, "data": {"foo": "bar"}},
+        )
+        session.get(endpoint="device/tlx/tlx_last_data", params={"device_sn": "BZP0000000"})
+        session.session.request.return_value.json.side_effect = lambda: {"error_code": 10012, "data": None}
+        response = session.get(endpoint="device/tlx/tlx_last_data", params={"device_sn": "BZP0000000"})
+        self.assertEqual({"foo": "bar"}, response["data"])
+        self.assertIsNotNone(response["cacheAge"])
+        self.assertEqual(2, session.session.request.call_count)
+
+    def test_memory_tier(self):
+        cache = ResponseCache(folder=self.folder, memory_max_entries=2)
+        cache.store("a", {"data": "a"})
+        cache.store("b", {"data": "b"})
+        # served from memory, without file access
+        with patch("pathlib.Path.read_bytes", side_effect=AssertionError("file access")):
+            self.assertEqual({"data": "a"}, cache.load("a"))
+        # least recently used entry ("b") is evicted
+        cache.store("c", {"data": "c"})
+        self.assertEqual({"a", "c"}, set(cache._memory._entries))
+        # written to disk in background
+        cache.flush()
+        self.assertEqual({"a", "b", "c"}, {f.stem for f in self.folder.glob("*.pickle")})
+        self.assertEqual({"data": "b"}, cache.load("b"))
+
+    def test_memory_tier_max_bytes(self):
+        cache = ResponseCache(folder=self.folder, memory_max_entries=100, memory_max_bytes=200)
+        for i in range(10):
+            cache.store(str(i), {"data": "x" * 50})
+        self.assertLessEqual(cache._memory.size, 200)
+        self.assertLess(len(cache._memory), 10)
+        cache.flush()
+        self.assertEqual(10, len(list(self.folder.glob("*.pickle"))))
+
+    def test_sqlite(self):
+        cache = ResponseCache(folder=self.folder, backend="sqlite", max_age=timedelta(hours=1))
+        cache.store("a", {"data": "a"})
+        self.assertEqual({"data": "a"}, cache.load("a"))
+        self.assertIsNone(cache.load("b"))
+        self.assertEqual([self.folder / "responses.sqlite3"], list(self.folder.glob("*.sqlite3")))
+        self.assertEqual([], list(self.folder.glob("*.pickle")))
+        # shared by other instances (and processes)
+        other_cache = ResponseCache(folder=self.folder, backend="sqlite")
+        self.assertEqual({"data": "a"}, other_cache.load("a"))
+
+    def test_sqlite_cleanup(self):
+        cache = ResponseCache(folder=self.folder, backend="sqlite", max_age=timedelta(hours=1))
+        cache._store.EVICT_BATCH_SIZE = 3
+        with patch(f"{TEST_FILE}.time.time", return_value=time.time() - 7200):
+            for i in range(10):
+                cache.store(f"old_{i}", {"data": i})
+        cache.store("new", {"data": "new"})
+        self.assertIsNone(cache.load("old_0"))
+        cache.cleanup()
+        count = cache._store._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        self.assertEqual(1, count)
+        self.assertEqual({"data": "new"}, cache.load("new"))
+
+    def test_sqlite_threads(self):
+        cache = ResponseCache(folder=self.folder, backend="sqlite", memory_max_entries=10)
+
+        def worker(n: int):
+            for i in range(20):
+                cache.store(f"{n}_{i}", {"data": i})
+                cache.load(f"{n}_{i // 2}")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        cache.flush()
+        count = cache._store._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        self.assertEqual(80, count)
+
+    def _store_old(self, cache: ResponseCache, count: int):
+        with patch(f"{TEST_FILE}.time.time", return_value=time.time() - 2 * cache.max_age.total_seconds()):
+            for i in range(count):
+                cache._store.write(f"old_{i}", b"old", stored_at=time.time())
+
+    def test_session_init_does_not_scan_cache(self):
+        cache = ResponseCache(folder=self.folder)
+        self._store_old(cache, 5)
+        with patch(f"{TEST_FILE}.os.scandir", side_effect=AssertionError("cache scanned")):
+            GrowattApiSession(token="test_token", cache=cache)
+        self.assertEqual(5, len(list(self.folder.glob("*.pickle"))))
+
+    def test_incremental_cleanup(self):
+        cache = ResponseCache(folder=self.folder, cleanup_batch_size=4, cleanup_in_background=False)
+        self._store_old(cache, 10)
+        # first step checks 4 files (including the new one)
+        cache.store("new", {"data": "new"})
+        self.assertLessEqual(7, len(list(self.folder.glob("*.pickle"))))
+        # pass is continued on next store until all files are checked
+        for _ in range(3):
+            cache.store("new", {"data": "new"})
+        self.assertEqual(["new.pickle"], [f.name for f in self.folder.glob("*.pickle")])
+        # no new pass before cleanup_interval
+        self._store_old(cache, 3)
+        cache.store("new", {"data": "new"})
+        self.assertEqual(4, len(list(self.folder.glob("*.pickle"))))
+
+    def test_cleanup_shared_by_processes(self):
+        cache = ResponseCache(folder=self.folder, cleanup_in_background=False)
+        self._store_old(cache, 3)
+        # cleanup pass done recently by another process
+        (self.folder / ".last_cleanup").touch()
+        cache.store("new", {"data": "new"})
+        self.assertEqual(4, len(list(self.folder.glob("*.pickle"))))
+        # on-demand cleanup
+        cache.cleanup()
+        self.assertEqual(1, len(list(self.folder.glob("*.pickle"))))
+
+    def test_background_cleanup_sqlite(self):
+        cache = ResponseCache(folder=self.folder, backend="sqlite", cleanup_batch_size=2)
+        self._store_old(cache, 5)
+        for i in range(5):
+            cache.store(f"new_{i}", {"data": i})
+            deadline = time.time() + 5
+            while cache._cleanup_running and time.time() < deadline:
+                time.sleep(0.01)
+        count = cache._store._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        self.assertEqual(5, count)
+
+
+class TestAsyncResponseCache(unittest.IsolatedAsyncioTestCase):
+    async def test_cache_io_off_event_loop(self):
+        with tempfile.TemporaryDirectory() as folder:
+            session = AsyncGrowattApiSession(
+                token="test_token", cache=ResponseCache(mode="read-through", folder=Path(folder))
+            )
+            key = session.fingerprint(url=session._url("plant/list"))
+            session.cache.store(key, {"error_code": 0, "error_msg": None, "data": "cached"})
+            threads = []
+            load_with_age = session.cache.load_with_age
+
+            def load(*args, **kwargs):
+                threads.append(threading.current_thread())
+                return load_with_age(*args, **kwargs)
+
+            with patch.object(session.cache, "load_with_age", side_effect=load):
+                self.assertEqual("cached", (await session.get(endpoint="plant/list"))["data"])
+            self.assertEqual(1, len(threads))
+            self.assertIsNot(threading.current_thread(), threads[0])
+            await session.close()
+
+    async def test_stale_while_revalidate(self):
+        with tempfile.TemporaryDirectory() as folder:
+            session = AsyncGrowattApiSession(
+                token="test_token",
+                cache=ResponseCache(
+                    mode="read-through", folder=Path(folder), stale_while_revalidate=timedelta(hours=1)
+                ),
+            )
+            key = session.fingerprint(url=session._url("plant/list"))
+            session.cache.store(key, {"error_code": 0, "error_msg": None, "data": "old"})
+            old = time.time() - 600
+            for pickle_file in Path(folder).glob("*.pickle"):
+                os.utime(pickle_file, (old, old))
+
+            release = asyncio.Event()
+
+            async def fetch(**kwargs):
+                await release.wait()
+                return {"error_code": 0, "error_msg": None, "data": "new"}
+
+            with patch.object(session, "_fetch", side_effect=fetch) as fetch_mock:
+                self.assertEqual("old", (await session.get(endpoint="plant/list"))["data"])
+                # refresh still running - not started again
+                self.assertEqual("old", (await session.get(endpoint="plant/list"))["data"])
+                release.set()
+                await asyncio.gather(*session._revalidations)
+                self.assertEqual("new", (await session.get(endpoint="plant/list"))["data"])
+            self.assertEqual(1, fetch_mock.call_count)
+            await session.close()
+
+    async def test_stale_while_revalidate_coalesced(self):
+        with tempfile.TemporaryDirectory() as folder:
+            session = AsyncGrowattApiSession(
+                token="test_token",
+                cache=ResponseCache(
+                    mode="read-through", folder=Path(folder), stale_while_revalidate=timedelta(hours=1)
+                ),
+            )
+            key = session.fingerprint(url=session._url("plant/list"))
+            session.cache.store(key, {"error_code": 0, "error_msg": None, "data": "old"})
+            old = time.time() - 600
+            for pickle_file in Path(folder).glob("*.pickle"):
+                os.utime(pickle_file, (old, old))
+
+            release = asyncio.Event()
+
+            async def fetch(**kwargs):
+                await release.wait()
+                return {"error_code": 0, "error_msg": None, "data": "new"}
+
+            with patch.object(session, "_fetch", side_effect=fetch) as fetch_mock:
+                self.assertEqual("old", (await session.get(endpoint="plant/list"))["data"])
+                # forced request while refresh is in flight
+                forced = asyncio.create_task(session.request(endpoint="plant/list", use_cache=False))
+                await asyncio.sleep(0)
+                release.set()
+                self.assertEqual("new", (await forced)["data"])
+                await asyncio.gather(*session._revalidations)
+            # refresh and forced request share a single upstream request
+            self.assertEqual(1, fetch_mock.call_count)
+            await session.close()
+
+    async def test_stale_while_revalidate_failed(self):
+        with tempfile.TemporaryDirectory() as folder:
+            session = AsyncGrowattApiSession(
+                token="test_token",
+                cache=ResponseCache(
+                    mode="read-through", folder=Path(folder), stale_while_revalidate=timedelta(hours=1)
+                ),
+            )
+            key = session.fingerprint(url=session._url("plant/list"))
+            session.cache.store(key, {"error_code": 0, "error_msg": None, "data": "old"})
+            old = time.time() - 600
+            for pickle_file in Path(folder).glob("*.pickle"):
+                os.utime(pickle_file, (old, old))
+
+            failures = [
+                aiohttp.ServerDisconnectedError(),
+                {"error_code": 10001, "error_msg": "system error", "data": None},
+            ]
+            with patch.object(session, "_fetch", side_effect=failures) as fetch_mock:
+                for _ in failures:
+                    # outdated response is kept if refresh fails
+                    response = await session.get(endpoint="plant/list")
+                    self.assertEqual("old", response["data"])
+                    self.assertAlmostEqual(600, response["cacheAge"], delta=60)
+                    await asyncio.gather(*session._revalidations)
+            self.assertEqual(2, fetch_mock.call_count)
+            await session.close()
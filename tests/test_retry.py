@@ -0,0 +1,151 @@
+import unittest
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from growatt_public_api import GrowattApiSession, AsyncGrowattApiSession, RetryPolicy, RateLimit
+
+TEST_FILE = "growatt_public_api.session.growatt_api_session"
+OK = {"code": 0, "message": None, "data": None}
+RATE_LIMITED = {"error_code": 10012, "error_msg": None, "data": None}
+
+
+def _response(json_data: dict = None, status_code: int = 200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = "" if json_data is None else "json"
+    if json_data is None:
+        response.json.side_effect = requests.exceptions.JSONDecodeError("Expecting value", "", 0)
+    else:
+        response.json.side_effect = lambda: dict(json_data)
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """
+    failed requests are retried using jittered exponential backoff
+    """
+
+    def _session(self, *responses, **retry_kwargs) -> GrowattApiSession:
+        session = GrowattApiSession(
+            token="test_token",
+            use_cache=False,
+            retry=RetryPolicy(backoff=timedelta(0), limits={}, **retry_kwargs),
+        )
+        session.session.request = MagicMock(side_effect=responses)
+        return session
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff=timedelta(seconds=1), max_backoff=timedelta(seconds=5))
+        for attempt, cap in [(0, 1), (1, 2), (2, 4), (3, 5), (10, 5)]:
+            self.assertTrue(0 <= policy.backoff_time(attempt) <= cap)
+        # documented intervals
+        self.assertEqual(300, policy.min_wait("new-api/queryLastData", data={"deviceType": "min"}))
+        self.assertEqual(60, policy.min_wait("new-api/queryLastData", data={"deviceType": "noah"}))
+        # several limits: longest interval (10 per day)
+        self.assertEqual(8640, policy.min_wait("plant/list"))
+        self.assertEqual(8640, policy.min_wait("plant/energy", params={"plant_id": 1}))
+        self.assertEqual(0, policy.min_wait("unknown"))
+
+    def test_delay(self):
+        policy = RetryPolicy(max_attempts=3, backoff=timedelta(0), deadline=timedelta(minutes=1))
+        deadline_at = policy.deadline_at()
+        self.assertEqual(0, policy.delay(attempt=0, deadline_at=deadline_at, endpoint="plant/list"))
+        self.assertIsNone(policy.delay(attempt=2, deadline_at=deadline_at, endpoint="plant/list"))
+        # documented interval exceeds deadline
+        self.assertIsNone(policy.delay(attempt=0, deadline_at=deadline_at, endpoint="plant/list", rate_limited=True))
+
+    def test_transport_error(self):
+        session = self._session(requests.ConnectionError("connection reset"), _response(OK))
+        self.assertEqual(OK, session.post(endpoint="new-api/queryDeviceList"))
+        self.assertEqual(2, session.session.request.call_count)
+
+    def test_server_error(self):
+        session = self._session(_response(status_code=503), _response(OK))
+        self.assertEqual(OK, session.post(endpoint="new-api/queryDeviceList"))
+        self.assertEqual(2, session.session.request.call_count)
+
+    def test_decoded_once(self):
+        responses = [_response(RATE_LIMITED), _response(OK)]
+        session = self._session(*responses)
+        self.assertEqual(OK, session.post(endpoint="new-api/queryDeviceList"))
+        # same JSON used for retry check and result
+        self.assertEqual([1, 1], [response.json.call_count for response in responses])
+        # invalid JSON is raised as before
+        session = self._session(_response(status_code=200), max_attempts=1)
+        with self.assertRaises(ValueError):
+            session.post(endpoint="new-api/queryDeviceList")
+
+    def test_give_up(self):
+        session = self._session(*[requests.ReadTimeout("timeout")] * 3, max_attempts=2)
+        with self.assertRaises(requests.ReadTimeout):
+            session.post(endpoint="new-api/queryDeviceList")
+        self.assertEqual(2, session.session.request.call_count)
+
+    def test_rate_limited(self):
+        session = self._session(_response(RATE_LIMITED), _response(OK))
+        session.retry.limits = {"plant/list": [RateLimit(calls=1, period=timedelta(seconds=2))]}
+        with patch(f"{TEST_FILE}.time.sleep") as sleep:
+            self.assertEqual(OK, session.get(endpoint="plant/list"))
+        # waited the documented interval
+        sleep.assert_called_once_with(2.0)
+        # not retried if disabled
+        session = self._session(_response(RATE_LIMITED), _response(OK), retry_rate_limited=False)
+        self.assertEqual(10012, session.get(endpoint="plant/list")["error_code"])
+        self.assertEqual(1, session.session.request.call_count)
+
+    def test_write(self):
+        # settings might have been applied - not retried
+        session = self._session(requests.ReadTimeout("timeout"), _response(OK))
+        with self.assertRaises(requests.ReadTimeout):
+            session.post(endpoint="new-api/setOnOrOff", data={"deviceSn": "BZP0000000"})
+        session = self._session(requests.ReadTimeout("timeout"), _response(OK), retry_writes=True)
+        self.assertEqual(OK, session.post(endpoint="new-api/setOnOrOff", data={"deviceSn": "BZP0000000"}))
+
+    def test_disabled(self):
+        session = GrowattApiSession(token="test_token", use_cache=False)
+        session.session.request = MagicMock(side_effect=[requests.ConnectionError("connection reset")])
+        with self.assertRaises(requests.ConnectionError):
+            session.post(endpoint="new-api/queryDeviceList")
+
+
+class _FakeResponse:
+    def __init__(self, status: int, text: str):
+        self.status = status
+        self._text = text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def text(self):
+        return self._text
+
+
+class TestAsyncRetryPolicy(unittest.IsolatedAsyncioTestCase):
+    async def test_retry(self):
+        import aiohttp
+
+        session = AsyncGrowattApiSession(
+            token="test_token", use_cache=False, retry=RetryPolicy(backoff=timedelta(0), limits={})
+        )
+        responses = [
+            aiohttp.ServerDisconnectedError(),
+            _FakeResponse(502, "Bad Gateway"),
+            _FakeResponse(200, '{"code": 0, "message": null, "data": null}'),
+        ]
+
+        def request(*args, **kwargs):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        client_session = MagicMock()
+        client_session.request.side_effect = request
+        with patch.object(session, "_client_session", return_value=client_session):
+            self.assertEqual(OK, await session.post(endpoint="new-api/queryDeviceList"))
+        self.assertEqual(3, client_session.request.call_count)
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from growatt_public_api import GrowattApiSession
+from growatt_public_api.session import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    identical concurrent requests share one request to the server
+    """
+
+    def _session(self, **kwargs) -> GrowattApiSession:
+        session = GrowattApiSession(token="test_token", use_cache=False, **kwargs)
+
+        def slow_request(*args, **kwargs):
+            time.sleep(0.2)
+            response = MagicMock()
+            response.text = ""
+            response.json.return_value = {"code": 0, "message": None, "data": {"params": kwargs["data"]}}
+            return response
+
+        session.session.request = MagicMock(side_effect=slow_request)
+        return session
+
+    def test_coalesce(self):
+        session = self._session()
+        data = {"deviceSn": "BZP0000000", "deviceType": "min"}
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [
+                executor.submit(session.post, endpoint="new-api/queryLastData", data=dict(data)) for _ in range(5)
+            ]
+            results = [future.result() for future in futures]
+        self.assertEqual(1, session.session.request.call_count)
+        self.assertTrue(all(result == results[0] for result in results))
+        # callers get independent copies
+        self.assertEqual(5, len({id(result) for result in results}))
+
+    def test_no_coalesce(self):
+        session = self._session()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                # different devices
+                executor.submit(session.post, endpoint="new-api/queryLastData", data={"deviceSn": "A"}),
+                executor.submit(session.post, endpoint="new-api/queryLastData", data={"deviceSn": "B"}),
+                # settings are never coalesced
+                executor.submit(session.post, endpoint="new-api/setOnOrOff", data={"deviceSn": "A", "value": 1}),
+                executor.submit(session.post, endpoint="new-api/setOnOrOff", data={"deviceSn": "A", "value": 1}),
+            ]
+            [future.result() for future in futures]
+        self.assertEqual(4, session.session.request.call_count)
+
+        session = self._session(coalesce_requests=False)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(session.post, endpoint="plant/power", data={"plant_id": 1}) for _ in range(2)]
+            [future.result() for future in futures]
+        self.assertEqual(2, session.session.request.call_count)
+
+    def test_exception(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.2)
+            raise ConnectionError("failed")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(single_flight.do, "key", fail)
+            started.wait()
+            follower = executor.submit(single_flight.do, "key", lambda: "not called")
+            self.assertRaises(ConnectionError, leader.result)
+            self.assertRaises(ConnectionError, follower.result)
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesce(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return {"data": [1, 2, 3]}
+
+        results = await asyncio.gather(*[single_flight.do("key", fetch) for _ in range(5)])
+        self.assertEqual(1, len(calls))
+        self.assertTrue(all(result == {"data": [1, 2, 3]} for result in results))
+        # new call after completion
+        await single_flight.do("key", fetch)
+        self.assertEqual(2, len(calls))
+
+    async def test_leader_cancelled(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return "result"
+
+        leader = asyncio.create_task(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        self.assertEqual("result", await follower)
+        self.assertEqual(2, len(calls))